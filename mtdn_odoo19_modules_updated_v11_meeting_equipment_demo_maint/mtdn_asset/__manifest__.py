@@ -11,11 +11,18 @@
         "security/ir.model.access.csv",
         "data/sequences.xml",
         "data/cron.xml",
+        "data/depreciation_schedule.xml",
+        "data/asset_state_log.xml",
         "data/seed_meeting_equipment.xml",
         "views/mtdn_asset_category_views.xml",
         "views/mtdn_asset_equipment_type_views.xml",
         "views/mtdn_branch_views.xml",
         "views/mtdn_asset_views.xml",
+        "views/mtdn_asset_depreciation_line_views.xml",
+        "views/mtdn_asset_state_log_views.xml",
+        "views/mtdn_asset_import_wizard_views.xml",
+        "views/mtdn_asset_export_wizard_views.xml",
+        "views/mtdn_hr_wizard_views.xml",
         "views/mtdn_asset_actions.xml",
         "views/mtdn_asset_menus.xml",
     ],
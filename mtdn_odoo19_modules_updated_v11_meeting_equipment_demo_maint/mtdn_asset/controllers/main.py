@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+import csv
+import io
+import tempfile
+
+from odoo import api, fields, http
+from odoo.http import request
+from odoo.modules.registry import Registry
+
+from ..models.mtdn_asset_asset import REGISTER_EXPORT_HEADER
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class MtdnAssetRegisterExport(http.Controller):
+    @http.route("/mtdn_asset/export/register", type="http", auth="user", methods=["GET"])
+    def export_register(self, file_format="csv", branch_ids="", category_ids="", states="", as_of="", **kwargs):
+        """Stream the asset register as CSV or XLSX with constant memory."""
+        request.env["mtdn.asset"].check_access("read")
+
+        domain = []
+        if branch_ids:
+            domain.append(("branch_id", "in", [int(x) for x in branch_ids.split(",") if x]))
+        if category_ids:
+            domain.append(("category_id", "in", [int(x) for x in category_ids.split(",") if x]))
+        if states:
+            domain.append(("state", "in", states.split(",")))
+        as_of = fields.Date.to_date(as_of) if as_of else fields.Date.context_today(request.env.user)
+
+        # The response body is produced after this handler returns, i.e. after
+        # the request cursor is closed: the generators open their own cursor.
+        dbname = request.env.cr.dbname
+        uid = request.env.uid
+        context = dict(request.env.context)
+
+        def iter_rows():
+            registry = Registry(dbname)
+            with registry.cursor() as cr:
+                env = api.Environment(cr, uid, context)
+                yield from env["mtdn.asset"]._iter_register_rows(domain, as_of=as_of)
+
+        filename = "asset_register_%s" % fields.Date.to_string(as_of)
+        if file_format == "xlsx":
+            body = self._stream_xlsx(iter_rows())
+            content_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            filename += ".xlsx"
+        else:
+            body = self._stream_csv(iter_rows())
+            content_type = "text/csv; charset=utf-8"
+            filename += ".csv"
+
+        return request.make_response(
+            body,
+            headers=[
+                ("Content-Type", content_type),
+                ("Content-Disposition", http.content_disposition(filename)),
+            ],
+        )
+
+    def _stream_csv(self, rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        buffer.write("\ufeff")
+        writer.writerow(REGISTER_EXPORT_HEADER)
+        for row in rows:
+            writer.writerow(row)
+            if buffer.tell() >= STREAM_CHUNK_SIZE:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue().encode("utf-8")
+
+    def _stream_xlsx(self, rows):
+        import xlsxwriter
+
+        # constant_memory flushes each row to disk; the finished file is then streamed.
+        with tempfile.TemporaryFile() as tmp:
+            workbook = xlsxwriter.Workbook(tmp, {"constant_memory": True, "in_memory": False})
+            sheet = workbook.add_worksheet("Tài sản")
+            sheet.write_row(0, 0, REGISTER_EXPORT_HEADER)
+            for row_index, row in enumerate(rows, start=1):
+                sheet.write_row(row_index, 0, [fields.Date.to_string(v) if hasattr(v, "isoformat") else v for v in row])
+            workbook.close()
+            tmp.seek(0)
+            while True:
+                chunk = tmp.read(STREAM_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
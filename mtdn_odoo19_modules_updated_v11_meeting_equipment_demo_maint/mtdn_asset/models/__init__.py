@@ -1,4 +1,7 @@
+from . import mtdn_employee
 from . import mtdn_asset_category
 from . import mtdn_asset_asset
+from . import mtdn_asset_depreciation_line
+from . import mtdn_asset_state_log
 from . import mtdn_asset_equipment_type
 from . import mtdn_branch
@@ -1,17 +1,94 @@
 # -*- coding: utf-8 -*-
-from datetime import date
-
-from dateutil.relativedelta import relativedelta
+import logging
+from collections import defaultdict
 
 from odoo import api, fields, models
 from odoo.exceptions import ValidationError
+from odoo.tools import SQL, create_index
+
+from . import mtdn_asset_depreciation as depreciation
+
+_logger = logging.getLogger(__name__)
+
+# ir.config_parameter holding the last asset id processed by the maintenance cron.
+# Read and written in SQL (see _maintenance_checkpoint): set_param would clear
+# the registry caches of every worker once per batch.
+MAINTENANCE_CRON_CHECKPOINT = "mtdn_asset.maintenance_cron_last_id"
+
+
+# Parents whose ``quantity_total`` sums the quantity of their active assets.
+QUANTITY_ROLLUP_FIELDS = {
+    "category_id": "mtdn.asset.category",
+    "equipment_type_id": "mtdn.asset.equipment.type",
+    "branch_id": "mtdn.branch",
+}
+
+# Changes of these fields open a new interval in mtdn.asset.state.log.
+STATE_LOG_FIELDS = {"state", "employee_id", "department_id"}
+
+# Dimensions accepted by the as-of-date valuation API.
+VALUATION_GROUPBY_FIELDS = ("category_id", "branch_id", "department_id", "company_id")
+
+# Columns understood by the bulk import (CSV/XLSX headers).
+IMPORT_COLUMNS = (
+    "code",
+    "name",
+    "category_code",
+    "equipment_type_code",
+    "branch_code",
+    "employee_code",
+    "department_code",
+    "quantity",
+    "value",
+    "purchase_date",
+    "in_service_date",
+    "depreciation_start_date",
+    "next_maintenance_date",
+    "state",
+    "note",
+)
+
+# Header of the streaming register export (same order as _iter_register_rows tuples).
+REGISTER_EXPORT_HEADER = (
+    "Mã tài sản",
+    "Tên tài sản",
+    "Loại tài sản",
+    "Loại thiết bị",
+    "Trạng thái",
+    "Số lượng",
+    "Chi nhánh",
+    "Nhân viên",
+    "Phòng ban",
+    "Công ty",
+    "Tiền tệ",
+    "Giá trị",
+    "Khấu hao lũy kế",
+    "Giá trị còn lại",
+    "Ngày bảo trì tiếp theo",
+    "Số tài liệu",
+)
+
+# Inputs of the per-period depreciation schedule: changing any of them regenerates it.
+DEPRECIATION_SCHEDULE_FIELDS = {
+    "value",
+    "depreciation_method",
+    "depreciation_unit",
+    "depreciation_years",
+    "declining_factor",
+    "depreciation_start_date",
+    "in_service_date",
+    "purchase_date",
+}
 
 
 class MtdnAsset(models.Model):
     _name = "mtdn.asset"
+    _inherit = ["mtdn.unaccent.search.mixin"]
     _description = "MTDN Asset"
     _order = "code, name"
 
+    _mtdn_search_columns = ("name", "code")
+
     code = fields.Char(string="Mã tài sản", required=True, copy=False, default="New", index=True)
     name = fields.Char(string="Tên tài sản", required=True, index=True)
 
@@ -127,6 +204,42 @@ class MtdnAsset(models.Model):
         store=True,
         readonly=True,
     )
+    depreciation_elapsed_periods = fields.Integer(
+        string="Số kỳ đã khấu hao",
+        compute="_compute_depreciation_values",
+        store=True,
+        readonly=True,
+    )
+    depreciation_date = fields.Date(
+        string="Ngày tính khấu hao",
+        compute="_compute_depreciation_values",
+        store=True,
+        readonly=True,
+        help="Ngày các giá trị khấu hao được tính lần cuối.",
+    )
+    depreciation_next_date = fields.Date(
+        string="Ngày sang kỳ khấu hao tiếp theo",
+        compute="_compute_depreciation_values",
+        store=True,
+        readonly=True,
+        index=True,
+        help="Ngày các giá trị khấu hao thay đổi tiếp theo (dùng cho cron làm mới theo kỳ); "
+        "trống khi tài sản đã khấu hao hết hoặc không khấu hao.",
+    )
+
+    state_log_ids = fields.One2many(
+        "mtdn.asset.state.log",
+        "asset_id",
+        string="Lịch sử trạng thái",
+        readonly=True,
+    )
+
+    depreciation_line_ids = fields.One2many(
+        "mtdn.asset.depreciation.line",
+        "asset_id",
+        string="Lịch khấu hao",
+        readonly=True,
+    )
 
     # ------------------------------------------------------------
     # Maintenance
@@ -186,6 +299,25 @@ class MtdnAsset(models.Model):
     # ------------------------------------------------------------
     # ORM
     # ------------------------------------------------------------
+    def init(self):
+        super().init()
+        # Overdue predicate of _cron_update_maintenance_state.
+        create_index(
+            self.env.cr,
+            "mtdn_asset_maintenance_due_idx",
+            self._table,
+            ["next_maintenance_date", "id"],
+            where="active AND state NOT IN ('maintenance', 'broken')",
+        )
+        # Assets whose maintenance_overdue flag may have to flip to True.
+        create_index(
+            self.env.cr,
+            "mtdn_asset_maintenance_not_overdue_idx",
+            self._table,
+            ["next_maintenance_date"],
+            where="maintenance_overdue IS NOT TRUE AND next_maintenance_date IS NOT NULL",
+        )
+
     @api.model
     def default_get(self, fields_list):
         """Support setting default category from client-side action context.
@@ -216,30 +348,43 @@ class MtdnAsset(models.Model):
 
     @api.model_create_multi
     def create(self, vals_list):
+        Category = self.env["mtdn.asset.category"]
+
+        # one sequence reservation for all records without a code
+        missing_code = [vals for vals in vals_list if not vals.get("code") or vals.get("code") == "New"]
+        if missing_code:
+            codes = self.env["ir.sequence"].mtdn_next_by_code_batch("mtdn.asset", len(missing_code))
+            for vals, code in zip(missing_code, codes):
+                vals["code"] = code or "New"
+
+        # allow creating from Meeting Equipment menu without hardcoding IDs
+        ctx_code = self.env.context.get("default_category_code")
+        if ctx_code and any(not vals.get("category_id") for vals in vals_list):
+            cat = Category.search([("code", "=", ctx_code)], limit=1)
+            if cat:
+                for vals in vals_list:
+                    if not vals.get("category_id"):
+                        vals["category_id"] = cat.id
+
+        # default depreciation settings from category (but keep editable on asset)
+        category_ids = {vals["category_id"] for vals in vals_list if vals.get("category_id")}
+        categories = {cat.id: cat for cat in Category.browse(category_ids).exists()}
         for vals in vals_list:
-            if not vals.get("code") or vals.get("code") == "New":
-                vals["code"] = self.env["ir.sequence"].next_by_code("mtdn.asset") or "New"
-
-            # allow creating from Meeting Equipment menu without hardcoding IDs
-            if not vals.get("category_id") and self.env.context.get("default_category_code"):
-                code = self.env.context.get("default_category_code")
-                cat = self.env["mtdn.asset.category"].search([("code", "=", code)], limit=1)
-                if cat:
-                    vals["category_id"] = cat.id
-
-            # default depreciation settings from category (but keep editable on asset)
-            if vals.get("category_id"):
-                cat = self.env["mtdn.asset.category"].browse(vals["category_id"])
-                if cat.exists():
-                    vals.setdefault("depreciation_method", cat.depreciation_method)
-                    vals.setdefault("depreciation_unit", cat.depreciation_unit)
-                    vals.setdefault("depreciation_years", cat.depreciation_years)
-                    vals.setdefault("declining_factor", cat.declining_factor)
+            cat = categories.get(vals.get("category_id"))
+            if cat:
+                vals.setdefault("depreciation_method", cat.depreciation_method)
+                vals.setdefault("depreciation_unit", cat.depreciation_unit)
+                vals.setdefault("depreciation_years", cat.depreciation_years)
+                vals.setdefault("declining_factor", cat.declining_factor)
 
             # sensible default for depreciation start date
             if not vals.get("depreciation_start_date"):
                 vals["depreciation_start_date"] = vals.get("in_service_date") or vals.get("purchase_date")
-        return super().create(vals_list)
+        records = super().create(vals_list)
+        records._generate_depreciation_schedule()
+        self._apply_quantity_rollup_deltas(records._quantity_rollup_contributions())
+        self.env["mtdn.asset.state.log"].sudo()._log_transitions(records)
+        return records
 
     def write(self, vals):
         # if category changed and user didn't explicitly set depreciation fields,
@@ -261,7 +406,424 @@ class MtdnAsset(models.Model):
                         vals.get("in_service_date") or vals.get("purchase_date") or rec.in_service_date or rec.purchase_date,
                     )
                     break
-        return super().write(vals)
+        rollup_changed = bool({"quantity", "active", *QUANTITY_ROLLUP_FIELDS}.intersection(vals))
+        if rollup_changed:
+            before = self._quantity_rollup_contributions()
+        state_changed = bool(STATE_LOG_FIELDS.intersection(vals))
+        if state_changed:
+            previous_states = {rec.id: rec._state_log_key() for rec in self}
+
+        res = super().write(vals)
+        if state_changed:
+            moved = self.filtered(lambda rec: previous_states[rec.id] != rec._state_log_key())
+            self.env["mtdn.asset.state.log"].sudo()._log_transitions(moved)
+        if DEPRECIATION_SCHEDULE_FIELDS.intersection(vals):
+            self._generate_depreciation_schedule()
+        if rollup_changed:
+            deltas = self._quantity_rollup_contributions()
+            for key, quantity in before.items():
+                deltas[key] -= quantity
+            self._apply_quantity_rollup_deltas(deltas)
+        return res
+
+    def unlink(self):
+        deltas = self._quantity_rollup_contributions()
+        res = super().unlink()
+        self._apply_quantity_rollup_deltas({key: -quantity for key, quantity in deltas.items()})
+        return res
+
+    def _state_log_key(self):
+        self.ensure_one()
+        return self.state, self.employee_id.id, self.department_id.id
+
+    # ------------------------------------------------------------
+    # Quantity roll-ups (category / equipment type / branch)
+    # ------------------------------------------------------------
+    def _quantity_rollup_contributions(self):
+        """Return ``{(parent_model, parent_id): quantity}`` contributed by ``self``."""
+        contributions = defaultdict(int)
+        for rec in self:
+            if not rec.active or not rec.quantity:
+                continue
+            for fname, model in QUANTITY_ROLLUP_FIELDS.items():
+                if rec[fname]:
+                    contributions[(model, rec[fname].id)] += rec.quantity
+        return contributions
+
+    @api.model
+    def _apply_quantity_rollup_deltas(self, deltas):
+        """Shift parents' ``quantity_total`` by the given deltas (one UPDATE per model and delta)."""
+        grouped = defaultdict(lambda: defaultdict(list))
+        for (model, parent_id), delta in deltas.items():
+            if delta:
+                grouped[model][delta].append(parent_id)
+        for model, by_delta in grouped.items():
+            Parent = self.env[model]
+            Parent.flush_model(["quantity_total"])
+            for delta, parent_ids in by_delta.items():
+                self.env.cr.execute(
+                    "UPDATE %s SET quantity_total = COALESCE(quantity_total, 0) + %%s WHERE id = ANY(%%s)" % Parent._table,
+                    [delta, parent_ids],
+                )
+            Parent.invalidate_model(["quantity_total"])
+
+    @api.model
+    def _cron_reconcile_quantity_totals(self):
+        """Repair any drift of the delta-maintained ``quantity_total`` roll-ups.
+
+        Returns the number of parent records that had to be corrected.
+        """
+        self.flush_model()
+        repaired = 0
+        for fname, model in QUANTITY_ROLLUP_FIELDS.items():
+            Parent = self.env[model]
+            Parent.flush_model(["quantity_total"])
+            self.env.cr.execute(
+                """
+                UPDATE {table} p
+                   SET quantity_total = COALESCE(s.total, 0)
+                  FROM {table} p2
+             LEFT JOIN (SELECT {fname} AS parent_id, SUM(quantity) AS total
+                          FROM mtdn_asset
+                         WHERE active AND {fname} IS NOT NULL
+                      GROUP BY {fname}) s ON s.parent_id = p2.id
+                 WHERE p.id = p2.id
+                   AND p.quantity_total IS DISTINCT FROM COALESCE(s.total, 0)
+                """.format(table=Parent._table, fname=fname)
+            )
+            repaired += self.env.cr.rowcount
+            Parent.invalidate_model(["quantity_total"])
+        return repaired
+
+    # ------------------------------------------------------------
+    # Depreciation schedule
+    # ------------------------------------------------------------
+    def _generate_depreciation_schedule(self, batch_size=10000):
+        """(Re)build the stored per-period depreciation schedule of ``self`` in bulk."""
+        if not self:
+            return
+        Line = self.env["mtdn.asset.depreciation.line"].sudo()
+        Line.flush_model()
+        self.env.cr.execute(
+            "DELETE FROM mtdn_asset_depreciation_line WHERE asset_id = ANY(%s)",
+            [self.ids],
+        )
+        Line.invalidate_model()
+        self.invalidate_recordset(["depreciation_line_ids"])
+
+        vals_list = []
+        for rec, row in zip(self, self._depreciation_rows()):
+            for index, period_start, period_end, amount, acc, book in depreciation.schedule(*row):
+                vals_list.append(
+                    {
+                        "asset_id": rec.id,
+                        "period_index": index,
+                        "period_start": period_start,
+                        "period_end": period_end,
+                        "amount": amount,
+                        "accumulated": acc,
+                        "book_value": book,
+                    }
+                )
+            if len(vals_list) >= batch_size:
+                Line.create(vals_list)
+                vals_list = []
+        if vals_list:
+            Line.create(vals_list)
+
+    @api.model
+    def _generate_missing_depreciation_schedules(self, batch_size=1000):
+        """Build schedules for depreciable assets that have none yet (install / upgrade)."""
+        self.flush_model()
+        self.env.cr.execute(
+            """
+            SELECT a.id
+              FROM mtdn_asset a
+             WHERE a.depreciation_method != 'none'
+               AND a.value > 0
+               AND a.depreciation_years > 0
+               AND COALESCE(a.depreciation_start_date, a.in_service_date, a.purchase_date) IS NOT NULL
+               AND NOT EXISTS (SELECT 1 FROM mtdn_asset_depreciation_line l WHERE l.asset_id = a.id)
+          ORDER BY a.id
+            """
+        )
+        asset_ids = [row[0] for row in self.env.cr.fetchall()]
+        for i in range(0, len(asset_ids), batch_size):
+            self.browse(asset_ids[i:i + batch_size])._generate_depreciation_schedule()
+            self.env.invalidate_all()
+
+    # ------------------------------------------------------------
+    # As-of-date valuation
+    # ------------------------------------------------------------
+    @api.model
+    def _iter_valuation_as_of(self, as_of, domain=None, batch_size=5000):
+        """Stream the valuation of every asset matching ``domain`` at date ``as_of``.
+
+        Assets with a stored schedule are valued from their last elapsed line
+        (``mtdn.asset.depreciation.line._read_as_of``, an indexed range read);
+        only the assets without schedule go through the closed-form engine.
+        Yields one dict per asset.
+        """
+        as_of = fields.Date.to_date(as_of)
+        asset_ids = self.search(domain or [], order="id").ids
+        self.flush_model()
+        Line = self.env["mtdn.asset.depreciation.line"].sudo()
+        cr = self.env.cr
+        for i in range(0, len(asset_ids), batch_size):
+            chunk_ids = asset_ids[i:i + batch_size]
+            cr.execute(
+                """
+                SELECT a.id, a.depreciation_method, a.depreciation_unit, a.value, a.depreciation_years,
+                       a.declining_factor,
+                       COALESCE(a.depreciation_start_date, a.in_service_date, a.purchase_date),
+                       a.category_id, a.branch_id, a.department_id, a.company_id,
+                       EXISTS (SELECT 1 FROM mtdn_asset_depreciation_line l WHERE l.asset_id = a.id)
+                  FROM mtdn_asset a
+                 WHERE a.id = ANY(%s)
+              ORDER BY a.id
+                """,
+                [chunk_ids],
+            )
+            rows = cr.fetchall()
+            lines = Line._read_as_of(as_of, [row[0] for row in rows if row[11]])
+            unscheduled = [row for row in rows if not row[11]]
+            computed = dict(
+                zip(
+                    (row[0] for row in unscheduled),
+                    depreciation.compute_depreciation_batch(
+                        (
+                            (method, unit, float(value or 0.0), periods, float(factor or 0.0), start)
+                            for _id, method, unit, value, periods, factor, start, *_rest in unscheduled
+                        ),
+                        as_of,
+                    ),
+                )
+            )
+            for row in rows:
+                value = float(row[3] or 0.0)
+                if row[0] in computed:
+                    _per, acc, book, elapsed = computed[row[0]]
+                elif row[0] in lines:
+                    elapsed, acc, book = lines[row[0]]
+                else:
+                    # scheduled, but no period elapsed yet
+                    elapsed, acc, book = 0, 0.0, value
+                yield {
+                    "id": row[0],
+                    "value": value,
+                    "accumulated_depreciation": float(acc),
+                    "book_value": float(book),
+                    "elapsed_periods": elapsed,
+                    "category_id": row[7],
+                    "branch_id": row[8],
+                    "department_id": row[9],
+                    "company_id": row[10],
+                }
+
+    @api.model
+    def mtdn_get_valuation_as_of(self, as_of, domain=None, groupby=None):
+        """Book value, accumulated depreciation and elapsed periods at ``as_of``.
+
+        Without ``groupby`` one entry per asset is returned. ``groupby`` is a list
+        of fields among category_id, branch_id, department_id and company_id; the
+        result then holds one entry per group with summed values.
+        """
+        groupby = list(groupby or [])
+        invalid = set(groupby) - set(VALUATION_GROUPBY_FIELDS)
+        if invalid:
+            raise ValidationError("Không thể nhóm theo: %s" % ", ".join(sorted(invalid)))
+
+        rows = self._iter_valuation_as_of(as_of, domain)
+        if not groupby:
+            return list(rows)
+
+        groups = {}
+        for row in rows:
+            key = tuple(row[fname] for fname in groupby)
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = dict(zip(groupby, key))
+                group.update(asset_count=0, value=0.0, accumulated_depreciation=0.0, book_value=0.0)
+            group["asset_count"] += 1
+            group["value"] += row["value"]
+            group["accumulated_depreciation"] += row["accumulated_depreciation"]
+            group["book_value"] += row["book_value"]
+        return list(groups.values())
+
+    # ------------------------------------------------------------
+    # Register export
+    # ------------------------------------------------------------
+    @api.model
+    def _iter_register_rows(self, domain=None, as_of=None, batch_size=2000):
+        """Stream the asset register as tuples following ``REGISTER_EXPORT_HEADER``.
+
+        Many2one names are resolved with joins and rows are fetched in id order
+        by keyset chunks, so memory stays constant whatever the register size.
+        Depreciation is evaluated at ``as_of`` (default: today) with the shared
+        engine instead of reading the stored values.
+        """
+        as_of = fields.Date.to_date(as_of) if as_of else fields.Date.context_today(self)
+        states = dict(self._fields["state"]._description_selection(self.env))
+        subquery = self._search(domain or []).subselect()
+        self.flush_model()
+        cr = self.env.cr
+        last_id = 0
+        while True:
+            cr.execute(
+                SQL(
+                    """
+                    SELECT a.id, a.code, a.name, cat.name, et.name, a.state, a.quantity,
+                           br.name, emp.name, dep.name, co.name, cur.name, a.value,
+                           a.depreciation_method, a.depreciation_unit, a.depreciation_years,
+                           a.declining_factor,
+                           COALESCE(a.depreciation_start_date, a.in_service_date, a.purchase_date),
+                           a.next_maintenance_date,
+                           (SELECT COUNT(*) FROM mtdn_asset_ir_attachment_rel r WHERE r.asset_id = a.id)
+                      FROM mtdn_asset a
+                      JOIN mtdn_asset_category cat ON cat.id = a.category_id
+                 LEFT JOIN mtdn_asset_equipment_type et ON et.id = a.equipment_type_id
+                 LEFT JOIN mtdn_branch br ON br.id = a.branch_id
+                 LEFT JOIN mtdn_employee emp ON emp.id = a.employee_id
+                 LEFT JOIN mtdn_department dep ON dep.id = a.department_id
+                 LEFT JOIN res_company co ON co.id = a.company_id
+                 LEFT JOIN res_currency cur ON cur.id = a.currency_id
+                     WHERE a.id > %s AND a.id IN %s
+                  ORDER BY a.id
+                     LIMIT %s
+                    """,
+                    last_id,
+                    subquery,
+                    batch_size,
+                )
+            )
+            rows = cr.fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            for row in rows:
+                value = float(row[12] or 0.0)
+                _per, acc, book, _elapsed = depreciation.compute_depreciation(
+                    row[13], row[14], value, row[15], float(row[16] or 0.0), row[17], as_of
+                )
+                yield (
+                    row[1],
+                    row[2],
+                    row[3],
+                    row[4] or "",
+                    states.get(row[5], row[5]),
+                    row[6],
+                    row[7] or "",
+                    row[8] or "",
+                    row[9] or "",
+                    row[10] or "",
+                    row[11] or "",
+                    value,
+                    round(acc, 2),
+                    round(book, 2),
+                    row[18] or "",
+                    row[19],
+                )
+
+    # ------------------------------------------------------------
+    # Bulk import
+    # ------------------------------------------------------------
+    @api.model
+    def mtdn_bulk_import(self, rows, chunk_size=1000):
+        """Import assets from an iterable of ``(line_number, row)`` pairs.
+
+        ``row`` is a dict keyed by ``IMPORT_COLUMNS``. Referenced categories,
+        equipment types, branches, departments and employees are resolved by
+        code from lookups loaded once; records are created chunk by chunk (one
+        sequence reservation per chunk). Invalid rows are reported instead of
+        aborting the import.
+
+        Returns ``{"created": int, "errors": [(line_number, message), ...]}``.
+        """
+        lookups = self._mtdn_import_lookups()
+        Importer = self.env["mtdn.import.file.mixin"]
+        created = 0
+        errors = []
+        chunk = []
+        for line_no, row in rows:
+            try:
+                chunk.append((line_no, self._mtdn_import_prepare_vals(row, lookups)))
+            except ValidationError as e:
+                errors.append((line_no, e.args[0]))
+            if len(chunk) >= chunk_size:
+                created += Importer._mtdn_import_create_chunk(self, chunk, errors)
+                chunk = []
+        if chunk:
+            created += Importer._mtdn_import_create_chunk(self, chunk, errors)
+        return {"created": created, "errors": errors}
+
+    @api.model
+    def _mtdn_import_lookups(self):
+        """Code -> id maps for every many2one the import can reference (one query each)."""
+
+        def by_code(model, domain=None):
+            records = self.env[model].with_context(active_test=False).search_read(domain or [], ["code"])
+            return {rec["code"]: rec["id"] for rec in records}
+
+        company_domain = [("company_id", "in", self.env.companies.ids)]
+        return {
+            "category": by_code("mtdn.asset.category"),
+            "equipment_type": by_code("mtdn.asset.equipment.type"),
+            "branch": by_code("mtdn.branch", company_domain),
+            "department": by_code("mtdn.department", company_domain),
+            "employee": by_code("mtdn.employee"),
+        }
+
+    @api.model
+    def _mtdn_import_prepare_vals(self, row, lookups):
+        row = {key: (value.strip() if isinstance(value, str) else value) for key, value in row.items()}
+
+        name = row.get("name")
+        if not name:
+            raise ValidationError("Thiếu tên tài sản.")
+        vals = {"name": name}
+        if row.get("code"):
+            vals["code"] = str(row["code"])
+
+        references = [
+            ("category_code", "category", "category_id", "loại tài sản"),
+            ("equipment_type_code", "equipment_type", "equipment_type_id", "loại thiết bị"),
+            ("branch_code", "branch", "branch_id", "chi nhánh"),
+            ("department_code", "department", "department_id", "phòng ban"),
+            ("employee_code", "employee", "employee_id", "nhân viên"),
+        ]
+        for column, lookup, fname, label in references:
+            code = row.get(column)
+            if not code:
+                continue
+            record_id = lookups[lookup].get(str(code))
+            if not record_id:
+                raise ValidationError("Không tìm thấy %s có mã '%s'." % (label, code))
+            vals[fname] = record_id
+        if not vals.get("category_id"):
+            raise ValidationError("Thiếu mã loại tài sản.")
+
+        try:
+            if row.get("quantity") not in (None, ""):
+                vals["quantity"] = int(float(row["quantity"]))
+            if row.get("value") not in (None, ""):
+                vals["value"] = float(row["value"])
+        except (TypeError, ValueError):
+            raise ValidationError("Số lượng / giá trị không hợp lệ.")
+
+        for fname in ("purchase_date", "in_service_date", "depreciation_start_date", "next_maintenance_date"):
+            if row.get(fname):
+                try:
+                    vals[fname] = fields.Date.to_date(row[fname])
+                except ValueError:
+                    raise ValidationError("Ngày không hợp lệ (%s): %s" % (fname, row[fname]))
+
+        if row.get("state"):
+            if row["state"] not in dict(self._fields["state"].selection):
+                raise ValidationError("Trạng thái không hợp lệ: %s" % row["state"])
+            vals["state"] = row["state"]
+        if row.get("note"):
+            vals["note"] = row["note"]
+        return vals
 
     # ------------------------------------------------------------
     # Business constraints
@@ -296,82 +858,37 @@ class MtdnAsset(models.Model):
         - linear: straight-line per period
         - declining: declining balance (double declining by default)
         - syd: sum-of-years-digits generalized by number of periods
+
+        The whole recordset is evaluated in one pass by the closed-form engine
+        (see ``mtdn_asset_depreciation``), so the cost no longer grows with the
+        number of elapsed periods.
         """
         today = fields.Date.context_today(self)
         if isinstance(today, str):
             today = fields.Date.from_string(today)
 
-        for rec in self:
-            value = rec.value or 0.0
-            total_periods = int(rec.depreciation_years or 0)
-            rec.depreciation_per_year = 0.0
-            rec.accumulated_depreciation = 0.0
-            rec.book_value = value
-
-            if rec.depreciation_method == "none" or value <= 0.0 or total_periods <= 0:
-                continue
+        rows = list(self._depreciation_rows())
+        results = depreciation.compute_depreciation_batch(rows, today)
+        for rec, row, (per, acc, book, elapsed) in zip(self, rows, results):
+            rec.depreciation_per_year = per
+            rec.accumulated_depreciation = acc
+            rec.book_value = book
+            rec.depreciation_elapsed_periods = elapsed
+            rec.depreciation_date = today
+            rec.depreciation_next_date = depreciation.next_period_date(*row, elapsed)
 
+    def _depreciation_rows(self):
+        """Depreciation inputs of ``self`` in the tuple layout of the engine."""
+        for rec in self:
             start = rec.depreciation_start_date or rec.in_service_date or rec.purchase_date
-            if not start:
-                continue
-            if isinstance(start, str):
-                start = fields.Date.from_string(start)
-
-            # How many periods have elapsed since start?
-            if today <= start:
-                elapsed_periods = 0
-            else:
-                if rec.depreciation_unit == "month":
-                    delta = relativedelta(today, start)
-                    elapsed_periods = max(delta.years * 12 + delta.months, 0)
-                else:
-                    delta = relativedelta(today, start)
-                    elapsed_periods = max(delta.years, 0)
-
-            elapsed_periods = min(elapsed_periods, total_periods)
-            if elapsed_periods <= 0:
-                continue
-
-            if rec.depreciation_method == "linear":
-                per = value / float(total_periods)
-                rec.depreciation_per_year = per
-                accumulated = per * float(elapsed_periods)
-                rec.accumulated_depreciation = min(accumulated, value)
-                rec.book_value = max(value - rec.accumulated_depreciation, 0.0)
-                continue
-
-            if rec.depreciation_method == "syd":
-                # Sum-of-years-digits generalized by number of periods
-                denom = total_periods * (total_periods + 1) / 2.0
-                if denom <= 0:
-                    continue
-                # depreciation of period i (1-based): remaining_periods / denom * value
-                acc = 0.0
-                for i in range(1, elapsed_periods + 1):
-                    remaining = total_periods - i + 1
-                    acc += value * (remaining / denom)
-                rec.depreciation_per_year = value * (total_periods / denom)
-                rec.accumulated_depreciation = min(acc, value)
-                rec.book_value = max(value - rec.accumulated_depreciation, 0.0)
-                continue
-
-            if rec.depreciation_method == "declining":
-                # Declining balance: each period depreciates by a constant rate on opening book value.
-                factor = rec.declining_factor or 2.0
-                rate = min(max(factor / float(total_periods), 0.0), 1.0)
-                book = value
-                acc = 0.0
-                for _ in range(elapsed_periods):
-                    dep = book * rate
-                    dep = min(dep, book)
-                    acc += dep
-                    book -= dep
-                    if book <= 0:
-                        book = 0.0
-                        break
-                rec.depreciation_per_year = value * rate
-                rec.accumulated_depreciation = min(acc, value)
-                rec.book_value = max(book, 0.0)
+            yield (
+                rec.depreciation_method,
+                rec.depreciation_unit,
+                rec.value,
+                rec.depreciation_years,
+                rec.declining_factor,
+                fields.Date.to_date(start) if start else False,
+            )
 
     @api.depends("next_maintenance_date")
     def _compute_maintenance_overdue(self):
@@ -391,20 +908,176 @@ class MtdnAsset(models.Model):
     # Cron
     # ------------------------------------------------------------
     @api.model
-    def _cron_update_maintenance_state(self):
-        """If next_maintenance_date is overdue, automatically move asset to Maintenance state."""
+    def _cron_update_maintenance_state(self, batch_size=1000, auto_commit=True):
+        """If next_maintenance_date is overdue, automatically move asset to Maintenance state.
+
+        Runs in committed batches. The last processed id is checkpointed in
+        ``ir.config_parameter`` (in SQL, without clearing the registry caches)
+        so an interrupted run resumes where it stopped.
+        The same pass refreshes the stored ``maintenance_overdue`` flag of the
+        assets that crossed the date boundary since it was computed.
+        Returns the processed counts.
+        """
         today = fields.Date.context_today(self)
         if isinstance(today, str):
             today = fields.Date.from_string(today)
 
-        assets = self.search(
-            [
-                ("next_maintenance_date", "!=", False),
-                ("next_maintenance_date", "<", today),
-                ("state", "not in", ["maintenance", "broken"]),
-                ("active", "=", True),
-            ]
-        )
-        if assets:
+        refreshed = self._refresh_maintenance_overdue(today, batch_size, auto_commit)
+
+        last_id = self._maintenance_checkpoint()
+        moved = 0
+        while True:
+            assets = self.search(
+                [
+                    ("id", ">", last_id),
+                    ("next_maintenance_date", "!=", False),
+                    ("next_maintenance_date", "<", today),
+                    ("state", "not in", ["maintenance", "broken"]),
+                    ("active", "=", True),
+                ],
+                order="id",
+                limit=batch_size,
+            )
+            if not assets:
+                break
             assets.write({"state": "maintenance"})
+            moved += len(assets)
+            last_id = assets[-1].id
+            self._set_maintenance_checkpoint(last_id)
+            if auto_commit:
+                self.env.cr.commit()
+            self.env.invalidate_all()
+        self._set_maintenance_checkpoint(0)
+
+        _logger.info("MTDN maintenance cron: %s asset(s) moved to maintenance, %s overdue flag(s) refreshed", moved, refreshed)
+        return {"moved": moved, "overdue_refreshed": refreshed}
+
+    @api.model
+    def _maintenance_checkpoint(self):
+        self.env.cr.execute("SELECT value FROM ir_config_parameter WHERE key = %s", [MAINTENANCE_CRON_CHECKPOINT])
+        row = self.env.cr.fetchone()
+        return int(row[0] or 0) if row else 0
+
+    @api.model
+    def _set_maintenance_checkpoint(self, last_id):
+        self.env.cr.execute(
+            """
+            INSERT INTO ir_config_parameter (key, value, create_uid, create_date, write_uid, write_date)
+            VALUES (%(key)s, %(value)s, %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC')
+            ON CONFLICT (key) DO UPDATE
+               SET value = EXCLUDED.value, write_uid = EXCLUDED.write_uid, write_date = EXCLUDED.write_date
+            """,
+            {"key": MAINTENANCE_CRON_CHECKPOINT, "value": str(last_id), "uid": self.env.uid},
+        )
+
+    @api.model
+    def _refresh_maintenance_overdue(self, today, batch_size=1000, auto_commit=True):
+        """Recompute ``maintenance_overdue`` of the assets that became overdue by ``today``.
+
+        Only the False -> True flip depends on the calendar; the opposite one
+        follows a change of ``next_maintenance_date`` and is recomputed by the
+        ORM. The filter matches ``mtdn_asset_maintenance_not_overdue_idx``.
+        """
+        self.flush_model(["maintenance_overdue", "next_maintenance_date"])
+        field = self._fields["maintenance_overdue"]
+        cr = self.env.cr
+        refreshed = 0
+        last_id = 0
+        while True:
+            cr.execute(
+                """
+                SELECT id
+                  FROM mtdn_asset
+                 WHERE id > %(last_id)s
+                   AND maintenance_overdue IS NOT TRUE
+                   AND next_maintenance_date IS NOT NULL
+                   AND next_maintenance_date < %(today)s
+              ORDER BY id
+                 LIMIT %(limit)s
+                """,
+                {"last_id": last_id, "today": today, "limit": batch_size},
+            )
+            ids = [row[0] for row in cr.fetchall()]
+            if not ids:
+                break
+            last_id = ids[-1]
+            assets = self.with_context(active_test=False).browse(ids)
+            self.env.add_to_compute(field, assets)
+            assets.flush_recordset(["maintenance_overdue"])
+            refreshed += len(ids)
+            if auto_commit:
+                cr.commit()
+            self.env.invalidate_all()
+        return refreshed
+
+    @api.model
+    def _cron_refresh_depreciation_values(self, batch_size=5000, auto_commit=True):
+        """Refresh stored depreciation values that went stale with the calendar.
+
+        Only assets whose next period boundary (``depreciation_next_date``) is
+        reached are read and recomputed: a new month for monthly units, an
+        anniversary for yearly units. The register is scanned
+        by id in chunks and each chunk is committed separately, so no lock is
+        held for long. Returns the number of refreshed assets.
+        """
+        today = fields.Date.context_today(self)
+        if isinstance(today, str):
+            today = fields.Date.from_string(today)
+
+        fnames = [
+            "depreciation_per_year",
+            "accumulated_depreciation",
+            "book_value",
+            "depreciation_elapsed_periods",
+            "depreciation_date",
+            "depreciation_next_date",
+        ]
+        self.flush_model()
+        cr = self.env.cr
+        refreshed = 0
+        last_id = 0
+        while True:
+            # Fully depreciated assets and assets still inside their current period are skipped.
+            cr.execute(
+                """
+                SELECT id, depreciation_method, depreciation_unit, value, depreciation_years,
+                       declining_factor,
+                       COALESCE(depreciation_start_date, in_service_date, purchase_date),
+                       depreciation_elapsed_periods
+                  FROM mtdn_asset
+                 WHERE id > %s
+                   AND depreciation_method != 'none'
+                   AND value > 0
+                   AND depreciation_years > 0
+                   AND COALESCE(depreciation_start_date, in_service_date, purchase_date) IS NOT NULL
+                   AND COALESCE(depreciation_elapsed_periods, 0) < depreciation_years
+                   AND (depreciation_next_date IS NULL OR depreciation_next_date <= %s)
+              ORDER BY id
+                 LIMIT %s
+                """,
+                (last_id, today, batch_size),
+            )
+            rows = cr.fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            stale_ids = []
+            for asset_id, method, unit, value, periods, factor, start, elapsed in rows:
+                _per, _acc, _book, new_elapsed = depreciation.compute_depreciation(
+                    method, unit, float(value or 0.0), periods, float(factor or 0.0), start, today
+                )
+                if new_elapsed != (elapsed or 0):
+                    stale_ids.append(asset_id)
+            if not stale_ids:
+                continue
 
+            chunk = self.browse(stale_ids)
+            for fname in fnames:
+                self.env.add_to_compute(self._fields[fname], chunk)
+            chunk.flush_recordset(fnames)
+            refreshed += len(stale_ids)
+            if auto_commit:
+                cr.commit()
+            self.env.invalidate_all()
+        return refreshed
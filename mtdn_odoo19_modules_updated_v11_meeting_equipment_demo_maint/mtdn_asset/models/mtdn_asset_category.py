@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-from odoo import api, fields, models
+from odoo import fields, models
 
 
 class MtdnAssetCategory(models.Model):
@@ -48,21 +48,17 @@ class MtdnAssetCategory(models.Model):
 
     # Quantities (roll-up from assets)
     asset_ids = fields.One2many("mtdn.asset", "category_id", string="Tài sản")
+    # Maintained incrementally by mtdn.asset (create/write/unlink), see
+    # mtdn.asset._apply_quantity_rollup_deltas and the reconciliation cron.
     quantity_total = fields.Integer(
         string="Tổng số lượng",
-        compute="_compute_quantity_total",
-        store=True,
+        default=0,
         readonly=True,
     )
 
     active = fields.Boolean(default=True)
     description = fields.Text(string="Mô tả")
 
-    @api.depends("asset_ids", "asset_ids.quantity")
-    def _compute_quantity_total(self):
-        for rec in self:
-            rec.quantity_total = sum(rec.asset_ids.mapped("quantity"))
-
     _sql_constraints = [
         ("mtdn_asset_category_code_uniq", "unique(code)", "Mã loại tài sản phải là duy nhất."),
     ]
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""Closed-form depreciation engine.
+
+Plain Python helpers (no ORM access) shared by ``mtdn.asset`` computes and
+reports. Every method is evaluated in O(1) per asset:
+
+- linear: constant amount per period
+- syd: arithmetic series of the remaining-period weights
+- declining: geometric series on the opening book value
+"""
+import calendar
+
+
+def elapsed_periods(start, as_of, unit):
+    """Number of whole periods between ``start`` and ``as_of``.
+
+    Integer month arithmetic equivalent to ``relativedelta(as_of, start)``,
+    including its end-of-month clipping (31/01 -> 28/02 counts as one month).
+    """
+    if not start or not as_of or as_of <= start:
+        return 0
+    months = (as_of.year - start.year) * 12 + (as_of.month - start.month)
+    anniversary_day = min(start.day, calendar.monthrange(as_of.year, as_of.month)[1])
+    if as_of.day < anniversary_day:
+        months -= 1
+    months = max(months, 0)
+    if unit == "month":
+        return months
+    return months // 12
+
+
+def add_periods(start, unit, count):
+    """Shift ``start`` by ``count`` periods, clipping to the end of the month."""
+    months = count if unit == "month" else count * 12
+    month_index = start.month - 1 + months
+    year = start.year + month_index // 12
+    month = month_index % 12 + 1
+    return start.replace(year=year, month=month, day=min(start.day, calendar.monthrange(year, month)[1]))
+
+
+def declining_rate(total_periods, factor):
+    factor = factor or 2.0
+    return min(max(factor / float(total_periods), 0.0), 1.0)
+
+
+def accumulated_amount(method, value, total_periods, periods, factor=2.0):
+    """Accumulated depreciation after ``periods`` periods (already capped to the total)."""
+    if periods <= 0:
+        return 0.0
+    if method == "linear":
+        acc = value / float(total_periods) * float(periods)
+    elif method == "syd":
+        denom = total_periods * (total_periods + 1) / 2.0
+        # sum_{i=1..k} (n - i + 1) = k * (2n - k + 1) / 2
+        acc = value * (periods * (2 * total_periods - periods + 1) / 2.0) / denom
+    elif method == "declining":
+        rate = declining_rate(total_periods, factor)
+        acc = value - value * (1.0 - rate) ** periods
+    else:
+        return 0.0
+    return min(acc, value)
+
+
+def period_amount(method, value, total_periods, index, factor=2.0):
+    """Depreciation booked in period ``index`` (1-based)."""
+    if method == "linear":
+        return value / float(total_periods)
+    if method == "syd":
+        denom = total_periods * (total_periods + 1) / 2.0
+        return value * ((total_periods - index + 1) / denom)
+    if method == "declining":
+        rate = declining_rate(total_periods, factor)
+        return value * (1.0 - rate) ** (index - 1) * rate
+    return 0.0
+
+
+def first_period_amount(method, value, total_periods, factor=2.0):
+    """Value displayed as "Khấu hao / kỳ" (amount of the first period)."""
+    return period_amount(method, value, total_periods, 1, factor)
+
+
+def compute_depreciation(method, unit, value, total_periods, factor, start, as_of):
+    """Return ``(per_period, accumulated, book_value, elapsed)`` for one asset."""
+    value = value or 0.0
+    total_periods = int(total_periods or 0)
+    if method == "none" or value <= 0.0 or total_periods <= 0 or not start:
+        return 0.0, 0.0, value, 0
+
+    elapsed = min(elapsed_periods(start, as_of, unit), total_periods)
+    if elapsed <= 0:
+        return 0.0, 0.0, value, 0
+
+    per = first_period_amount(method, value, total_periods, factor)
+    acc = accumulated_amount(method, value, total_periods, elapsed, factor)
+    return per, acc, max(value - acc, 0.0), elapsed
+
+
+def schedule(method, unit, value, total_periods, factor, start):
+    """Yield ``(index, period_start, period_end, amount, accumulated, book_value)`` for every period.
+
+    ``period_end`` is the date at which the period counts as elapsed, so a
+    schedule line applies to any date ``>= period_end``.
+    """
+    value = value or 0.0
+    total_periods = int(total_periods or 0)
+    if method == "none" or value <= 0.0 or total_periods <= 0 or not start:
+        return
+    previous = 0.0
+    for index in range(1, total_periods + 1):
+        acc = accumulated_amount(method, value, total_periods, index, factor)
+        yield (
+            index,
+            add_periods(start, unit, index - 1),
+            add_periods(start, unit, index),
+            acc - previous,
+            acc,
+            max(value - acc, 0.0),
+        )
+        previous = acc
+
+
+def next_period_date(method, unit, value, total_periods, factor, start, elapsed):
+    """Date at which period ``elapsed + 1`` elapses, or ``None`` when nothing changes any more."""
+    total_periods = int(total_periods or 0)
+    if method == "none" or (value or 0.0) <= 0.0 or not start or elapsed >= total_periods:
+        return None
+    return add_periods(start, unit, elapsed + 1)
+
+
+def compute_depreciation_batch(rows, as_of):
+    """Evaluate many assets at once.
+
+    ``rows`` is an iterable of ``(method, unit, value, total_periods, factor, start)``
+    tuples; results are yielded in the same order. Usable on ORM records as well
+    as on raw SQL rows, so large registers never need to be browsed.
+    """
+    for method, unit, value, total_periods, factor, start in rows:
+        yield compute_depreciation(method, unit, value, total_periods, factor, start, as_of)
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+from odoo import api, fields, models
+from odoo.tools import create_index
+
+
+class MtdnAssetDepreciationLine(models.Model):
+    _name = "mtdn.asset.depreciation.line"
+    _description = "MTDN Asset Depreciation Schedule Line"
+    _order = "asset_id, period_index"
+
+    asset_id = fields.Many2one(
+        "mtdn.asset",
+        string="Tài sản",
+        required=True,
+        ondelete="cascade",
+        index=True,
+    )
+    category_id = fields.Many2one(related="asset_id.category_id", store=True, index=True)
+    company_id = fields.Many2one(related="asset_id.company_id", store=True, index=True)
+    currency_id = fields.Many2one(related="asset_id.currency_id")
+
+    period_index = fields.Integer(string="Kỳ", required=True)
+    period_start = fields.Date(string="Bắt đầu kỳ", required=True)
+    period_end = fields.Date(
+        string="Kết thúc kỳ",
+        required=True,
+        index=True,
+        help="Ngày kỳ khấu hao được tính là đã qua (áp dụng cho mọi ngày >= ngày này).",
+    )
+    amount = fields.Monetary(string="Khấu hao trong kỳ", currency_field="currency_id")
+    accumulated = fields.Monetary(string="Khấu hao lũy kế", currency_field="currency_id")
+    book_value = fields.Monetary(string="Giá trị còn lại", currency_field="currency_id")
+
+    def init(self):
+        # Serves "latest line per asset at date D" (DISTINCT ON asset_id ... period_end DESC).
+        create_index(
+            self.env.cr,
+            "mtdn_asset_depreciation_line_asset_period_end_idx",
+            self._table,
+            ["asset_id", "period_end"],
+        )
+
+    @api.model
+    def _read_as_of(self, as_of, asset_ids=None):
+        """Return ``{asset_id: (period_index, accumulated, book_value)}`` at ``as_of``.
+
+        Used by ``mtdn.asset._iter_valuation_as_of``. Assets with no elapsed
+        period at that date are absent from the result (their book value is
+        still the full asset value).
+        """
+        self.flush_model()
+        query = """
+            SELECT DISTINCT ON (asset_id) asset_id, period_index, accumulated, book_value
+              FROM mtdn_asset_depreciation_line
+             WHERE period_end <= %s
+        """
+        params = [as_of]
+        if asset_ids is not None:
+            if not asset_ids:
+                return {}
+            query += " AND asset_id = ANY(%s)"
+            params.append(list(asset_ids))
+        query += " ORDER BY asset_id, period_end DESC"
+        self.env.cr.execute(query, params)
+        return {row[0]: row[1:] for row in self.env.cr.fetchall()}
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from odoo import api, fields, models
+from odoo import fields, models
 
 
 class MtdnAssetEquipmentType(models.Model):
@@ -14,18 +14,13 @@ class MtdnAssetEquipmentType(models.Model):
     description = fields.Text(string="Mô tả")
 
     asset_ids = fields.One2many("mtdn.asset", "equipment_type_id", string="Tài sản")
+    # Delta-maintained by mtdn.asset, like mtdn.asset.category.quantity_total.
     quantity_total = fields.Integer(
         string="Tổng số lượng",
-        compute="_compute_quantity_total",
-        store=True,
+        default=0,
         readonly=True,
     )
 
-    @api.depends("asset_ids", "asset_ids.quantity")
-    def _compute_quantity_total(self):
-        for rec in self:
-            rec.quantity_total = sum(rec.asset_ids.mapped("quantity"))
-
     _sql_constraints = [
         (
             "mtdn_asset_equipment_type_code_uniq",
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+from odoo import api, fields, models
+from odoo.tools import create_index
+
+
+class MtdnAssetStateLog(models.Model):
+    """Append-only log of asset state intervals.
+
+    Each row is one interval ``[valid_from, valid_to)`` during which an asset
+    kept the same state and assignee; the current interval has no
+    ``valid_to``. Rows are only ever closed (``valid_to`` set) and appended.
+    """
+
+    _name = "mtdn.asset.state.log"
+    _description = "MTDN Asset State History"
+    _order = "asset_id, valid_from desc"
+
+    asset_id = fields.Many2one(
+        "mtdn.asset",
+        string="Tài sản",
+        required=True,
+        ondelete="cascade",
+        index=True,
+    )
+    state = fields.Selection(
+        selection=[
+            ("available", "Sẵn sàng"),
+            ("in_use", "Đang sử dụng"),
+            ("maintenance", "Bảo trì"),
+            ("broken", "Hỏng"),
+        ],
+        string="Trạng thái",
+        required=True,
+        index=True,
+    )
+    employee_id = fields.Many2one("mtdn.employee", string="Nhân viên", ondelete="set null")
+    department_id = fields.Many2one("mtdn.department", string="Phòng ban", ondelete="set null")
+    valid_from = fields.Datetime(string="Từ", required=True)
+    valid_to = fields.Datetime(string="Đến", help="Để trống: trạng thái hiện tại.")
+
+    def init(self):
+        # Overlap queries ("in state X on day D", downtime in a period).
+        self.env.cr.execute(
+            """
+            CREATE INDEX IF NOT EXISTS mtdn_asset_state_log_period_idx
+                ON mtdn_asset_state_log USING gist (tsrange(valid_from, valid_to, '[)'))
+            """
+        )
+        create_index(
+            self.env.cr,
+            "mtdn_asset_state_log_open_idx",
+            self._table,
+            ["asset_id"],
+            where="valid_to IS NULL",
+        )
+
+    @api.model
+    def _log_transitions(self, assets, when=None):
+        """Close the open interval of ``assets`` and open a new one from their current values."""
+        if not assets:
+            return self
+        when = when or fields.Datetime.now()
+        self.flush_model()
+        self.env.cr.execute(
+            "UPDATE mtdn_asset_state_log SET valid_to = %s WHERE asset_id = ANY(%s) AND valid_to IS NULL",
+            [when, assets.ids],
+        )
+        self.invalidate_model(["valid_to"])
+        return self.create(
+            [
+                {
+                    "asset_id": asset.id,
+                    "state": asset.state,
+                    "employee_id": asset.employee_id.id,
+                    "department_id": asset.department_id.id,
+                    "valid_from": when,
+                }
+                for asset in assets
+            ]
+        )
+
+    @api.model
+    def _init_missing_logs(self):
+        """Open a first interval (from the asset creation date) for assets without history."""
+        self.flush_model()
+        self.env.cr.execute(
+            """
+            INSERT INTO mtdn_asset_state_log
+                   (asset_id, state, employee_id, department_id, valid_from,
+                    create_uid, create_date, write_uid, write_date)
+            SELECT a.id, a.state, a.employee_id, a.department_id, COALESCE(a.create_date, NOW() AT TIME ZONE 'UTC'),
+                   %s, NOW() AT TIME ZONE 'UTC', %s, NOW() AT TIME ZONE 'UTC'
+              FROM mtdn_asset a
+             WHERE NOT EXISTS (SELECT 1 FROM mtdn_asset_state_log l WHERE l.asset_id = a.id)
+            """,
+            [self.env.uid, self.env.uid],
+        )
+
+    @api.model
+    def _read_assets_in_state(self, state, date_from, date_to):
+        """Ids of assets that were in ``state`` at some point of ``[date_from, date_to)``."""
+        self.flush_model()
+        self.env.cr.execute(
+            """
+            SELECT DISTINCT asset_id
+              FROM mtdn_asset_state_log
+             WHERE state = %s
+               AND tsrange(valid_from, valid_to, '[)') && tsrange(%s, %s, '[)')
+            """,
+            [state, date_from, date_to],
+        )
+        return [row[0] for row in self.env.cr.fetchall()]
+
+    @api.model
+    def _read_downtime_hours(self, date_from, date_to, states=("maintenance", "broken"), asset_ids=None):
+        """Return ``{asset_id: hours}`` spent in ``states`` within ``[date_from, date_to)``."""
+        self.flush_model()
+        query = """
+            SELECT asset_id,
+                   SUM(EXTRACT(EPOCH FROM
+                       LEAST(COALESCE(valid_to, %(to)s), %(to)s) - GREATEST(valid_from, %(from)s)
+                   )) / 3600.0
+              FROM mtdn_asset_state_log
+             WHERE state = ANY(%(states)s)
+               AND tsrange(valid_from, valid_to, '[)') && tsrange(%(from)s, %(to)s, '[)')
+        """
+        params = {"from": date_from, "to": date_to, "states": list(states)}
+        if asset_ids is not None:
+            query += " AND asset_id = ANY(%(asset_ids)s)"
+            params["asset_ids"] = list(asset_ids)
+        query += " GROUP BY asset_id"
+        self.env.cr.execute(query, params)
+        return dict(self.env.cr.fetchall())
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 
-from odoo import api, fields, models
+from odoo import fields, models
 
 
 class MtdnBranch(models.Model):
@@ -30,18 +30,13 @@ class MtdnBranch(models.Model):
     description = fields.Text(string="Mô tả")
 
     asset_ids = fields.One2many("mtdn.asset", "branch_id", string="Tài sản")
+    # Delta-maintained by mtdn.asset, like mtdn.asset.category.quantity_total.
     quantity_total = fields.Integer(
         string="Tổng số lượng",
-        compute="_compute_quantity_total",
-        store=True,
+        default=0,
         readonly=True,
     )
 
-    @api.depends("asset_ids", "asset_ids.quantity")
-    def _compute_quantity_total(self):
-        for rec in self:
-            rec.quantity_total = sum(rec.asset_ids.mapped("quantity"))
-
     _sql_constraints = [
         ("mtdn_branch_code_company_uniq", "unique(code, company_id)", "Mã chi nhánh phải là duy nhất trong mỗi công ty."),
     ]
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+from collections import defaultdict
+
+from odoo import models
+
+
+class MtdnEmployee(models.Model):
+    _inherit = "mtdn.employee"
+
+    def _mtdn_offboard(self, options):
+        """Hand over the assets held by the leaving employees (one write per target).
+
+        ``asset_policy``:
+        - ``department``: assign to the employee's department (stock when none)
+        - ``stock``: unassign; in-use assets become available
+        - ``employee``: assign to ``asset_employee_id``
+        """
+        Asset = self.env["mtdn.asset"]
+        assets = Asset.search([("employee_id", "in", self.ids)])
+        policy = options.get("asset_policy") or "department"
+        grouped = defaultdict(list)
+        for asset in assets:
+            if policy == "employee" and options.get("asset_employee_id"):
+                vals = {"employee_id": options["asset_employee_id"]}
+            elif policy == "department" and asset.employee_id.department_id:
+                vals = {"employee_id": False, "department_id": asset.employee_id.department_id.id}
+            elif asset.state == "in_use":
+                vals = {"employee_id": False, "state": "available"}
+            else:
+                vals = {"employee_id": False}
+            grouped[tuple(sorted(vals.items()))].append(asset.id)
+        for vals, asset_ids in grouped.items():
+            Asset.browse(asset_ids).write(dict(vals))
+
+        summary = super()._mtdn_offboard(options)
+        summary["Tài sản đã bàn giao"] = len(assets)
+        return summary
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+from odoo.tests import TransactionCase, tagged
+
+
+@tagged("post_install", "-at_install")
+class TestQuantityRollup(TransactionCase):
+    """The delta-maintained ``quantity_total`` roll-ups must match a full recompute."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        Category = cls.env["mtdn.asset.category"]
+        cls.category_a = Category.create({"name": "Rollup A", "code": "ROLLUP-A"})
+        cls.category_b = Category.create({"name": "Rollup B", "code": "ROLLUP-B"})
+        cls.equipment_type = cls.env["mtdn.asset.equipment.type"].create({"name": "Rollup TV", "code": "ROLLUP-TV"})
+        Branch = cls.env["mtdn.branch"]
+        cls.branch_a = Branch.create({"name": "Rollup HN", "code": "ROLLUP-HN"})
+        cls.branch_b = Branch.create({"name": "Rollup HCM", "code": "ROLLUP-HCM"})
+
+    def _totals(self):
+        return {
+            "category_a": self.category_a.quantity_total,
+            "category_b": self.category_b.quantity_total,
+            "equipment_type": self.equipment_type.quantity_total,
+            "branch_a": self.branch_a.quantity_total,
+            "branch_b": self.branch_b.quantity_total,
+        }
+
+    def _assert_no_drift(self, expected):
+        self.env.invalidate_all()
+        self.assertEqual(self._totals(), expected)
+        self.assertEqual(self.env["mtdn.asset"]._cron_reconcile_quantity_totals(), 0)
+
+    def test_incremental_matches_reconcile(self):
+        Asset = self.env["mtdn.asset"]
+        assets = Asset.create(
+            [
+                {
+                    "name": "TV 1",
+                    "category_id": self.category_a.id,
+                    "equipment_type_id": self.equipment_type.id,
+                    "branch_id": self.branch_a.id,
+                    "quantity": 2,
+                },
+                {"name": "Bàn", "category_id": self.category_a.id, "branch_id": self.branch_b.id, "quantity": 5},
+                {"name": "Ghế", "category_id": self.category_b.id, "quantity": 10},
+            ]
+        )
+        tv, desk, chairs = assets
+        self._assert_no_drift(
+            {"category_a": 7, "category_b": 10, "equipment_type": 2, "branch_a": 2, "branch_b": 5}
+        )
+
+        # quantity and parent changes, in one write on several assets
+        (tv | desk).write({"quantity": 3, "category_id": self.category_b.id})
+        chairs.write({"branch_id": self.branch_a.id})
+        self._assert_no_drift(
+            {"category_a": 0, "category_b": 16, "equipment_type": 3, "branch_a": 13, "branch_b": 3}
+        )
+
+        # archived assets do not count
+        desk.write({"active": False})
+        self._assert_no_drift(
+            {"category_a": 0, "category_b": 13, "equipment_type": 3, "branch_a": 13, "branch_b": 0}
+        )
+        desk.write({"active": True, "branch_id": False})
+        self._assert_no_drift(
+            {"category_a": 0, "category_b": 16, "equipment_type": 3, "branch_a": 13, "branch_b": 0}
+        )
+
+        tv.unlink()
+        self._assert_no_drift(
+            {"category_a": 0, "category_b": 13, "equipment_type": 0, "branch_a": 10, "branch_b": 0}
+        )
@@ -0,0 +1,4 @@
+from . import mtdn_asset_import_wizard
+from . import mtdn_asset_export_wizard
+from . import mtdn_employee_offboard_wizard
+from . import mtdn_department_restructure_wizard
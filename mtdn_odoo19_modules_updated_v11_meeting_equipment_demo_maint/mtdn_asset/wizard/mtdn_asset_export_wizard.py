@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+from urllib.parse import urlencode
+
+from odoo import fields, models
+
+
+class MtdnAssetExportWizard(models.TransientModel):
+    _name = "mtdn.asset.export.wizard"
+    _description = "MTDN Asset Register Export (Wizard)"
+
+    file_format = fields.Selection(
+        selection=[("csv", "CSV"), ("xlsx", "Excel (XLSX)")],
+        string="Định dạng",
+        required=True,
+        default="csv",
+    )
+    branch_ids = fields.Many2many("mtdn.branch", string="Chi nhánh")
+    category_ids = fields.Many2many("mtdn.asset.category", string="Loại tài sản")
+    state = fields.Selection(
+        selection=[
+            ("available", "Sẵn sàng"),
+            ("in_use", "Đang sử dụng"),
+            ("maintenance", "Bảo trì"),
+            ("broken", "Hỏng"),
+        ],
+        string="Trạng thái",
+        help="Để trống để xuất tất cả trạng thái.",
+    )
+    as_of_date = fields.Date(
+        string="Giá trị còn lại tại ngày",
+        required=True,
+        default=fields.Date.context_today,
+    )
+
+    def action_export(self):
+        self.ensure_one()
+        params = {
+            "file_format": self.file_format,
+            "as_of": fields.Date.to_string(self.as_of_date),
+        }
+        if self.branch_ids:
+            params["branch_ids"] = ",".join(str(i) for i in self.branch_ids.ids)
+        if self.category_ids:
+            params["category_ids"] = ",".join(str(i) for i in self.category_ids.ids)
+        if self.state:
+            params["states"] = self.state
+        return {
+            "type": "ir.actions.act_url",
+            "url": "/mtdn_asset/export/register?%s" % urlencode(params),
+            "target": "self",
+        }
@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+from odoo import models
+
+
+class MtdnAssetImportWizard(models.TransientModel):
+    _name = "mtdn.asset.import.wizard"
+    _inherit = ["mtdn.import.file.mixin"]
+    _description = "MTDN Asset Bulk Import (Wizard)"
+
+    def action_import(self):
+        return self._mtdn_import_rows("mtdn.asset")
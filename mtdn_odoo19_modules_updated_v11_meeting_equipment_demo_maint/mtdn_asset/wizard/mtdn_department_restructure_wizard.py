@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+from odoo import api, fields, models
+
+
+class MtdnDepartmentRestructureWizard(models.TransientModel):
+    _inherit = "mtdn.department.restructure.wizard"
+
+    asset_count = fields.Integer(string="Tài sản được chuyển", compute="_compute_asset_count")
+
+    def _asset_domain(self):
+        """Assets changing department: held by the merged departments or by the moved employees.
+
+        An asset is assigned to an employee or to a department, never both
+        (``_check_single_assignment``): the ones held by an employee follow
+        their holder and need no write of their own.
+        """
+        self.ensure_one()
+        if self.operation == "merge":
+            return [("department_id", "in", self.source_department_ids._origin.ids)]
+        return [("employee_id", "in", self.employee_ids._origin.ids)]
+
+    @api.depends("operation", "source_department_ids", "employee_ids")
+    def _compute_asset_count(self):
+        Asset = self.env["mtdn.asset"].with_context(active_test=False)
+        for wiz in self:
+            count = 0
+            if wiz.source_department_ids if wiz.operation == "merge" else wiz.employee_ids:
+                [(count,)] = Asset._read_group(wiz._asset_domain(), [], ["__count"])
+            wiz.asset_count = count
+
+    def _restructure_apply(self, target, summary):
+        """Merged departments hand their assets over to the target (one write)."""
+        super()._restructure_apply(target, summary)
+        Asset = self.env["mtdn.asset"].with_context(active_test=False)
+        if self.operation == "merge":
+            assets = Asset.search(self._asset_domain())
+            assets.write({"department_id": target.id})
+            summary["Tài sản được chuyển"] = len(assets)
+        else:
+            summary["Tài sản được chuyển"] = Asset.search_count(self._asset_domain())
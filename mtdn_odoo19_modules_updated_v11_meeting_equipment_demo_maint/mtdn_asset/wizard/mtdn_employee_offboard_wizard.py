@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+from odoo import api, fields, models
+from odoo.exceptions import ValidationError
+
+
+class MtdnEmployeeOffboardWizard(models.TransientModel):
+    _inherit = "mtdn.employee.offboard.wizard"
+
+    asset_policy = fields.Selection(
+        selection=[
+            ("department", "Giao lại cho phòng ban"),
+            ("stock", "Thu hồi về kho"),
+            ("employee", "Bàn giao cho nhân viên khác"),
+        ],
+        string="Tài sản đang giữ",
+        required=True,
+        default="department",
+    )
+    asset_employee_id = fields.Many2one("mtdn.employee", string="Nhận bàn giao tài sản")
+
+    @api.constrains("asset_policy", "asset_employee_id", "employee_ids")
+    def _check_asset_employee(self):
+        for wiz in self:
+            if wiz.asset_policy != "employee":
+                continue
+            if not wiz.asset_employee_id:
+                raise ValidationError("Vui lòng chọn nhân viên nhận bàn giao tài sản.")
+            if wiz.asset_employee_id in wiz.employee_ids:
+                raise ValidationError("Nhân viên nhận bàn giao tài sản không được nằm trong danh sách nghỉ việc.")
+
+    def _offboard_options(self):
+        options = super()._offboard_options()
+        options.update(asset_policy=self.asset_policy, asset_employee_id=self.asset_employee_id.id)
+        return options
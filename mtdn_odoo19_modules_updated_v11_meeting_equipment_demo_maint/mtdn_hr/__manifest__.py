@@ -6,13 +6,17 @@
     "category": "MTDN",
     "author": "MTDN",
     "license": "LGPL-3",
-    "depends": ["base", "web"],
+    "depends": ["base", "web", "bus"],
     "data": [
         "security/ir.model.access.csv",
         "data/sequences.xml",
+        "data/cron.xml",
+        "data/headcount_snapshot.xml",
         "views/mtdn_department_views.xml",
         "views/mtdn_job_views.xml",
         "views/mtdn_employee_views.xml",
+        "views/mtdn_headcount_snapshot_views.xml",
+        "views/mtdn_employee_wizard_views.xml",
         "views/mtdn_hr_actions.xml",
         "views/mtdn_hr_menus.xml",
     ],
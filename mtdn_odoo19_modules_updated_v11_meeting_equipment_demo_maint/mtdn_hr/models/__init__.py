@@ -1,3 +1,8 @@
+from . import mtdn_unaccent_search
+from . import mtdn_import_file_mixin
+from . import mtdn_change_notifier
 from . import mtdn_department
 from . import mtdn_job
 from . import mtdn_employee
+from . import ir_sequence
+from . import mtdn_headcount_snapshot
@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+from contextlib import contextmanager
+
+from odoo import api, models
+from odoo.tools import SQL
+
+# Bus channel every internal user listens to, and notification type sent on it.
+MTDN_CHANGES_CHANNEL = "mtdn_changes"
+MTDN_CHANGES_TYPE = "mtdn.changes"
+
+_PRECOMMIT_KEY = "mtdn.changes"
+_POSTCOMMIT_KEY = "mtdn.versions"
+
+# Data versions shared by every worker (one Postgres sequence each), used as
+# ormcache keys instead of clearing the registry caches.
+DATA_VERSIONS = ("hr_dashboard", "employee_user")
+
+
+class MtdnChangeNotifier(models.AbstractModel):
+    """Collect record changes during a transaction and publish them once on the bus.
+
+    ``_mtdn_notify("booking", changed=ids)`` may be called any number of
+    times; a single message ``{kind: {"changed": [...], "deleted": [...]}}``
+    is sent right before commit (nothing on rollback). Clients re-read only
+    the listed ids.
+    """
+
+    _name = "mtdn.change.notifier"
+    _description = "MTDN Change Notifications"
+
+    def init(self):
+        for key in DATA_VERSIONS:
+            self.env.cr.execute(SQL("CREATE SEQUENCE IF NOT EXISTS %s", SQL.identifier(self._mtdn_version_sequence(key))))
+
+    @api.model
+    def _mtdn_version_sequence(self, key):
+        if key not in DATA_VERSIONS:
+            raise ValueError("Unknown data version %r" % key)
+        return "mtdn_version_%s_seq" % key
+
+    @api.model
+    def _mtdn_bump_version(self, *keys):
+        """Advance the data versions ``keys`` once the transaction is committed.
+
+        The sequences are bumped after commit (in their own cursor), so the
+        data is committed before any worker can read the new version. Sequences
+        ignore snapshots though: a transaction that started earlier reads the
+        new version but not the data. Cache fillers therefore read the data
+        through ``_mtdn_fresh_env``, after reading the version.
+        """
+        postcommit = self.env.cr.postcommit
+        pending = postcommit.data.get(_POSTCOMMIT_KEY)
+        if pending is None:
+            pending = postcommit.data[_POSTCOMMIT_KEY] = set()
+            registry = self.env.registry
+
+            @postcommit.add
+            def bump():
+                with registry.cursor() as cr:
+                    for key in sorted(pending):
+                        cr.execute(SQL("SELECT nextval(%s)", self._mtdn_version_sequence(key)))
+
+        pending.update(keys)
+
+    @api.model
+    def _mtdn_data_version(self, key):
+        """Current value of the data version ``key``.
+
+        Returns ``None`` when the data changed in the current, uncommitted
+        transaction: the caller then reads it without cache.
+        """
+        if key in self.env.cr.postcommit.data.get(_POSTCOMMIT_KEY, ()):
+            return None
+        self.env.cr.execute(SQL("SELECT last_value FROM %s", SQL.identifier(self._mtdn_version_sequence(key))))
+        return self.env.cr.fetchone()[0]
+
+    @contextmanager
+    def _mtdn_fresh_env(self):
+        """Yield this environment on a new cursor, whose snapshot starts now.
+
+        Data read there includes every change whose version was read before
+        entering, which the current cursor's snapshot may not.
+        """
+        with self.env.registry.cursor() as cr:
+            yield self.env(cr=cr)
+
+    @api.model
+    def _mtdn_notify(self, kind, changed=(), deleted=()):
+        changed = [record_id for record_id in changed if isinstance(record_id, int)]
+        deleted = [record_id for record_id in deleted if isinstance(record_id, int)]
+        if not changed and not deleted:
+            return
+        precommit = self.env.cr.precommit
+        buffer = precommit.data.get(_PRECOMMIT_KEY)
+        if buffer is None:
+            buffer = precommit.data[_PRECOMMIT_KEY] = {}
+            env = self.env(su=True)
+
+            @precommit.add
+            def send():
+                payload = {}
+                for name, ids in buffer.items():
+                    gone = ids["deleted"]
+                    payload[name] = {"changed": sorted(ids["changed"] - gone), "deleted": sorted(gone)}
+                if payload:
+                    env["bus.bus"]._sendone(MTDN_CHANGES_CHANNEL, MTDN_CHANGES_TYPE, payload)
+                    env["bus.bus"].flush_model()
+
+        entry = buffer.setdefault(kind, {"changed": set(), "deleted": set()})
+        entry["changed"].update(changed)
+        entry["deleted"].update(deleted)
+
+
+class IrWebsocket(models.AbstractModel):
+    _inherit = "ir.websocket"
+
+    def _build_bus_channel_list(self, channels):
+        channels = list(channels)
+        if self.env.uid and self.env.user._is_internal():
+            channels.append(MTDN_CHANGES_CHANNEL)
+        return super()._build_bus_channel_list(channels)
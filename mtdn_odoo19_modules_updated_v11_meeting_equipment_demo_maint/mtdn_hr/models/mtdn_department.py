@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-from odoo import fields, models
+from odoo import api, fields, models
 
 
 class MtdnDepartment(models.Model):
@@ -32,3 +32,24 @@ class MtdnDepartment(models.Model):
     _sql_constraints = [
         ("mtdn_department_code_company_uniq", "unique(code, company_id)", "Mã phòng ban phải là duy nhất trong mỗi công ty."),
     ]
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env["mtdn.change.notifier"]._mtdn_bump_version("hr_dashboard")
+        self.env["mtdn.change.notifier"]._mtdn_notify("department", changed=records.ids)
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        if {"name", "active", "company_id"}.intersection(vals):
+            self.env["mtdn.change.notifier"]._mtdn_bump_version("hr_dashboard")
+            self.env["mtdn.change.notifier"]._mtdn_notify("department", changed=self.ids)
+        return res
+
+    def unlink(self):
+        ids = self.ids
+        res = super().unlink()
+        self.env["mtdn.change.notifier"]._mtdn_bump_version("hr_dashboard")
+        self.env["mtdn.change.notifier"]._mtdn_notify("department", deleted=ids)
+        return res
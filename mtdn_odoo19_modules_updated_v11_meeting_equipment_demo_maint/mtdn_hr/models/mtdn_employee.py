@@ -1,12 +1,28 @@
 # -*- coding: utf-8 -*-
-from odoo import api, fields, models
+import copy
+
+from odoo import api, fields, models, tools
 from odoo.exceptions import ValidationError
+from odoo.tools import create_index
+
+EMPLOYEE_STATES = ("probation", "working", "on_leave", "resigned")
+
+# Employee fields feeding the cached dashboard counters.
+DASHBOARD_FIELDS = {"state", "department_id", "job_id", "active"}
+
+# Employee fields feeding the cached user -> employee resolution.
+USER_LINK_FIELDS = {"user_id", "email", "active", "code", "name"}
 
 
 class MtdnEmployee(models.Model):
     _name = "mtdn.employee"
+    _inherit = ["mtdn.unaccent.search.mixin"]
     _description = "MTDN Employee"
     _order = "code, name"
+    _parent_name = "manager_id"
+    _parent_store = True
+
+    _mtdn_search_columns = ("name", "code", "email")
 
     code = fields.Char(
         string="Mã nhân viên",
@@ -48,7 +64,12 @@ class MtdnEmployee(models.Model):
         "mtdn.employee",
         string="Quản lý trực tiếp",
         ondelete="set null",
+        index=True,
     )
+    # Materialized manager chain ("1/7/42/"), maintained by the ORM (_parent_store).
+    parent_path = fields.Char(index=True)
+    subordinate_ids = fields.One2many("mtdn.employee", "manager_id", string="Cấp dưới trực tiếp")
+    report_count = fields.Integer(string="Nhân sự cấp dưới", compute="_compute_report_count")
 
     start_date = fields.Date(string="Ngày vào làm", required=True, default=fields.Date.context_today)
     leave_date = fields.Date(string="Ngày nghỉ việc")
@@ -67,17 +88,95 @@ class MtdnEmployee(models.Model):
     )
     active = fields.Boolean(default=True)
     note = fields.Text(string="Ghi chú")
+    user_id = fields.Many2one(
+        "res.users",
+        string="Tài khoản người dùng",
+        ondelete="set null",
+        copy=False,
+        index="btree_not_null",
+    )
 
     _sql_constraints = [
         ("mtdn_employee_code_uniq", "unique(code)", "Mã nhân viên phải là duy nhất."),
+        ("mtdn_employee_user_uniq", "unique(user_id)", "Mỗi tài khoản người dùng chỉ gắn với một nhân viên."),
     ]
 
+    def init(self):
+        # Prefix scans for child_of / subtree queries: parent_path LIKE '1/7/%'.
+        create_index(
+            self.env.cr,
+            "mtdn_employee_parent_path_prefix_idx",
+            self._table,
+            ["parent_path text_pattern_ops"],
+        )
+        # Case-insensitive email match used when no user is linked.
+        create_index(
+            self.env.cr,
+            "mtdn_employee_email_lower_idx",
+            self._table,
+            ["lower(email)"],
+            where="email IS NOT NULL",
+        )
+
+    def _compute_report_count(self):
+        """Size of each subtree (all levels, archived excluded) in one query."""
+        counts = {}
+        real = self.filtered("id")
+        if real:
+            self.flush_model(["parent_path", "active"])
+            self.env.cr.execute(
+                """
+                SELECT e.id, COUNT(s.id)
+                  FROM mtdn_employee e
+                  JOIN mtdn_employee s
+                    ON s.parent_path LIKE e.parent_path || '%%'
+                   AND s.id != e.id
+                   AND s.active
+                 WHERE e.id = ANY(%s)
+              GROUP BY e.id
+                """,
+                [real.ids],
+            )
+            counts = dict(self.env.cr.fetchall())
+        for rec in self:
+            rec.report_count = counts.get(rec.id, 0)
+
     @api.model_create_multi
     def create(self, vals_list):
-        for vals in vals_list:
-            if not vals.get("code") or vals.get("code") == "New":
-                vals["code"] = self.env["ir.sequence"].next_by_code("mtdn.employee") or "New"
-        return super().create(vals_list)
+        # one sequence reservation for all records without a code
+        missing_code = [vals for vals in vals_list if not vals.get("code") or vals.get("code") == "New"]
+        if missing_code:
+            codes = self.env["ir.sequence"].mtdn_next_by_code_batch("mtdn.employee", len(missing_code))
+            for vals, code in zip(missing_code, codes):
+                vals["code"] = code or "New"
+        records = super().create(vals_list)
+        notifier = self.env["mtdn.change.notifier"]
+        notifier._mtdn_bump_version("hr_dashboard", "employee_user")
+        notifier._mtdn_notify("employee", changed=records.ids)
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        notifier = self.env["mtdn.change.notifier"]
+        if DASHBOARD_FIELDS.intersection(vals):
+            notifier._mtdn_bump_version("hr_dashboard")
+        if USER_LINK_FIELDS.intersection(vals):
+            notifier._mtdn_bump_version("employee_user")
+        notifier._mtdn_notify("employee", changed=self.ids)
+        return res
+
+    def unlink(self):
+        ids = self.ids
+        res = super().unlink()
+        notifier = self.env["mtdn.change.notifier"]
+        notifier._mtdn_bump_version("hr_dashboard", "employee_user")
+        notifier._mtdn_notify("employee", deleted=ids)
+        return res
+
+    @api.constrains("manager_id")
+    def _check_manager_recursion(self):
+        if self._has_cycle():
+            raise ValidationError("Không thể chọn quản lý trực tiếp là chính nhân viên hoặc cấp dưới của họ.")
 
     @api.constrains("start_date", "leave_date")
     def _check_leave_date(self):
@@ -123,26 +222,351 @@ class MtdnEmployee(models.Model):
 
     def action_resign(self):
         today = fields.Date.context_today(self)
-        for rec in self:
-            vals = {"state": "resigned", "active": False}
-            if not rec.leave_date:
-                vals["leave_date"] = today
-            rec.write(vals)
+        without_date = self.filtered(lambda rec: not rec.leave_date)
+        if without_date:
+            without_date.write({"state": "resigned", "active": False, "leave_date": today})
+        if self - without_date:
+            (self - without_date).write({"state": "resigned", "active": False})
 
+    def _mtdn_offboard(self, options):
+        """Resign ``self`` in bulk and release what they hold.
+
+        ``options`` comes from ``mtdn.employee.offboard.wizard`` (``leave_date``
+        plus the policies added by the asset and meeting modules, which extend
+        this method). Returns a ``{label: count}`` summary of what was done.
+        """
+        leave_date = options.get("leave_date") or fields.Date.context_today(self)
+        self.write({"state": "resigned", "active": False, "leave_date": leave_date})
+        return {"Nhân viên nghỉ việc": len(self)}
+
+    # ------------------------------------------------------------
+    # Bulk import (onboarding)
+    # ------------------------------------------------------------
     @api.model
-    def mtdn_get_dashboard_data(self):
-        """Return small aggregated data for the HR dashboard (used by JS client action)."""
-        Employee = self.with_context(active_test=False)
-        Department = self.env["mtdn.department"].sudo()
-        Job = self.env["mtdn.job"].sudo()
+    def mtdn_bulk_import(self, rows, chunk_size=1000):
+        """Import employees from an iterable of ``(line_number, row)`` pairs.
+
+        Departments, jobs and managers are resolved by code from lookups
+        loaded once; employees are created chunk by chunk (one sequence
+        reservation per chunk). Managers listed later in the same file are
+        linked at the end with one write per manager.
 
+        Returns ``{"created": int, "errors": [(line_number, message), ...]}``.
+        """
+        lookups = self._mtdn_import_lookups()
+        created = 0
+        errors = []
+        chunk = []
+        pending_managers = {}
+        for line_no, row in rows:
+            try:
+                vals = self._mtdn_import_prepare_vals(row, lookups)
+            except ValidationError as e:
+                errors.append((line_no, e.args[0]))
+                continue
+            manager_code = vals.pop("_manager_code", None)
+            chunk.append((line_no, vals, manager_code))
+            if len(chunk) >= chunk_size:
+                created += self._mtdn_import_create_chunk(chunk, errors, pending_managers)
+                chunk = []
+        if chunk:
+            created += self._mtdn_import_create_chunk(chunk, errors, pending_managers)
+        self._mtdn_import_link_managers(pending_managers, errors)
+        return {"created": created, "errors": errors}
+
+    @api.model
+    def _mtdn_import_lookups(self):
+        """Code -> id maps for the many2ones the import can reference (one query each)."""
+        company_domain = [("company_id", "in", self.env.companies.ids)]
+        departments = self.env["mtdn.department"].with_context(active_test=False).search_read(company_domain, ["code"])
+        jobs = self.env["mtdn.job"].with_context(active_test=False).search_read(
+            [("department_id.company_id", "in", self.env.companies.ids)], ["code", "department_id"]
+        )
+        employees = self.with_context(active_test=False).search_read([], ["code"])
         return {
-            "employee_total": Employee.search_count([]),
-            "probation": Employee.search_count([("state", "=", "probation")]),
-            "working": Employee.search_count([("state", "=", "working")]),
-            "on_leave": Employee.search_count([("state", "=", "on_leave")]),
-            "resigned": Employee.search_count([("state", "=", "resigned")]),
-            "department_total": Department.search_count([]),
-            "job_total": Job.search_count([]),
+            "department": {rec["code"]: rec["id"] for rec in departments},
+            "job": {(rec["department_id"][0], rec["code"]): rec["id"] for rec in jobs},
+            "employee": {rec["code"]: rec["id"] for rec in employees},
+            "states": dict(self._fields["state"].selection),
+            "genders": dict(self._fields["gender"].selection),
         }
 
+    @api.model
+    def _mtdn_import_prepare_vals(self, row, lookups):
+        row = {key: (value.strip() if isinstance(value, str) else value) for key, value in row.items()}
+
+        name = row.get("name")
+        if not name:
+            raise ValidationError("Thiếu họ và tên.")
+        vals = {"name": name}
+        for fname in ("code", "email", "phone", "note"):
+            if row.get(fname):
+                vals[fname] = str(row[fname])
+
+        if row.get("department_code"):
+            vals["department_id"] = lookups["department"].get(str(row["department_code"]))
+            if not vals["department_id"]:
+                raise ValidationError("Không tìm thấy phòng ban có mã '%s'." % row["department_code"])
+        if row.get("job_code"):
+            if not vals.get("department_id"):
+                raise ValidationError("Cần mã phòng ban để xác định chức danh '%s'." % row["job_code"])
+            vals["job_id"] = lookups["job"].get((vals["department_id"], str(row["job_code"])))
+            if not vals["job_id"]:
+                raise ValidationError("Không tìm thấy chức danh có mã '%s' trong phòng ban." % row["job_code"])
+        if row.get("manager_code"):
+            manager_code = str(row["manager_code"])
+            if manager_code in lookups["employee"]:
+                vals["manager_id"] = lookups["employee"][manager_code]
+            else:
+                vals["_manager_code"] = manager_code
+
+        for fname, allowed in (("state", lookups["states"]), ("gender", lookups["genders"])):
+            if row.get(fname):
+                if row[fname] not in allowed:
+                    raise ValidationError("Giá trị không hợp lệ (%s): %s" % (fname, row[fname]))
+                vals[fname] = row[fname]
+
+        for fname in ("start_date", "leave_date", "birthday"):
+            if row.get(fname):
+                try:
+                    vals[fname] = fields.Date.to_date(row[fname])
+                except ValueError:
+                    raise ValidationError("Ngày không hợp lệ (%s): %s" % (fname, row[fname]))
+        if vals.get("state") == "resigned":
+            vals["active"] = False
+        return vals
+
+    @api.model
+    def _mtdn_import_create_chunk(self, chunk, errors, pending_managers):
+        """Create one chunk and remember the managers to link once the file is read."""
+
+        def collect_manager(item, employee_id):
+            line_no, _vals, manager_code = item
+            if manager_code:
+                pending_managers.setdefault(manager_code, []).append((line_no, employee_id))
+
+        return self.env["mtdn.import.file.mixin"]._mtdn_import_create_chunk(self, chunk, errors, collect_manager)
+
+    @api.model
+    def _mtdn_import_link_managers(self, pending_managers, errors):
+        """Set managers that were created by the import itself (one write per manager)."""
+        if not pending_managers:
+            return
+        found = self.with_context(active_test=False).search_read([("code", "in", list(pending_managers))], ["code"])
+        managers = {rec["code"]: rec["id"] for rec in found}
+        for code, items in pending_managers.items():
+            if code not in managers:
+                errors.extend((line_no, "Không tìm thấy quản lý có mã '%s'." % code) for line_no, _id in items)
+                continue
+            try:
+                with self.env.cr.savepoint():
+                    self.browse([employee_id for _line_no, employee_id in items]).write({"manager_id": managers[code]})
+            except ValidationError as e:
+                errors.extend((line_no, e.args[0]) for line_no, _id in items)
+
+    @api.model
+    def _mtdn_get_employee_for_user(self, user=None):
+        """Return the employee acting for ``user`` (current user by default).
+
+        Linked employee first, then the same email, then the first employee
+        as a last resort. Cached per worker, user/email and ``employee_user``
+        data version, which moves when a relevant employee field changes.
+        """
+        user = user or self.env.user
+        email = user.email or False
+        version = self.env["mtdn.change.notifier"]._mtdn_data_version("employee_user")
+        if version is None:
+            return self.browse(self._mtdn_read_employee_id(user.id, email))
+        return self.browse(self._mtdn_resolve_employee_id(user.id, email, version))
+
+    @api.model
+    @tools.ormcache("user_id", "email", "version")
+    def _mtdn_resolve_employee_id(self, user_id, email, version):
+        with self.env["mtdn.change.notifier"]._mtdn_fresh_env() as env:
+            return self.with_env(env)._mtdn_read_employee_id(user_id, email)
+
+    @api.model
+    def _mtdn_read_employee_id(self, user_id, email):
+        self.flush_model(["user_id", "email", "active", "code", "name"])
+        self.env.cr.execute(
+            """
+            (SELECT id, 0 FROM mtdn_employee WHERE user_id = %(user_id)s AND active LIMIT 1)
+             UNION ALL
+            (SELECT id, 1 FROM mtdn_employee
+              WHERE email IS NOT NULL AND lower(email) = lower(%(email)s::varchar) AND active
+           ORDER BY id LIMIT 1)
+             UNION ALL
+            (SELECT id, 2 FROM mtdn_employee WHERE active ORDER BY code, name LIMIT 1)
+          ORDER BY 2
+             LIMIT 1
+            """,
+            {"user_id": user_id, "email": email or None},
+        )
+        row = self.env.cr.fetchone()
+        return row[0] if row else False
+
+    def action_view_subordinates(self):
+        self.ensure_one()
+        return {
+            "type": "ir.actions.act_window",
+            "name": "Cấp dưới của %s" % self.name,
+            "res_model": "mtdn.employee",
+            "view_mode": "list,kanban,form",
+            "domain": [("id", "child_of", self.id), ("id", "!=", self.id)],
+        }
+
+    @api.model
+    def mtdn_get_org_chart(self, root_id=None, max_depth=None):
+        """Return the org chart under ``root_id`` (every top manager when empty) as a nested tree.
+
+        The whole subtree is read with one prefix scan on ``parent_path``.
+        Archived employees are left out and their reports hang under the
+        closest active manager. Each node carries its subtree ``headcount``.
+        """
+        self.check_access("read")
+        self.flush_model()
+        self.env["mtdn.department"].flush_model(["name"])
+        self.env["mtdn.job"].flush_model(["name"])
+        root_path = ""
+        if root_id:
+            root = self.browse(root_id).exists()
+            if not root:
+                return []
+            root_path = root.parent_path
+        base_depth = root_path.count("/")
+        self.env.cr.execute(
+            """
+            SELECT e.id, e.code, e.name, e.state, e.parent_path, d.name, j.name
+              FROM mtdn_employee e
+         LEFT JOIN mtdn_department d ON d.id = e.department_id
+         LEFT JOIN mtdn_job j ON j.id = e.job_id
+             WHERE e.parent_path LIKE %(prefix)s
+               AND e.active
+               AND (%(depth)s::int IS NULL
+                    OR length(e.parent_path) - length(replace(e.parent_path, '/', '')) <= %(depth)s)
+          ORDER BY e.parent_path
+            """,
+            {
+                "prefix": root_path + "%",
+                "depth": base_depth + max_depth if max_depth is not None else None,
+            },
+        )
+        nodes = {}
+        roots = []
+        for emp_id, code, name, state, path, department, job in self.env.cr.fetchall():
+            node = {
+                "id": emp_id,
+                "code": code,
+                "name": name,
+                "state": state,
+                "department": department or False,
+                "job": job or False,
+                "headcount": 0,
+                "children": [],
+            }
+            ancestor_ids = [int(part) for part in path.split("/")[:-2]]
+            parent = next((nodes[a] for a in reversed(ancestor_ids) if a in nodes), None)
+            (parent["children"] if parent else roots).append(node)
+            nodes[emp_id] = node
+            node["_parent"] = parent
+        # parents come first in parent_path order: sum headcounts bottom-up
+        for node in reversed(list(nodes.values())):
+            parent = node.pop("_parent")
+            if parent:
+                parent["headcount"] += node["headcount"] + 1
+        return roots
+
+    @api.model
+    def mtdn_get_dashboard_data(self, version=None):
+        """Return aggregated data for the HR dashboard (used by JS client action).
+
+        Counters are cached per company and ``hr_dashboard`` data version,
+        which every worker shares and which moves when an employee, department
+        or job changes. ``version`` is the value returned by a previous call:
+        when it is still current only ``{"version", "unchanged"}`` is sent.
+        """
+        self.check_access("read")
+        company_id = self.env.company.id
+        data_version = self.env["mtdn.change.notifier"]._mtdn_data_version("hr_dashboard")
+        if data_version is None:
+            return self._mtdn_read_dashboard_data(company_id, False)
+        current = "%s-%s" % (company_id, data_version)
+        if version and version == current:
+            return {"version": version, "unchanged": True}
+        return copy.deepcopy(self._mtdn_dashboard_data(company_id, current))
+
+    @api.model
+    @tools.ormcache("company_id", "version")
+    def _mtdn_dashboard_data(self, company_id, version):
+        # The request's snapshot may predate the commit behind ``version``.
+        with self.env["mtdn.change.notifier"]._mtdn_fresh_env() as env:
+            return self.with_env(env)._mtdn_read_dashboard_data(company_id, version)
+
+    @api.model
+    def _mtdn_fallback_company_id(self):
+        """Company owning the employees without department (or whose department has none): the first one."""
+        self.env.cr.execute("SELECT MIN(id) FROM res_company")
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    def _mtdn_read_dashboard_data(self, company_id, version):
+        """All dashboard counters from one grouped query (state x company/department/job)."""
+        for model in ("mtdn.employee", "mtdn.department", "mtdn.job"):
+            self.env[model].flush_model()
+        self.env.cr.execute(
+            """
+            WITH scoped AS (
+                SELECT e.state, e.department_id, e.job_id
+                  FROM mtdn_employee e
+             LEFT JOIN mtdn_department d ON d.id = e.department_id
+                 WHERE COALESCE(d.company_id, %(fallback_company_id)s) = %(company_id)s
+            ), grouped AS (
+                SELECT CASE WHEN GROUPING(department_id) = 0 THEN 'department'
+                            WHEN GROUPING(job_id) = 0 THEN 'job'
+                            ELSE 'company' END AS kind,
+                       department_id, job_id, state, COUNT(*) AS cnt
+                  FROM scoped
+              GROUP BY GROUPING SETS ((state), (department_id, state), (job_id, state))
+            )
+            SELECT g.kind, COALESCE(g.department_id, g.job_id), COALESCE(d.name, j.name), g.state, g.cnt
+              FROM grouped g
+         LEFT JOIN mtdn_department d ON g.kind = 'department' AND d.id = g.department_id
+         LEFT JOIN mtdn_job j ON g.kind = 'job' AND j.id = g.job_id
+             UNION ALL
+            SELECT 'department_total', NULL, NULL, NULL, COUNT(*)
+              FROM mtdn_department WHERE active AND company_id = %(company_id)s
+             UNION ALL
+            SELECT 'job_total', NULL, NULL, NULL, COUNT(*)
+              FROM mtdn_job WHERE active AND company_id = %(company_id)s
+            """,
+            {"company_id": company_id, "fallback_company_id": self._mtdn_fallback_company_id()},
+        )
+
+        data = dict.fromkeys(("employee_total", "department_total", "job_total") + EMPLOYEE_STATES, 0)
+        breakdowns = {"department": {}, "job": {}}
+        for kind, res_id, name, state, count in self.env.cr.fetchall():
+            if kind in ("department_total", "job_total"):
+                data[kind] = count
+            elif kind == "company":
+                data[state] = count
+                data["employee_total"] += count
+            else:
+                row = breakdowns[kind].setdefault(
+                    res_id,
+                    dict(
+                        {"id": res_id or False, "name": name or "Chưa xác định", "total": 0},
+                        **dict.fromkeys(EMPLOYEE_STATES, 0),
+                    ),
+                )
+                row[state] = count
+                row["total"] += count
+
+        data.update(
+            {
+                "version": version,
+                "company_id": company_id,
+                "departments": sorted(breakdowns["department"].values(), key=lambda r: (-r["total"], r["name"])),
+                "jobs": sorted(breakdowns["job"].values(), key=lambda r: (-r["total"], r["name"])),
+            }
+        )
+        return data
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+import logging
+from datetime import timedelta
+
+from odoo import api, fields, models
+from odoo.tools import create_index
+
+_logger = logging.getLogger(__name__)
+
+# Days computed per statement when backfilling history.
+BACKFILL_CHUNK_DAYS = 366
+
+
+class MtdnHeadcountSnapshot(models.Model):
+    """Daily headcount per company, department, job and state.
+
+    One row per bucket and day, written by ``_snapshot`` with a single
+    INSERT ... SELECT. Past days are rebuilt from ``start_date`` and
+    ``leave_date``: an employee counts from the start date, is "resigned"
+    from the leave date on, and otherwise keeps the current state,
+    department and job (no history is kept for those). Employees without a
+    department company belong to the same company as on the HR dashboard
+    (``mtdn.employee._mtdn_fallback_company_id``).
+    """
+
+    _name = "mtdn.headcount.snapshot"
+    _description = "MTDN Daily Headcount Snapshot"
+    _order = "date desc, id desc"
+    _rec_name = "date"
+
+    date = fields.Date(string="Ngày", required=True, readonly=True, index=True)
+    company_id = fields.Many2one("res.company", string="Công ty", readonly=True)
+    department_id = fields.Many2one("mtdn.department", string="Phòng ban", readonly=True, ondelete="set null")
+    job_id = fields.Many2one("mtdn.job", string="Chức danh", readonly=True, ondelete="set null")
+    state = fields.Selection(
+        selection=[
+            ("probation", "Thử việc"),
+            ("working", "Đang làm"),
+            ("on_leave", "Tạm nghỉ"),
+            ("resigned", "Nghỉ việc"),
+        ],
+        string="Trạng thái",
+        readonly=True,
+    )
+    headcount = fields.Integer(string="Số nhân sự", readonly=True)
+
+    def init(self):
+        self.env.cr.execute(
+            """
+            CREATE UNIQUE INDEX IF NOT EXISTS mtdn_headcount_snapshot_bucket_uniq
+                ON mtdn_headcount_snapshot (date, COALESCE(company_id, 0), COALESCE(department_id, 0),
+                                            COALESCE(job_id, 0), state)
+            """
+        )
+        # Range reads per company ("last 90 days").
+        create_index(self.env.cr, "mtdn_headcount_snapshot_company_date_idx", self._table, ["company_id", "date"])
+
+    @api.model
+    def _snapshot(self, date_from, date_to=None, only_missing=False):
+        """(Re)write the snapshot of every day in ``[date_from, date_to]``. Returns the inserted rows."""
+        date_to = date_to or date_from
+        self.env["mtdn.employee"].flush_model(["start_date", "leave_date", "state", "active", "department_id", "job_id"])
+        self.env["mtdn.department"].flush_model(["company_id"])
+        cr = self.env.cr
+        if not only_missing:
+            cr.execute("DELETE FROM mtdn_headcount_snapshot WHERE date BETWEEN %s AND %s", [date_from, date_to])
+        cr.execute(
+            """
+            INSERT INTO mtdn_headcount_snapshot
+                   (date, company_id, department_id, job_id, state, headcount,
+                    create_uid, create_date, write_uid, write_date)
+            SELECT d.day, COALESCE(dep.company_id, %(fallback_company_id)s), e.department_id, e.job_id,
+                   CASE WHEN e.leave_date <= d.day THEN 'resigned'
+                        WHEN e.state = 'resigned' THEN 'working'
+                        ELSE e.state END,
+                   COUNT(*),
+                   %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+              FROM (SELECT day::date FROM generate_series(%(from)s::date, %(to)s::date, interval '1 day') day) d
+              JOIN mtdn_employee e
+                ON e.start_date <= d.day
+               AND (e.active OR e.leave_date IS NOT NULL)
+         LEFT JOIN mtdn_department dep ON dep.id = e.department_id
+             WHERE NOT %(only_missing)s
+                OR NOT EXISTS (SELECT 1 FROM mtdn_headcount_snapshot s WHERE s.date = d.day)
+          GROUP BY 1, 2, 3, 4, 5
+            """,
+            {
+                "from": date_from,
+                "to": date_to,
+                "only_missing": only_missing,
+                "fallback_company_id": self.env["mtdn.employee"]._mtdn_fallback_company_id(),
+                "uid": self.env.uid,
+            },
+        )
+        inserted = cr.rowcount
+        self.invalidate_model()
+        return inserted
+
+    @api.model
+    def _backfill(self, date_from=None):
+        """Fill the days without snapshot since the first start date (or ``date_from``) until yesterday."""
+        yesterday = fields.Date.context_today(self) - timedelta(days=1)
+        if not date_from:
+            self.env["mtdn.employee"].flush_model(["start_date"])
+            self.env.cr.execute("SELECT MIN(start_date) FROM mtdn_employee")
+            date_from = self.env.cr.fetchone()[0]
+        inserted = 0
+        while date_from and date_from <= yesterday:
+            chunk_end = min(date_from + timedelta(days=BACKFILL_CHUNK_DAYS - 1), yesterday)
+            inserted += self._snapshot(date_from, chunk_end, only_missing=True)
+            date_from = chunk_end + timedelta(days=1)
+        _logger.info("Headcount backfill: %s rows inserted", inserted)
+        return inserted
+
+    @api.model
+    def _cron_snapshot(self):
+        """Daily job: catch up missed days (all history on the first run), then (re)write today."""
+        today = fields.Date.context_today(self)
+        self.env.cr.execute("SELECT MAX(date) FROM mtdn_headcount_snapshot WHERE date < %s", [today])
+        last = self.env.cr.fetchone()[0]
+        self._backfill(last + timedelta(days=1) if last else None)
+        self._snapshot(today)
+
+    @api.model
+    def mtdn_get_headcount_trend(self, days=30):
+        """Return ``[{date, probation, working, on_leave, resigned}]`` of the current company for the last ``days``."""
+        self.check_access("read")
+        today = fields.Date.context_today(self)
+        self.flush_model()
+        self.env.cr.execute(
+            """
+            SELECT date,
+                   COALESCE(SUM(headcount) FILTER (WHERE state = 'probation'), 0),
+                   COALESCE(SUM(headcount) FILTER (WHERE state = 'working'), 0),
+                   COALESCE(SUM(headcount) FILTER (WHERE state = 'on_leave'), 0),
+                   COALESCE(SUM(headcount) FILTER (WHERE state = 'resigned'), 0)
+              FROM mtdn_headcount_snapshot
+             WHERE (company_id = %(company_id)s OR (company_id IS NULL AND %(company_id)s = %(fallback_company_id)s))
+               AND date > %(from)s AND date <= %(to)s
+          GROUP BY date
+          ORDER BY date
+            """,
+            {
+                "company_id": self.env.company.id,
+                "fallback_company_id": self.env["mtdn.employee"]._mtdn_fallback_company_id(),
+                "from": today - timedelta(days=days),
+                "to": today,
+            },
+        )
+        return [
+            {
+                "date": fields.Date.to_string(date),
+                "probation": probation,
+                "working": working,
+                "on_leave": on_leave,
+                "resigned": resigned,
+            }
+            for date, probation, working, on_leave, resigned in self.env.cr.fetchall()
+        ]
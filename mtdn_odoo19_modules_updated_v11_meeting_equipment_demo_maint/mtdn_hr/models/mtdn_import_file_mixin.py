@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+import base64
+import csv
+import io
+
+from odoo import api, fields, models
+from odoo.exceptions import UserError
+
+
+class MtdnImportFileMixin(models.AbstractModel):
+    """Upload, row streaming, chunked creation and result display shared by the bulk imports."""
+
+    _name = "mtdn.import.file.mixin"
+    _description = "MTDN Bulk Import File (Mixin)"
+
+    file = fields.Binary(string="Tệp CSV / XLSX", required=True)
+    filename = fields.Char(string="Tên tệp")
+    chunk_size = fields.Integer(string="Số dòng mỗi lô", default=1000)
+
+    state = fields.Selection(
+        selection=[("draft", "Chuẩn bị"), ("done", "Hoàn tất")],
+        default="draft",
+        readonly=True,
+    )
+    created_count = fields.Integer(string="Đã tạo", readonly=True)
+    error_count = fields.Integer(string="Số dòng lỗi", readonly=True)
+    error_log = fields.Text(string="Chi tiết lỗi", readonly=True)
+
+    def _iter_rows(self):
+        """Yield ``(line_number, row_dict)`` from the uploaded file, one row at a time."""
+        self.ensure_one()
+        content = base64.b64decode(self.file or b"")
+        if (self.filename or "").lower().endswith(".xlsx"):
+            yield from self._iter_xlsx_rows(content)
+        else:
+            yield from self._iter_csv_rows(content)
+
+    def _iter_csv_rows(self, content):
+        stream = io.TextIOWrapper(io.BytesIO(content), encoding="utf-8-sig", newline="")
+        sample = stream.read(4096)
+        stream.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.DictReader(stream, dialect=dialect)
+        reader.fieldnames = [(name or "").strip().lower() for name in (reader.fieldnames or [])]
+        for row in reader:
+            yield reader.line_num, row
+
+    def _iter_xlsx_rows(self, content):
+        try:
+            import openpyxl
+        except ImportError:
+            raise UserError("Cần cài thư viện 'openpyxl' để nhập tệp XLSX.")
+        workbook = openpyxl.load_workbook(io.BytesIO(content), read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows, None)
+            if not header:
+                return
+            header = [str(name or "").strip().lower() for name in header]
+            for line_no, values in enumerate(rows, start=2):
+                if not any(value not in (None, "") for value in values):
+                    continue
+                yield line_no, dict(zip(header, values))
+        finally:
+            workbook.close()
+
+    @api.model
+    def _mtdn_import_create_chunk(self, model, chunk, errors, on_created=None):
+        """Create one chunk of ``(line_number, vals, ...)`` items with ``model``.
+
+        On failure the chunk is retried row by row to report the faulty lines
+        in ``errors``. ``on_created(item, record_id)`` is called for every
+        created row. Returns the number of created rows.
+        """
+        try:
+            with model.env.cr.savepoint():
+                records = model.create([item[1] for item in chunk])
+            created = list(zip(chunk, records.ids))
+        except Exception:
+            # codes reserved by the failed attempt stay in the vals and are reused
+            created = []
+            for item in chunk:
+                try:
+                    with model.env.cr.savepoint():
+                        created.append((item, model.create([item[1]]).id))
+                except Exception as e:
+                    errors.append((item[0], e.args[0] if e.args else str(e)))
+        if on_created:
+            for item, record_id in created:
+                on_created(item, record_id)
+        model.env.invalidate_all()
+        return len(created)
+
+    def _mtdn_import_rows(self, model_name):
+        """Run ``model_name.mtdn_bulk_import`` on the file and show the result in the wizard."""
+        self.ensure_one()
+        if self.chunk_size <= 0:
+            raise UserError("Số dòng mỗi lô phải lớn hơn 0.")
+
+        result = self.env[model_name].mtdn_bulk_import(self._iter_rows(), chunk_size=self.chunk_size)
+        errors = result["errors"]
+        self.write(
+            {
+                "state": "done",
+                "created_count": result["created"],
+                "error_count": len(errors),
+                "error_log": "\n".join("Dòng %s: %s" % (line_no, message) for line_no, message in errors),
+            }
+        )
+        return {
+            "type": "ir.actions.act_window",
+            "res_model": self._name,
+            "res_id": self.id,
+            "view_mode": "form",
+            "target": "new",
+        }
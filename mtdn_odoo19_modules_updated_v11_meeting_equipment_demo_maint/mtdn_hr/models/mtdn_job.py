@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-from odoo import fields, models
+from odoo import api, fields, models
 
 
 class MtdnJob(models.Model):
@@ -32,3 +32,24 @@ class MtdnJob(models.Model):
             "Mã chức danh phải là duy nhất trong mỗi phòng ban.",
         ),
     ]
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env["mtdn.change.notifier"]._mtdn_bump_version("hr_dashboard")
+        self.env["mtdn.change.notifier"]._mtdn_notify("job", changed=records.ids)
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        if {"name", "active", "department_id"}.intersection(vals):
+            self.env["mtdn.change.notifier"]._mtdn_bump_version("hr_dashboard")
+            self.env["mtdn.change.notifier"]._mtdn_notify("job", changed=self.ids)
+        return res
+
+    def unlink(self):
+        ids = self.ids
+        res = super().unlink()
+        self.env["mtdn.change.notifier"]._mtdn_bump_version("hr_dashboard")
+        self.env["mtdn.change.notifier"]._mtdn_notify("job", deleted=ids)
+        return res
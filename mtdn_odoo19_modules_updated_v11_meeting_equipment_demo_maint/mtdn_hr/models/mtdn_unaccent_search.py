@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+import logging
+
+from odoo import api, models, tools
+from odoo.osv import expression
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+
+class MtdnUnaccentSearchMixin(models.AbstractModel):
+    """Accent-insensitive substring search backed by unaccent + pg_trgm GIN indexes.
+
+    Vietnamese users often type without diacritics ("tang 3" for "Tầng 3").
+    Models list the searchable columns in ``_mtdn_search_columns``; ``init``
+    creates one ``gin (mtdn_unaccent(col) gin_trgm_ops)`` index per column and
+    ``_mtdn_keyword_domain`` builds domains that match those indexes. When the
+    extensions cannot be installed the search falls back to plain ``ilike``.
+    """
+
+    _name = "mtdn.unaccent.search.mixin"
+    _description = "MTDN Accent-insensitive Search Mixin"
+
+    _mtdn_search_columns = ()
+
+    def init(self):
+        super().init()
+        if self._abstract or not self._mtdn_search_columns:
+            return
+        if not self._mtdn_ensure_unaccent_function():
+            return
+        for column in self._mtdn_search_columns:
+            self.env.cr.execute(
+                SQL(
+                    "CREATE INDEX IF NOT EXISTS %s ON %s USING gin (mtdn_unaccent(%s) gin_trgm_ops)",
+                    SQL.identifier("%s_%s_unaccent_trgm_idx" % (self._table, column)),
+                    SQL.identifier(self._table),
+                    SQL.identifier(column),
+                )
+            )
+
+    def _mtdn_ensure_unaccent_function(self):
+        """Install unaccent/pg_trgm and an IMMUTABLE wrapper usable in indexes."""
+        cr = self.env.cr
+        try:
+            with cr.savepoint(flush=False):
+                cr.execute("CREATE EXTENSION IF NOT EXISTS unaccent")
+                cr.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+                cr.execute(
+                    """
+                    CREATE OR REPLACE FUNCTION mtdn_unaccent(text) RETURNS text
+                        LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+                        AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+                    """
+                )
+        except Exception as e:
+            _logger.warning("Accent-insensitive search disabled (unaccent/pg_trgm unavailable): %s", e)
+            return False
+        self.env.registry.clear_cache()
+        return True
+
+    @api.model
+    @tools.ormcache()
+    def _mtdn_unaccent_available(self):
+        self.env.cr.execute("SELECT 1 FROM pg_proc WHERE proname = 'mtdn_unaccent'")
+        return bool(self.env.cr.fetchone())
+
+    @api.model
+    def _mtdn_keyword_domain(self, keyword, columns=None):
+        """Domain matching ``keyword`` as a substring of any of ``columns``, ignoring accents and case."""
+        keyword = (keyword or "").strip()
+        columns = columns or self._mtdn_search_columns
+        if not keyword or not columns:
+            return []
+        if not self._mtdn_unaccent_available():
+            return expression.OR([[(column, "ilike", keyword)] for column in columns])
+
+        pattern = "%%%s%%" % keyword.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        query = self.with_context(active_test=False)._search([])
+        query.add_where(
+            SQL(" OR ").join(
+                SQL(
+                    "mtdn_unaccent(%s) ILIKE mtdn_unaccent(%s)",
+                    SQL.identifier(query.table, column),
+                    pattern,
+                )
+                for column in columns
+            )
+        )
+        return [("id", "in", query)]
+
+    @api.model
+    def _search_display_name(self, operator, value):
+        if operator == "ilike" and isinstance(value, str) and value.strip():
+            return self._mtdn_keyword_domain(value)
+        return super()._search_display_name(operator, value)
@@ -1,15 +1,34 @@
 /** @odoo-module **/
 
 import { registry } from "@web/core/registry";
-import { Component, onWillStart, useState } from "@odoo/owl";
+import { Component, onMounted, onWillStart, onWillUnmount, useState } from "@odoo/owl";
 import { useService } from "@web/core/utils/hooks";
 
+// Background refresh period; the server answers "unchanged" while its cache holds.
+// Changes are normally pushed on the bus, polling is only a safety net.
+const REFRESH_INTERVAL = 300000;
+
+// Bus channel / notification type published by mtdn.change.notifier.
+export const MTDN_CHANGES_CHANNEL = "mtdn_changes";
+export const MTDN_CHANGES_TYPE = "mtdn.changes";
+
+// HR kinds in a change notification that affect the dashboard counters.
+const DASHBOARD_KINDS = ["employee", "department", "job"];
+
+// Days shown in the headcount trend (read from mtdn.headcount.snapshot).
+const TREND_DAYS = 30;
+
+// Last payload received, kept across action restarts so the dashboard
+// renders immediately and only asks the server whether it changed.
+let lastSnapshot = null;
+
 class MtdnHrDashboard extends Component {
     static template = "mtdn_hr.dashboard";
 
     setup() {
         this.orm = useService("orm");
         this.action = useService("action");
+        this.busService = useService("bus_service");
 
         this.state = useState({
             loading: true,
@@ -20,20 +39,97 @@ class MtdnHrDashboard extends Component {
             resigned: 0,
             department_total: 0,
             job_total: 0,
+            departments: [],
+            jobs: [],
+            trend: [],
+            version: null,
+            refreshing: false,
         });
 
+        const cached = Boolean(lastSnapshot);
+        if (cached) {
+            this._patch(lastSnapshot);
+            this.state.loading = false;
+        }
+
         onWillStart(async () => {
-            await this.loadData();
+            if (!cached) {
+                await this.loadData();
+            }
+        });
+        onMounted(() => {
+            if (cached) {
+                this.refresh();
+                this.loadTrend();
+            }
+            this.timer = setInterval(() => this.refresh(), REFRESH_INTERVAL);
+            this.onChanges = (payload) => {
+                if (DASHBOARD_KINDS.some((kind) => payload[kind])) {
+                    this.refresh();
+                }
+            };
+            this.busService.addChannel(MTDN_CHANGES_CHANNEL);
+            this.busService.subscribe(MTDN_CHANGES_TYPE, this.onChanges);
+        });
+        onWillUnmount(() => {
+            clearInterval(this.timer);
+            this.busService.unsubscribe(MTDN_CHANGES_TYPE, this.onChanges);
         });
     }
 
     async loadData() {
         this.state.loading = true;
-        const data = await this.orm.call("mtdn.employee", "mtdn_get_dashboard_data", []);
-        Object.assign(this.state, data);
+        await Promise.all([this.refresh(), this.loadTrend()]);
         this.state.loading = false;
     }
 
+    async loadTrend() {
+        const trend = await this.orm.call("mtdn.headcount.snapshot", "mtdn_get_headcount_trend", [], {
+            days: TREND_DAYS,
+        });
+        for (const point of trend) {
+            point.in_service = point.probation + point.working + point.on_leave;
+        }
+        const max = Math.max(0, ...trend.map((point) => point.in_service));
+        for (const point of trend) {
+            point.height = max ? Math.round((point.in_service * 100) / max) : 0;
+        }
+        this.state.trend = trend;
+    }
+
+    async refresh() {
+        if (this.state.refreshing) {
+            // a change arrived while reading: read once more afterwards
+            this.refreshPending = true;
+            return;
+        }
+        this.state.refreshing = true;
+        this.refreshPending = false;
+        try {
+            const data = await this.orm.call("mtdn.employee", "mtdn_get_dashboard_data", [], {
+                version: this.state.version,
+            });
+            if (!data.unchanged) {
+                lastSnapshot = data;
+                this._patch(data);
+            }
+        } finally {
+            this.state.refreshing = false;
+        }
+        if (this.refreshPending) {
+            await this.refresh();
+        }
+    }
+
+    /** Only assign keys whose value changed, so untouched cards are not re-rendered. */
+    _patch(data) {
+        for (const [key, value] of Object.entries(data)) {
+            if (JSON.stringify(this.state[key]) !== JSON.stringify(value)) {
+                this.state[key] = value;
+            }
+        }
+    }
+
     _openWindowAction({ name, res_model, domain }) {
         this.action.doAction({
             type: "ir.actions.act_window",
@@ -87,6 +183,14 @@ class MtdnHrDashboard extends Component {
         this._openWindowAction({ name: "Phòng ban", res_model: "mtdn.department", domain: [] });
     }
 
+    openDepartmentEmployees(row) {
+        this._openWindowAction({
+            name: `Nhân viên - ${row.name}`,
+            res_model: "mtdn.employee",
+            domain: [["department_id", "=", row.id]],
+        });
+    }
+
     openJobs() {
         this._openWindowAction({ name: "Chức danh", res_model: "mtdn.job", domain: [] });
     }
@@ -0,0 +1,3 @@
+from . import mtdn_employee_import_wizard
+from . import mtdn_employee_offboard_wizard
+from . import mtdn_department_restructure_wizard
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+from collections import defaultdict
+
+from odoo import api, fields, models
+from odoo.exceptions import UserError
+
+
+class MtdnDepartmentRestructureWizard(models.TransientModel):
+    """Merge, split or move departments with set-based writes.
+
+    - merge: every employee, job (and, with mtdn_asset, asset) of the source
+      departments goes to the target; jobs whose code already exists there
+      are folded into the existing job
+    - move: the selected employees go to the target department; their jobs
+      are matched by code in the target or copied there
+    - split: like move, into a new department created from the source
+
+    Preview counts come from grouped queries and the same job plan is used
+    for the preview and the apply.
+    """
+
+    _name = "mtdn.department.restructure.wizard"
+    _description = "MTDN Department Restructure (Wizard)"
+
+    operation = fields.Selection(
+        selection=[
+            ("merge", "Gộp phòng ban"),
+            ("move", "Chuyển nhân viên"),
+            ("split", "Tách phòng ban"),
+        ],
+        string="Thao tác",
+        required=True,
+        default="move",
+    )
+    source_department_ids = fields.Many2many(
+        "mtdn.department",
+        "mtdn_department_restructure_source_rel",
+        "wizard_id",
+        "department_id",
+        string="Phòng ban được gộp",
+    )
+    source_department_id = fields.Many2one("mtdn.department", string="Phòng ban nguồn")
+    employee_ids = fields.Many2many(
+        "mtdn.employee",
+        "mtdn_department_restructure_employee_rel",
+        "wizard_id",
+        "employee_id",
+        string="Nhân viên",
+    )
+    target_department_id = fields.Many2one("mtdn.department", string="Phòng ban đích")
+    new_department_name = fields.Char(string="Tên phòng ban mới")
+    new_department_code = fields.Char(string="Mã phòng ban mới")
+    archive_sources = fields.Boolean(string="Lưu trữ phòng ban đã gộp", default=True)
+
+    employee_count = fields.Integer(string="Nhân viên được chuyển", compute="_compute_preview")
+    job_move_count = fields.Integer(string="Chức danh được chuyển", compute="_compute_preview")
+    job_merge_count = fields.Integer(string="Chức danh gộp vào chức danh có sẵn", compute="_compute_preview")
+    job_create_count = fields.Integer(string="Chức danh tạo mới", compute="_compute_preview")
+
+    state = fields.Selection(
+        selection=[("draft", "Chuẩn bị"), ("done", "Hoàn tất")],
+        default="draft",
+        readonly=True,
+    )
+    summary = fields.Text(string="Kết quả", readonly=True)
+
+    @api.model
+    def default_get(self, fields_list):
+        res = super().default_get(fields_list)
+        active_ids = self.env.context.get("active_ids") or []
+        if self.env.context.get("active_model") == "mtdn.department" and active_ids:
+            res.update(operation="merge", source_department_ids=[(6, 0, active_ids)])
+        elif self.env.context.get("active_model") == "mtdn.employee" and active_ids:
+            res.update(operation="move", employee_ids=[(6, 0, active_ids)])
+        return res
+
+    @api.onchange("source_department_id")
+    def _onchange_source_department_id(self):
+        if self.source_department_id:
+            self.employee_ids = self.employee_ids.filtered(lambda emp: emp.department_id == self.source_department_id)
+
+    # ------------------------------------------------------------
+    # Planning
+    # ------------------------------------------------------------
+    def _employee_domain(self):
+        """Employees touched by the operation (archived ones included)."""
+        self.ensure_one()
+        if self.operation == "merge":
+            return [("department_id", "in", self.source_department_ids._origin.ids)]
+        return [("id", "in", self.employee_ids._origin.ids)]
+
+    def _plan_jobs(self, target_id):
+        """Return ``(moved_job_ids, {old_job_id: new_job_id}, {old_job_id: vals_to_copy})``.
+
+        merge: source jobs move to the target unless the target (or another
+        source) already has the code, in which case they map to that job.
+        move/split: jobs of the moved employees outside the target map to the
+        target job with the same code, or are copied into the target.
+        """
+        self.ensure_one()
+        Job = self.env["mtdn.job"].with_context(active_test=False)
+        target_codes = {}
+        if target_id:
+            target_codes = {rec["code"]: rec["id"] for rec in Job.search_read([("department_id", "=", target_id)], ["code"])}
+
+        moved, mapping, to_copy = [], {}, {}
+        if self.operation == "merge":
+            for job in Job.search_read(
+                [("department_id", "in", self.source_department_ids._origin.ids), ("department_id", "!=", target_id)],
+                ["code"],
+                order="active desc, id",
+            ):
+                if job["code"] in target_codes:
+                    mapping[job["id"]] = target_codes[job["code"]]
+                else:
+                    moved.append(job["id"])
+                    target_codes[job["code"]] = job["id"]
+            return moved, mapping, to_copy
+
+        groups = self.env["mtdn.employee"].with_context(active_test=False)._read_group(
+            self._employee_domain() + [("job_id", "!=", False), ("job_id.department_id", "!=", target_id or False)],
+            ["job_id"],
+        )
+        copied_codes = {}
+        for (job,) in groups:
+            if job.code in target_codes:
+                mapping[job.id] = target_codes[job.code]
+            elif job.code in copied_codes:
+                to_copy[job.id] = copied_codes[job.code]
+            else:
+                to_copy[job.id] = copied_codes[job.code] = {
+                    "name": job.name,
+                    "code": job.code,
+                    "description": job.description,
+                }
+        return moved, mapping, to_copy
+
+    @api.depends(
+        "operation",
+        "source_department_ids",
+        "source_department_id",
+        "employee_ids",
+        "target_department_id",
+    )
+    def _compute_preview(self):
+        Employee = self.env["mtdn.employee"].with_context(active_test=False)
+        for wiz in self:
+            target_id = wiz.target_department_id._origin.id if wiz.operation != "split" else False
+            ready = wiz.source_department_ids if wiz.operation == "merge" else wiz.employee_ids
+            if not ready:
+                wiz.update(employee_count=0, job_move_count=0, job_merge_count=0, job_create_count=0)
+                continue
+            [(count,)] = Employee._read_group(wiz._employee_domain(), [], ["__count"])
+            moved, mapping, to_copy = wiz._plan_jobs(target_id)
+            wiz.update(
+                employee_count=count,
+                job_move_count=len(moved),
+                job_merge_count=len(mapping),
+                job_create_count=len({id(vals) for vals in to_copy.values()}),
+            )
+
+    def _check_plan(self):
+        self.ensure_one()
+        if self.operation == "merge":
+            if not self.source_department_ids or not self.target_department_id:
+                raise UserError("Vui lòng chọn các phòng ban cần gộp và phòng ban đích.")
+            if self.target_department_id in self.source_department_ids:
+                raise UserError("Phòng ban đích không được nằm trong danh sách phòng ban được gộp.")
+        elif not self.employee_ids:
+            raise UserError("Vui lòng chọn nhân viên cần chuyển.")
+        elif self.operation == "move" and not self.target_department_id:
+            raise UserError("Vui lòng chọn phòng ban đích.")
+        elif self.operation == "split" and not (self.new_department_name and self.new_department_code):
+            raise UserError("Vui lòng nhập tên và mã của phòng ban mới.")
+
+    # ------------------------------------------------------------
+    # Apply
+    # ------------------------------------------------------------
+    def _restructure_target(self):
+        self.ensure_one()
+        if self.operation != "split":
+            return self.target_department_id
+        source = self.source_department_id or self.employee_ids.department_id[:1]
+        return self.env["mtdn.department"].create(
+            {
+                "name": self.new_department_name,
+                "code": self.new_department_code,
+                "company_id": (source.company_id or self.env.company).id,
+            }
+        )
+
+    def _restructure_apply(self, target, summary):
+        """Move employees and jobs to ``target``; extended by mtdn_asset for assets."""
+        Job = self.env["mtdn.job"].with_context(active_test=False)
+        Employee = self.env["mtdn.employee"].with_context(active_test=False)
+        moved, mapping, to_copy = self._plan_jobs(target.id)
+
+        # jobs: one write for the moved ones, one create for the copies
+        if moved:
+            Job.browse(moved).write({"department_id": target.id})
+        copies = list({id(vals): vals for vals in to_copy.values()}.values())
+        if copies:
+            created = Job.create([dict(vals, department_id=target.id) for vals in copies])
+            new_ids = {id(vals): job.id for vals, job in zip(copies, created)}
+            mapping.update({old_id: new_ids[id(vals)] for old_id, vals in to_copy.items()})
+
+        # employees: one write per new job, then one for the rest
+        employees = Employee.search(self._employee_domain())
+        by_new_job = defaultdict(list)
+        for rec in employees.read(["job_id"], load=False):
+            by_new_job[mapping.get(rec["job_id"])].append(rec["id"])
+        for new_job_id, employee_ids in by_new_job.items():
+            vals = {"department_id": target.id}
+            if new_job_id:
+                vals["job_id"] = new_job_id
+            Employee.browse(employee_ids).write(vals)
+
+        if self.operation == "merge" and mapping:
+            Job.browse(list(mapping)).write({"active": False})
+        summary.update(
+            {
+                "Nhân viên được chuyển": len(employees),
+                "Chức danh được chuyển": len(moved),
+                "Chức danh gộp vào chức danh có sẵn": len(mapping) - len(to_copy),
+                "Chức danh tạo mới": len(copies),
+            }
+        )
+
+    def action_apply(self):
+        self.ensure_one()
+        self._check_plan()
+        target = self._restructure_target()
+        summary = {"Phòng ban đích": target.display_name}
+        self._restructure_apply(target, summary)
+        if self.operation == "merge" and self.archive_sources:
+            self.source_department_ids.write({"active": False})
+            summary["Phòng ban đã lưu trữ"] = len(self.source_department_ids)
+        self.write(
+            {
+                "state": "done",
+                "summary": "\n".join("%s: %s" % (label, value) for label, value in summary.items()),
+            }
+        )
+        return {
+            "type": "ir.actions.act_window",
+            "res_model": self._name,
+            "res_id": self.id,
+            "view_mode": "form",
+            "target": "new",
+        }
@@ -0,0 +1,11 @@
+# -*- coding: utf-8 -*-
+from odoo import models
+
+
+class MtdnEmployeeImportWizard(models.TransientModel):
+    _name = "mtdn.employee.import.wizard"
+    _inherit = ["mtdn.import.file.mixin"]
+    _description = "MTDN Employee Bulk Onboarding (Wizard)"
+
+    def action_import(self):
+        return self._mtdn_import_rows("mtdn.employee")
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+from odoo import api, fields, models
+from odoo.exceptions import UserError
+
+
+class MtdnEmployeeOffboardWizard(models.TransientModel):
+    """Resign several employees at once and hand over what they hold.
+
+    The asset and meeting modules add their own policies to this wizard and
+    extend ``_offboard_options`` / ``mtdn.employee._mtdn_offboard``.
+    """
+
+    _name = "mtdn.employee.offboard.wizard"
+    _description = "MTDN Employee Bulk Offboarding (Wizard)"
+
+    employee_ids = fields.Many2many(
+        "mtdn.employee",
+        "mtdn_employee_offboard_wizard_employee_rel",
+        "wizard_id",
+        "employee_id",
+        string="Nhân viên nghỉ việc",
+        required=True,
+    )
+    leave_date = fields.Date(string="Ngày nghỉ việc", required=True, default=fields.Date.context_today)
+
+    state = fields.Selection(
+        selection=[("draft", "Chuẩn bị"), ("done", "Hoàn tất")],
+        default="draft",
+        readonly=True,
+    )
+    summary = fields.Text(string="Kết quả", readonly=True)
+
+    @api.model
+    def default_get(self, fields_list):
+        res = super().default_get(fields_list)
+        if self.env.context.get("active_model") == "mtdn.employee":
+            res["employee_ids"] = [(6, 0, self.env.context.get("active_ids") or [])]
+        return res
+
+    def _offboard_options(self):
+        self.ensure_one()
+        return {"leave_date": self.leave_date}
+
+    def action_offboard(self):
+        self.ensure_one()
+        employees = self.employee_ids.filtered(lambda emp: emp.state != "resigned" or emp.active)
+        if not employees:
+            raise UserError("Không có nhân viên nào cần cho nghỉ việc.")
+        result = employees._mtdn_offboard(self._offboard_options())
+        self.write(
+            {
+                "state": "done",
+                "summary": "\n".join("%s: %s" % (label, count) for label, count in result.items()),
+            }
+        )
+        return {
+            "type": "ir.actions.act_window",
+            "res_model": self._name,
+            "res_id": self.id,
+            "view_mode": "form",
+            "target": "new",
+        }
@@ -5,9 +5,15 @@
  'data': ['security/ir.model.access.csv',
           'data/sequence.xml',
           'data/seed.xml',
+          'data/cron.xml',
+          'data/maintenance_workload.xml',
+          'data/maintenance_kpi.xml',
           'views/maintenance_category_views.xml',
           'views/maintenance_team_views.xml',
+          'views/booking_reschedule_views.xml',
           'views/maintenance_request_views.xml',
+          'views/maintenance_plan_views.xml',
+          'views/maintenance_kpi_views.xml',
           'views/asset_inherit_views.xml',
           'views/room_inherit_views.xml',
           'views/maintenance_menu.xml'],
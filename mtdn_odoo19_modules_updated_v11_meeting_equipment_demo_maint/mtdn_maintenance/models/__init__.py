@@ -1 +1 @@
-from . import maintenance_category, maintenance_team, maintenance_request, inherit_meeting, inherit_asset
+from . import maintenance_category, maintenance_team, maintenance_workload, maintenance_kpi, maintenance_request, maintenance_plan, inherit_meeting, inherit_asset
@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 from odoo import fields, models
 
+from .maintenance_kpi import KPI_STATES
+
 
 class MtdnAsset(models.Model):
     _inherit = "mtdn.asset"
@@ -11,6 +13,37 @@ class MtdnAsset(models.Model):
         store=False,
     )
 
+    in_downtime = fields.Boolean(
+        string="Đang downtime",
+        compute="_compute_in_downtime",
+        search="_search_in_downtime",
+    )
+
+    def write(self, vals):
+        # the asset category is a KPI dimension of the asset's requests
+        if "category_id" in vals:
+            requests = self.env["mtdn.maintenance.request"].sudo().search(
+                [("asset_id", "in", self.ids), ("state", "in", KPI_STATES)]
+            )
+            kpi_before = requests._kpi_contributions()
+        res = super().write(vals)
+        if "category_id" in vals:
+            requests._kpi_shift(kpi_before)
+        return res
+
+    def _compute_in_downtime(self):
+        down_asset_ids = self.env["mtdn.maintenance.request"]._get_down_resource_ids()["asset"]
+        for rec in self:
+            rec.in_downtime = rec.id in down_asset_ids
+
+    def _search_in_downtime(self, operator, value):
+        if operator not in ("=", "!="):
+            raise NotImplementedError("Unsupported operator %s for in_downtime" % operator)
+        down_asset_ids = list(self.env["mtdn.maintenance.request"]._get_down_resource_ids()["asset"])
+        if (operator == "=") == bool(value):
+            return [("id", "in", down_asset_ids)]
+        return [("id", "not in", down_asset_ids)]
+
     def _compute_maintenance_request_count(self):
         Req = self.env["mtdn.maintenance.request"]
         for rec in self:
@@ -11,6 +11,7 @@ class MtdnMeetingRoom(models.Model):
         compute="_compute_maintenance_request_count",
         store=False,
     )
+    next_maintenance_date = fields.Date(string="Ngày bảo trì tiếp theo", index=True)
 
     def _compute_maintenance_request_count(self):
         Req = self.env["mtdn.maintenance.request"]
@@ -33,39 +34,11 @@ class MtdnMeetingRoom(models.Model):
     @api.depends("state")
     def _compute_display_state(self):
         """Extend live room state: consider maintenance downtime requests."""
-        now = fields.Datetime.now()
-        Booking = self.env["mtdn.meeting.booking"]
-        Req = self.env["mtdn.maintenance.request"]
+        super()._compute_display_state()
+        down_room_ids = self.env["mtdn.maintenance.request"]._get_down_resource_ids()["room"]
         for rec in self:
-            # Manual maintenance always wins
-            if rec.state == "maintenance":
-                rec.display_state = "maintenance"
-                continue
-
-            # Maintenance downtime active now
-            active_maint = Req.search_count(
-                [
-                    ("request_for", "=", "room"),
-                    ("room_id", "=", rec.id),
-                    ("state", "in", ("submitted", "in_progress")),
-                    ("start_datetime", "<=", now),
-                    ("end_datetime", ">=", now),
-                ]
-            )
-            if active_maint:
+            if rec.id in down_room_ids:
                 rec.display_state = "maintenance"
-                continue
-
-            # Booking overlap -> in use
-            busy = Booking.search_count(
-                [
-                    ("state", "!=", "cancelled"),
-                    ("room_id", "=", rec.id),
-                    ("start_datetime", "<=", now),
-                    ("end_datetime", ">=", now),
-                ]
-            )
-            rec.display_state = "in_use" if busy else "available"
 
 
 class MtdnMeetingBooking(models.Model):
@@ -102,13 +75,9 @@ class MtdnMeetingBooking(models.Model):
             if rec.end_datetime <= rec.start_datetime:
                 continue
 
-            maint_domain = [
-                ("request_for", "=", "room"),
-                ("state", "in", ("submitted", "in_progress")),
-                ("start_datetime", "<", rec.end_datetime),
-                ("end_datetime", ">", rec.start_datetime),
-            ]
-            maint_room_ids = self.env["mtdn.maintenance.request"].search(maint_domain).mapped("room_id").ids
+            maint_room_ids = list(
+                self.env["mtdn.maintenance.request"]._get_down_resource_ids(rec.start_datetime, rec.end_datetime)["room"]
+            )
 
             if res and isinstance(res, dict) and res.get("domain") and res["domain"].get("room_id"):
                 # Append to existing domain coming from super()
@@ -123,36 +92,10 @@ class MtdnMeetingBooking(models.Model):
 class MtdnMeetingRoomRequestWizard(models.TransientModel):
     _inherit = "mtdn.meeting.room.request"
 
-    def action_search_rooms(self):
-        """Keep original flow, but remove rooms that have downtime maintenance overlap."""
-        self.ensure_one()
-        res = super().action_search_rooms()
-
-        if self.start_datetime and self.end_datetime and self.line_ids:
-            maint_domain = [
-                ("request_for", "=", "room"),
-                ("state", "in", ("submitted", "in_progress")),
-                ("start_datetime", "<", self.end_datetime),
-                ("end_datetime", ">", self.start_datetime),
-            ]
-            maint_room_ids = set(self.env["mtdn.maintenance.request"].search(maint_domain).mapped("room_id").ids)
-
-            remove_lines = self.line_ids.filtered(lambda l: l.room_id.id in maint_room_ids)
-            if remove_lines:
-                remove_lines.unlink()
-
-            # If all rooms got removed by downtime -> suggest alternatives
-            if not self.line_ids and hasattr(self, "_ai_suggest_alternatives"):
-                try:
-                    self._ai_suggest_alternatives()
-                except Exception:
-                    pass
-
-            # Re-rank if AI helper exists
-            if self.line_ids and hasattr(self, "_ai_rank_rooms"):
-                try:
-                    self._ai_rank_rooms()
-                except Exception:
-                    pass
-
-        return res
+    def _exclude_unavailable_rooms(self, rooms, start_dt, end_dt):
+        """Also drop rooms with maintenance downtime overlapping the window."""
+        rooms = super()._exclude_unavailable_rooms(rooms, start_dt, end_dt)
+        if not (start_dt and end_dt):
+            return rooms
+        down_room_ids = self.env["mtdn.maintenance.request"]._get_down_resource_ids(start_dt, end_dt)["room"]
+        return rooms.filtered(lambda r: r.id not in down_room_ids)
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+from odoo import api, fields, models
+from odoo.models import parse_read_group_spec
+from odoo.tools import SQL
+
+# Bucket of one request in the KPI table (order of the unique index).
+KPI_DIMENSIONS = (
+    "period",
+    "company_id",
+    "request_for",
+    "room_id",
+    "asset_id",
+    "asset_category_id",
+    "category_id",
+    "team_id",
+)
+
+# Additive measures, shifted by deltas.
+KPI_MEASURES = (
+    "request_count",
+    "done_count",
+    "repair_hours",
+    "downtime_hours",
+    "cost",
+    "failure_interval_hours",
+    "failure_interval_count",
+)
+
+# Ratio measures: grouped as SUM(numerator) / SUM(denominator), never averaged.
+KPI_RATIOS = {
+    "mttr_hours": ("repair_hours", "done_count"),
+    "mtbf_hours": ("failure_interval_hours", "failure_interval_count"),
+}
+
+# Request states that count in the KPIs.
+KPI_STATES = ("submitted", "in_progress", "done")
+
+
+class MtdnMaintenanceKpi(models.Model):
+    """Monthly maintenance KPIs per room/asset, category and team.
+
+    Rows are shifted incrementally by ``mtdn.maintenance.request`` (see
+    ``_kpi_contributions``) and can be recomputed with ``_rebuild``.
+
+    - MTTR: repair hours (start of work -> done) / done requests
+    - MTBF: hours between two consecutive corrective requests of the same
+      room/asset / number of such intervals
+    """
+
+    _name = "mtdn.maintenance.kpi"
+    _description = "Maintenance KPIs"
+    _order = "period desc, id desc"
+    _rec_name = "period"
+
+    period = fields.Date(string="Tháng", required=True, readonly=True, index=True)
+    company_id = fields.Many2one("res.company", string="Công ty", readonly=True)
+    request_for = fields.Selection(
+        selection=[("room", "Phòng họp"), ("asset", "Tài sản/thiết bị")],
+        string="Đối tượng bảo trì",
+        readonly=True,
+    )
+    room_id = fields.Many2one("mtdn.meeting.room", string="Phòng họp", readonly=True)
+    asset_id = fields.Many2one("mtdn.asset", string="Tài sản/thiết bị", readonly=True)
+    asset_category_id = fields.Many2one("mtdn.asset.category", string="Loại tài sản", readonly=True)
+    category_id = fields.Many2one("mtdn.maintenance.category", string="Loại sự cố", readonly=True)
+    team_id = fields.Many2one("mtdn.maintenance.team", string="Đội xử lý", readonly=True)
+
+    request_count = fields.Integer(string="Số phiếu", readonly=True)
+    done_count = fields.Integer(string="Số phiếu hoàn tất", readonly=True)
+    repair_hours = fields.Float(string="Giờ sửa chữa", readonly=True)
+    downtime_hours = fields.Float(string="Giờ downtime", readonly=True)
+    cost = fields.Float(string="Chi phí", readonly=True)
+    failure_interval_hours = fields.Float(string="Tổng giờ giữa hai sự cố", readonly=True)
+    failure_interval_count = fields.Integer(string="Số khoảng giữa hai sự cố", readonly=True)
+    mttr_hours = fields.Float(string="MTTR (giờ)", readonly=True, aggregator="sum")
+    mtbf_hours = fields.Float(string="MTBF (giờ)", readonly=True, aggregator="sum")
+
+    def init(self):
+        self.env.cr.execute(
+            """
+            CREATE UNIQUE INDEX IF NOT EXISTS mtdn_maintenance_kpi_bucket_uniq
+                ON mtdn_maintenance_kpi (period, COALESCE(company_id, 0), request_for,
+                                         COALESCE(room_id, 0), COALESCE(asset_id, 0),
+                                         COALESCE(asset_category_id, 0), COALESCE(category_id, 0),
+                                         COALESCE(team_id, 0))
+            """
+        )
+
+    @api.model
+    def _read_group_select(self, aggregate_spec, query):
+        fname, __, func = parse_read_group_spec(aggregate_spec)
+        if fname in KPI_RATIOS and func:
+            numerator, denominator = KPI_RATIOS[fname]
+            return SQL(
+                "SUM(%s)::float / NULLIF(SUM(%s), 0)",
+                self._field_to_sql(self._table, numerator, query),
+                self._field_to_sql(self._table, denominator, query),
+            )
+        return super()._read_group_select(aggregate_spec, query)
+
+    @api.model
+    def _apply_deltas(self, deltas):
+        """Shift buckets by ``{dimensions_tuple: measures_list}`` with one upsert."""
+        rows = [key + tuple(measures) for key, measures in deltas.items() if any(measures)]
+        if not rows:
+            return
+        self.flush_model()
+        values = SQL(", ").join(
+            SQL(
+                "(%s::date, %s::int, %s::varchar, %s::int, %s::int, %s::int, %s::int, %s::int,"
+                " %s::int, %s::int, %s::float, %s::float, %s::float, %s::float, %s::int)",
+                *row,
+            )
+            for row in rows
+        )
+        self.env.cr.execute(
+            SQL(
+                """
+                INSERT INTO mtdn_maintenance_kpi AS k
+                       (period, company_id, request_for, room_id, asset_id, asset_category_id, category_id, team_id,
+                        request_count, done_count, repair_hours, downtime_hours, cost,
+                        failure_interval_hours, failure_interval_count, mttr_hours, mtbf_hours,
+                        create_uid, create_date, write_uid, write_date)
+                SELECT d.*,
+                       d.repair_hours / NULLIF(d.done_count, 0),
+                       d.failure_interval_hours / NULLIF(d.failure_interval_count, 0),
+                       %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+                  FROM (VALUES %(values)s) AS d(period, company_id, request_for, room_id, asset_id,
+                                                asset_category_id, category_id, team_id,
+                                                request_count, done_count, repair_hours, downtime_hours, cost,
+                                                failure_interval_hours, failure_interval_count)
+                ON CONFLICT (period, COALESCE(company_id, 0), request_for,
+                             COALESCE(room_id, 0), COALESCE(asset_id, 0),
+                             COALESCE(asset_category_id, 0), COALESCE(category_id, 0),
+                             COALESCE(team_id, 0))
+                DO UPDATE SET
+                    request_count = k.request_count + EXCLUDED.request_count,
+                    done_count = k.done_count + EXCLUDED.done_count,
+                    repair_hours = k.repair_hours + EXCLUDED.repair_hours,
+                    downtime_hours = k.downtime_hours + EXCLUDED.downtime_hours,
+                    cost = k.cost + EXCLUDED.cost,
+                    failure_interval_hours = k.failure_interval_hours + EXCLUDED.failure_interval_hours,
+                    failure_interval_count = k.failure_interval_count + EXCLUDED.failure_interval_count,
+                    mttr_hours = (k.repair_hours + EXCLUDED.repair_hours)
+                                 / NULLIF(k.done_count + EXCLUDED.done_count, 0),
+                    mtbf_hours = (k.failure_interval_hours + EXCLUDED.failure_interval_hours)
+                                 / NULLIF(k.failure_interval_count + EXCLUDED.failure_interval_count, 0),
+                    write_date = NOW() AT TIME ZONE 'UTC'
+                """,
+                uid=self.env.uid,
+                values=values,
+            )
+        )
+        self.invalidate_model()
+
+    @api.model
+    def _rebuild(self):
+        """Recompute the failure intervals of the requests and the whole KPI table."""
+        Request = self.env["mtdn.maintenance.request"]
+        Request.flush_model()
+        Request._rebuild_failure_gaps()
+        self.flush_model()
+        cr = self.env.cr
+        cr.execute("DELETE FROM mtdn_maintenance_kpi")
+        cr.execute(
+            """
+            INSERT INTO mtdn_maintenance_kpi
+                   (period, company_id, request_for, room_id, asset_id, asset_category_id, category_id, team_id,
+                    request_count, done_count, repair_hours, downtime_hours, cost,
+                    failure_interval_hours, failure_interval_count, mttr_hours, mtbf_hours,
+                    create_uid, create_date, write_uid, write_date)
+            SELECT s.*,
+                   s.repair_hours / NULLIF(s.done_count, 0),
+                   s.failure_interval_hours / NULLIF(s.failure_interval_count, 0),
+                   %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+              FROM (
+                SELECT date_trunc('month', r.request_date)::date AS period,
+                       r.company_id, r.request_for, r.room_id, r.asset_id, a.category_id AS asset_category_id,
+                       r.category_id, r.team_id,
+                       COUNT(*) AS request_count,
+                       COUNT(*) FILTER (WHERE r.state = 'done') AS done_count,
+                       COALESCE(SUM(EXTRACT(EPOCH FROM r.done_at - COALESCE(r.started_at, r.request_date)) / 3600.0)
+                                FILTER (WHERE r.state = 'done' AND r.done_at IS NOT NULL), 0) AS repair_hours,
+                       COALESCE(SUM(EXTRACT(EPOCH FROM r.end_datetime - r.start_datetime) / 3600.0)
+                                FILTER (WHERE r.state = 'done' AND r.start_datetime IS NOT NULL
+                                        AND r.end_datetime IS NOT NULL), 0) AS downtime_hours,
+                       COALESCE(SUM(r.cost) FILTER (WHERE r.state = 'done'), 0) AS cost,
+                       COALESCE(SUM(r.failure_gap_hours), 0) AS failure_interval_hours,
+                       COUNT(r.failure_gap_hours) AS failure_interval_count
+                  FROM mtdn_maintenance_request r
+             LEFT JOIN mtdn_asset a ON a.id = r.asset_id
+                 WHERE r.state IN %(states)s
+              GROUP BY 1, 2, 3, 4, 5, 6, 7, 8
+              ) s
+            """,
+            {"uid": self.env.uid, "states": KPI_STATES},
+        )
+        rows = cr.rowcount
+        self.invalidate_model()
+        return rows
+
+    def action_rebuild(self):
+        self._rebuild()
+        return {"type": "ir.actions.client", "tag": "reload"}
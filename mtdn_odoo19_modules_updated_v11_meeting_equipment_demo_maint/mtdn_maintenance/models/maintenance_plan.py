@@ -0,0 +1,382 @@
+# -*- coding: utf-8 -*-
+import bisect
+import logging
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+import pytz
+from dateutil.relativedelta import relativedelta
+
+from odoo import api, fields, models
+from odoo.exceptions import ValidationError
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+# Requests generated by a plan that are still pending for their target.
+OPEN_REQUEST_STATES = ("draft", "submitted", "in_progress")
+
+# plan_for -> (target model, request field)
+PLAN_TARGETS = {
+    "asset": ("mtdn.asset", "asset_id"),
+    "room": ("mtdn.meeting.room", "room_id"),
+}
+
+
+def find_free_slot(busy, windows, duration):
+    """Return the first ``(start, end)`` of length ``duration`` inside ``windows`` avoiding ``busy``.
+
+    ``busy`` and ``windows`` are lists of ``(start, end)`` sorted by start.
+    Returns ``None`` when no window has a large enough gap.
+    """
+    for win_start, win_end in windows:
+        cursor = win_start
+        for busy_start, busy_end in busy:
+            if busy_end <= cursor:
+                continue
+            if busy_start >= win_end:
+                break
+            if busy_start >= cursor + duration:
+                break
+            cursor = busy_end
+        if cursor + duration <= win_end:
+            return cursor, cursor + duration
+    return None
+
+
+class MtdnMaintenancePlan(models.Model):
+    """Preventive maintenance plan.
+
+    A plan applies to one asset, an asset category, one room or every room.
+    Plans targeting a single asset/room take precedence over category/global
+    plans. The scheduler generates one request per due target, with a downtime
+    window placed in a free slot, and rolls ``next_maintenance_date`` forward.
+    """
+
+    _name = "mtdn.maintenance.plan"
+    _description = "Preventive Maintenance Plan"
+    _order = "name"
+
+    name = fields.Char(string="Kế hoạch bảo trì", required=True, index=True)
+    active = fields.Boolean(default=True)
+
+    plan_for = fields.Selection(
+        selection=[("room", "Phòng họp"), ("asset", "Tài sản/thiết bị")],
+        string="Đối tượng bảo trì",
+        required=True,
+        default="asset",
+    )
+    asset_category_id = fields.Many2one(
+        "mtdn.asset.category",
+        string="Loại tài sản",
+        ondelete="cascade",
+        index=True,
+    )
+    asset_id = fields.Many2one(
+        "mtdn.asset",
+        string="Tài sản/thiết bị",
+        ondelete="cascade",
+        index=True,
+        help="Kế hoạch riêng cho một tài sản, ưu tiên hơn kế hoạch theo loại tài sản.",
+    )
+    room_id = fields.Many2one(
+        "mtdn.meeting.room",
+        string="Phòng họp",
+        ondelete="cascade",
+        index=True,
+        help="Để trống: áp dụng cho mọi phòng họp chưa có kế hoạch riêng.",
+    )
+
+    interval_number = fields.Integer(string="Chu kỳ", required=True, default=6)
+    interval_type = fields.Selection(
+        selection=[("day", "Ngày"), ("week", "Tuần"), ("month", "Tháng"), ("year", "Năm")],
+        string="Đơn vị chu kỳ",
+        required=True,
+        default="month",
+    )
+    lead_days = fields.Integer(
+        string="Tạo trước (ngày)",
+        default=7,
+        help="Số ngày trước ngày bảo trì tiếp theo mà phiếu bảo trì được tạo.",
+    )
+
+    duration_hours = fields.Float(string="Thời lượng downtime (giờ)", required=True, default=2.0)
+    hour_from = fields.Float(string="Khung giờ từ", default=8.0)
+    hour_to = fields.Float(string="Khung giờ đến", default=17.0)
+    search_days = fields.Integer(
+        string="Tìm khung trống trong (ngày)",
+        default=14,
+        help="Nếu không tìm được khung trống trong số ngày này, phiếu được tạo ở trạng thái nháp, không có downtime.",
+    )
+
+    category_id = fields.Many2one("mtdn.maintenance.category", string="Loại sự cố", ondelete="set null")
+    team_id = fields.Many2one("mtdn.maintenance.team", string="Đội xử lý", ondelete="set null")
+    priority = fields.Selection(
+        selection=[("0", "Thấp"), ("1", "Trung bình"), ("2", "Cao"), ("3", "Khẩn cấp")],
+        string="Mức độ",
+        default="1",
+        required=True,
+    )
+    description = fields.Text(string="Nội dung bảo trì")
+
+    company_id = fields.Many2one("res.company", string="Công ty", default=lambda self: self.env.company, index=True)
+
+    request_ids = fields.One2many("mtdn.maintenance.request", "plan_id", string="Phiếu bảo trì")
+    request_count = fields.Integer(string="Phiếu bảo trì", compute="_compute_request_count")
+
+    _sql_constraints = [
+        ("mtdn_maint_plan_asset_uniq", "unique(asset_id)", "Mỗi tài sản chỉ có một kế hoạch bảo trì riêng."),
+        ("mtdn_maint_plan_category_uniq", "unique(asset_category_id)", "Mỗi loại tài sản chỉ có một kế hoạch bảo trì."),
+        ("mtdn_maint_plan_room_uniq", "unique(room_id)", "Mỗi phòng họp chỉ có một kế hoạch bảo trì riêng."),
+    ]
+
+    def init(self):
+        # One "all rooms" plan per company: several would schedule the same rooms.
+        self.env.cr.execute(
+            """
+            CREATE UNIQUE INDEX IF NOT EXISTS mtdn_maint_plan_global_room_uniq
+                ON mtdn_maintenance_plan (COALESCE(company_id, 0))
+             WHERE plan_for = 'room' AND room_id IS NULL AND active
+            """
+        )
+
+    def _compute_request_count(self):
+        counts = dict(
+            self.env["mtdn.maintenance.request"]._read_group(
+                [("plan_id", "in", self.ids)], ["plan_id"], ["__count"]
+            )
+        )
+        for rec in self:
+            rec.request_count = counts.get(rec, 0)
+
+    @api.onchange("plan_for")
+    def _onchange_plan_for(self):
+        # The fields of the other scope are hidden: clear them so they cannot linger.
+        if self.plan_for == "room":
+            self.update({"asset_category_id": False, "asset_id": False})
+        else:
+            self.room_id = False
+
+    @api.constrains("plan_for", "asset_category_id", "asset_id", "room_id", "company_id", "active")
+    def _check_scope(self):
+        for rec in self:
+            if rec.plan_for == "asset" and not (rec.asset_category_id or rec.asset_id):
+                raise ValidationError("Vui lòng chọn Loại tài sản hoặc Tài sản/thiết bị cho kế hoạch bảo trì.")
+            if rec.plan_for == "room" and (rec.asset_category_id or rec.asset_id):
+                raise ValidationError("Kế hoạch bảo trì phòng họp không được chọn Loại tài sản hoặc Tài sản/thiết bị.")
+            if rec.plan_for == "asset" and rec.room_id:
+                raise ValidationError("Kế hoạch bảo trì tài sản không được chọn Phòng họp.")
+            if rec.plan_for == "room" and not rec.room_id and rec.active and self.search_count(
+                [
+                    ("id", "!=", rec.id),
+                    ("plan_for", "=", "room"),
+                    ("room_id", "=", False),
+                    ("company_id", "=", rec.company_id.id),
+                ],
+                limit=1,
+            ):
+                raise ValidationError("Mỗi công ty chỉ có một kế hoạch bảo trì áp dụng cho mọi phòng họp.")
+
+    @api.constrains("interval_number", "duration_hours", "hour_from", "hour_to", "lead_days", "search_days")
+    def _check_schedule_values(self):
+        for rec in self:
+            if rec.interval_number <= 0:
+                raise ValidationError("Chu kỳ bảo trì phải lớn hơn 0.")
+            if rec.lead_days < 0 or rec.search_days <= 0:
+                raise ValidationError("Số ngày tạo trước phải >= 0 và số ngày tìm khung trống phải > 0.")
+            if not (0.0 <= rec.hour_from < rec.hour_to <= 24.0):
+                raise ValidationError("Khung giờ bảo trì không hợp lệ.")
+            if rec.duration_hours <= 0 or rec.duration_hours > rec.hour_to - rec.hour_from:
+                raise ValidationError("Thời lượng downtime phải lớn hơn 0 và nằm trong khung giờ bảo trì.")
+
+    def action_view_requests(self):
+        self.ensure_one()
+        return {
+            "type": "ir.actions.act_window",
+            "name": "Phiếu bảo trì",
+            "res_model": "mtdn.maintenance.request",
+            "view_mode": "list,form",
+            "domain": [("plan_id", "=", self.id)],
+            "context": {"default_plan_id": self.id, "default_request_for": self.plan_for},
+        }
+
+    def action_generate_requests(self):
+        self._generate_requests(auto_commit=False)
+        return self.action_view_requests() if len(self) == 1 else True
+
+    # ------------------------------------------------------------
+    # Scheduler
+    # ------------------------------------------------------------
+    @api.model
+    def _cron_generate_requests(self, batch_size=2000, auto_commit=True):
+        return self.search([])._generate_requests(batch_size=batch_size, auto_commit=auto_commit)
+
+    def _generate_requests(self, batch_size=2000, auto_commit=True):
+        """Create the preventive requests of every due target of ``self``.
+
+        Targets are read with keyset pagination, requests are created with one
+        ``create`` per batch and next dates are advanced with one ``write`` per
+        distinct new date. Returns the number of generated requests.
+        """
+        today = fields.Date.context_today(self)
+        if isinstance(today, str):
+            today = fields.Date.from_string(today)
+        generated = 0
+        for plan in self:
+            plan._init_missing_dates(today)
+            horizon = today + timedelta(days=plan.lead_days)
+            last_id = 0
+            while True:
+                rows = plan._read_due_targets(horizon, last_id, batch_size)
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                generated += plan._schedule_batch(rows, today)
+                if auto_commit:
+                    self.env.cr.commit()
+                self.env.invalidate_all()
+        _logger.info("MTDN maintenance plans: %s preventive request(s) generated", generated)
+        return generated
+
+    def _interval_delta(self):
+        self.ensure_one()
+        return relativedelta(**{"%ss" % self.interval_type: self.interval_number})
+
+    def _target_scope_sql(self, alias):
+        """SQL condition restricting ``alias`` to the targets covered by this plan."""
+        self.ensure_one()
+        if self.plan_for == "asset":
+            if self.asset_id:
+                return SQL("%s.id = %s", SQL.identifier(alias), self.asset_id.id)
+            return SQL(
+                """%s.category_id = %s AND %s.state != 'broken'
+                   AND NOT EXISTS (SELECT 1 FROM mtdn_maintenance_plan p
+                                    WHERE p.active AND p.plan_for = 'asset' AND p.asset_id = %s.id)""",
+                SQL.identifier(alias),
+                self.asset_category_id.id,
+                SQL.identifier(alias),
+                SQL.identifier(alias),
+            )
+        if self.room_id:
+            return SQL("%s.id = %s", SQL.identifier(alias), self.room_id.id)
+        return SQL(
+            """NOT EXISTS (SELECT 1 FROM mtdn_maintenance_plan p
+                            WHERE p.active AND p.plan_for = 'room' AND p.room_id = %s.id)""",
+            SQL.identifier(alias),
+        )
+
+    def _init_missing_dates(self, today):
+        """Targets without a next maintenance date start one interval from today."""
+        self.ensure_one()
+        model_name = PLAN_TARGETS[self.plan_for][0]
+        Target = self.env[model_name]
+        Target.flush_model(["next_maintenance_date"])
+        self.env.cr.execute(
+            SQL(
+                "SELECT t.id FROM %s t WHERE t.active AND t.next_maintenance_date IS NULL AND %s",
+                SQL.identifier(Target._table),
+                self._target_scope_sql("t"),
+            )
+        )
+        ids = [row[0] for row in self.env.cr.fetchall()]
+        if ids:
+            Target.browse(ids).write({"next_maintenance_date": today + self._interval_delta()})
+
+    def _read_due_targets(self, horizon, last_id, limit):
+        """Return ``[(target_id, due_date, company_id)]`` due before ``horizon``, after ``last_id``."""
+        self.ensure_one()
+        model_name, request_field = PLAN_TARGETS[self.plan_for]
+        Target = self.env[model_name]
+        Target.flush_model(["next_maintenance_date", "active"])
+        self.env["mtdn.maintenance.request"].flush_model(["plan_id", "state", request_field])
+        self.env.cr.execute(
+            SQL(
+                """
+                SELECT t.id, t.next_maintenance_date, t.company_id
+                  FROM %(table)s t
+                 WHERE t.active
+                   AND t.id > %(last_id)s
+                   AND t.next_maintenance_date <= %(horizon)s
+                   AND %(scope)s
+                   AND NOT EXISTS (SELECT 1 FROM mtdn_maintenance_request r
+                                    WHERE r.plan_id = %(plan_id)s
+                                      AND r.%(request_field)s = t.id
+                                      AND r.state IN %(open_states)s)
+              ORDER BY t.id
+                 LIMIT %(limit)s
+                """,
+                table=SQL.identifier(Target._table),
+                last_id=last_id,
+                horizon=horizon,
+                scope=self._target_scope_sql("t"),
+                plan_id=self.id,
+                request_field=SQL.identifier(request_field),
+                open_states=OPEN_REQUEST_STATES,
+                limit=limit,
+            )
+        )
+        return self.env.cr.fetchall()
+
+    def _slot_windows(self, day):
+        """Daily maintenance windows (naive UTC) for ``search_days`` days from ``day``."""
+        self.ensure_one()
+        tz = pytz.timezone(self.env.user.tz or "Asia/Bangkok")
+        windows = []
+        for offset in range(self.search_days):
+            local_day = datetime.combine(day + timedelta(days=offset), time.min)
+            bounds = []
+            for hours in (self.hour_from, self.hour_to):
+                local_dt = tz.localize(local_day + timedelta(hours=hours))
+                bounds.append(local_dt.astimezone(pytz.UTC).replace(tzinfo=None))
+            windows.append(tuple(bounds))
+        return windows
+
+    def _schedule_batch(self, rows, today):
+        """Create the requests of one batch of due targets and advance their next dates."""
+        self.ensure_one()
+        request_field = PLAN_TARGETS[self.plan_for][1]
+        now = fields.Datetime.now()
+        duration = timedelta(hours=self.duration_hours)
+        step = self._interval_delta()
+
+        starts = {target_id: max(due, today) for target_id, due, _company in rows}
+        range_start = datetime.combine(min(starts.values()), time.min) - timedelta(days=1)
+        range_end = datetime.combine(max(starts.values()), time.min) + timedelta(days=self.search_days + 1)
+        busy = self.env["mtdn.maintenance.request"]._read_busy_intervals(
+            self.plan_for, list(starts), range_start, range_end
+        )
+
+        vals_list = []
+        next_dates = defaultdict(list)
+        for target_id, due, company_id in rows:
+            intervals = busy[target_id]
+            windows = [(max(start, now), end) for start, end in self._slot_windows(starts[target_id]) if end > now]
+            slot = find_free_slot(intervals, windows, duration)
+            if slot:
+                bisect.insort(intervals, slot)
+            vals_list.append(
+                {
+                    "request_for": self.plan_for,
+                    request_field: target_id,
+                    "plan_id": self.id,
+                    "category_id": self.category_id.id,
+                    "team_id": self.team_id.id,
+                    "priority": self.priority,
+                    "effort_hours": self.duration_hours,
+                    "description": self.description or self.name,
+                    "start_datetime": slot and slot[0],
+                    "end_datetime": slot and slot[1],
+                    "state": "submitted" if slot else "draft",
+                    "company_id": company_id or self.company_id.id,
+                }
+            )
+            next_date = due + step
+            while next_date <= today:
+                next_date += step
+            next_dates[next_date].append(target_id)
+
+        self.env["mtdn.maintenance.request"].create(vals_list)
+        Target = self.env[PLAN_TARGETS[self.plan_for][0]]
+        for next_date, target_ids in next_dates.items():
+            Target.browse(target_ids).write({"next_maintenance_date": next_date})
+        return len(vals_list)
@@ -1,6 +1,42 @@
 # -*- coding: utf-8 -*-
+from collections import defaultdict
+
 from odoo import api, fields, models
 from odoo.exceptions import ValidationError
+from odoo.tools import SQL, create_index
+
+from .maintenance_kpi import KPI_MEASURES, KPI_STATES
+from .maintenance_workload import PRIORITY_WEIGHTS, WORKLOAD_STATES, MemberHeap
+
+# Requests whose downtime window blocks their room/asset.
+DOWNTIME_STATES = ("submitted", "in_progress")
+
+# Changes of these fields move or resize a request's downtime window.
+DOWNTIME_FIELDS = {"state", "request_for", "room_id", "asset_id", "start_datetime", "end_datetime"}
+
+# Key of the per-transaction "currently down" cache in ``cr.cache``.
+DOWN_RESOURCES_CACHE_KEY = "mtdn_maintenance_down_resources"
+
+# Changes of these fields move a request's weight between member workloads.
+WORKLOAD_FIELDS = {"assigned_user_id", "state", "priority", "effort_hours"}
+
+# Changes of these fields move a request between KPI buckets or change its measures.
+KPI_FIELDS = {
+    "state",
+    "request_date",
+    "company_id",
+    "request_for",
+    "room_id",
+    "asset_id",
+    "category_id",
+    "team_id",
+    "started_at",
+    "done_at",
+    "start_datetime",
+    "end_datetime",
+    "cost",
+    "plan_id",
+}
 
 
 class MtdnMaintenanceRequest(models.Model):
@@ -56,11 +92,20 @@ class MtdnMaintenanceRequest(models.Model):
     requested_by = fields.Many2one("res.users", string="Người báo", default=lambda self: self.env.user, required=True)
 
     assigned_user_id = fields.Many2one("res.users", string="Người xử lý", ondelete="set null", index=True)
+    effort_hours = fields.Float(string="Giờ công ước tính", default=1.0)
 
     # Downtime window (when this maintenance blocks booking/usage)
     start_datetime = fields.Datetime(string="Bắt đầu downtime")
     end_datetime = fields.Datetime(string="Kết thúc downtime")
 
+    plan_id = fields.Many2one(
+        "mtdn.maintenance.plan",
+        string="Kế hoạch bảo trì",
+        ondelete="set null",
+        index=True,
+        readonly=True,
+    )
+
     description = fields.Text(string="Mô tả sự cố / yêu cầu")
     resolution = fields.Text(string="Kết quả xử lý")
 
@@ -72,6 +117,15 @@ class MtdnMaintenanceRequest(models.Model):
     )
     cost = fields.Monetary(string="Chi phí", currency_field="currency_id")
 
+    started_at = fields.Datetime(string="Bắt đầu xử lý lúc", readonly=True, copy=False)
+    done_at = fields.Datetime(string="Hoàn tất lúc", readonly=True, copy=False)
+    failure_gap_hours = fields.Float(
+        string="Giờ từ sự cố trước",
+        readonly=True,
+        copy=False,
+        help="Khoảng thời gian từ phiếu sự cố (không theo kế hoạch) trước đó của cùng phòng/tài sản; dùng để tính MTBF.",
+    )
+
     state = fields.Selection(
         selection=[
             ("draft", "Nháp"),
@@ -92,27 +146,173 @@ class MtdnMaintenanceRequest(models.Model):
     previous_room_state = fields.Selection(related="room_id.state", string="(Hidden)", readonly=True)
     previous_asset_state = fields.Selection(related="asset_id.state", string="(Hidden)", readonly=True)
 
-    is_active_downtime = fields.Boolean(string="Đang downtime", compute="_compute_is_active_downtime", store=False)
+    is_active_downtime = fields.Boolean(
+        string="Đang downtime",
+        compute="_compute_is_active_downtime",
+        search="_search_is_active_downtime",
+        store=False,
+    )
+
+    def init(self):
+        # Active-downtime lookups: "which rooms/assets are down now / in this window".
+        create_index(
+            self.env.cr,
+            "mtdn_maintenance_request_downtime_idx",
+            self._table,
+            ["state", "start_datetime", "end_datetime"],
+            where="state IN ('submitted', 'in_progress')",
+        )
 
     @api.depends("state", "start_datetime", "end_datetime")
     def _compute_is_active_downtime(self):
         now = fields.Datetime.now()
         for rec in self:
-            if rec.state in ("submitted", "in_progress") and rec.start_datetime and rec.end_datetime:
+            if rec.state in DOWNTIME_STATES and rec.start_datetime and rec.end_datetime:
                 rec.is_active_downtime = rec.start_datetime <= now <= rec.end_datetime
             else:
                 rec.is_active_downtime = False
 
+    def _search_is_active_downtime(self, operator, value):
+        if operator not in ("=", "!="):
+            raise NotImplementedError("Unsupported operator %s for is_active_downtime" % operator)
+        now = fields.Datetime.now()
+        domain = [
+            ("state", "in", DOWNTIME_STATES),
+            ("start_datetime", "<=", now),
+            ("end_datetime", ">=", now),
+        ]
+        if (operator == "=") == bool(value):
+            return domain
+        return [("id", "not in", self._search(domain))]
+
+    @api.model
+    def _get_down_resource_ids(self, start_dt=None, end_dt=None):
+        """Return ``{"room": frozenset(ids), "asset": frozenset(ids)}`` under active downtime.
+
+        Without arguments: resources down right now. With a window: resources
+        whose downtime overlaps ``[start_dt, end_dt)``. Computed once per
+        transaction and window (shared by rooms, assets and the room request
+        wizard); any request change drops the cache.
+        """
+        cache = self.env.cr.cache.setdefault(DOWN_RESOURCES_CACHE_KEY, {})
+        key = (start_dt, end_dt)
+        if key not in cache:
+            self.flush_model(["request_for", "room_id", "asset_id", "state", "start_datetime", "end_datetime"])
+            if start_dt is None:
+                now = fields.Datetime.now()
+                condition = SQL("start_datetime <= %s AND end_datetime >= %s", now, now)
+            else:
+                condition = SQL("start_datetime < %s AND end_datetime > %s", end_dt, start_dt)
+            self.env.cr.execute(
+                SQL(
+                    """
+                    SELECT DISTINCT request_for, CASE WHEN request_for = 'room' THEN room_id ELSE asset_id END
+                      FROM mtdn_maintenance_request
+                     WHERE state IN %s AND %s
+                    """,
+                    DOWNTIME_STATES,
+                    condition,
+                )
+            )
+            ids = defaultdict(set)
+            for request_for, res_id in self.env.cr.fetchall():
+                if res_id:
+                    ids[request_for].add(res_id)
+            cache[key] = {"room": frozenset(ids["room"]), "asset": frozenset(ids["asset"])}
+        return cache[key]
+
+    @api.model
+    def _invalidate_down_resources(self):
+        self.env.cr.cache.pop(DOWN_RESOURCES_CACHE_KEY, None)
+
     # ------------------------------------------------------------
     # Create / constraints
     # ------------------------------------------------------------
     @api.model_create_multi
     def create(self, vals_list):
-        seq = self.env["ir.sequence"]
+        missing_name = [vals for vals in vals_list if vals.get("name", "New") == "New"]
+        if missing_name:
+            names = self.env["ir.sequence"].mtdn_next_by_code_batch("mtdn.maintenance.request", len(missing_name))
+            for vals, name in zip(missing_name, names):
+                vals["name"] = name or "New"
+        now = fields.Datetime.now()
         for vals in vals_list:
-            if vals.get("name", "New") == "New":
-                vals["name"] = seq.next_by_code("mtdn.maintenance.request") or "New"
-        return super().create(vals_list)
+            if vals.get("state") in ("in_progress", "done"):
+                vals.setdefault("started_at", now)
+            if vals.get("state") == "done":
+                vals.setdefault("done_at", now)
+        records = super().create(vals_list)
+        self._invalidate_down_resources()
+        self.env["mtdn.maintenance.workload"].sudo()._apply_deltas(records._workload_contributions())
+        followers = records._failure_gap_followers() - records
+        kpi_before = followers._kpi_contributions()
+        affected = records | followers
+        affected._update_failure_gaps()
+        affected._kpi_shift(kpi_before)
+        records._auto_assign()
+        records._notify_downtime()
+        return records
+
+    def write(self, vals):
+        if vals.get("state") == "in_progress":
+            vals = dict(vals, started_at=vals.get("started_at") or fields.Datetime.now())
+        elif vals.get("state") == "done":
+            vals = dict(vals, done_at=vals.get("done_at") or fields.Datetime.now())
+        workload_changed = bool(WORKLOAD_FIELDS.intersection(vals))
+        if workload_changed:
+            workload_before = self._workload_contributions()
+        kpi_changed = bool(KPI_FIELDS.intersection(vals))
+        if kpi_changed:
+            followers = self._failure_gap_followers() - self
+            kpi_before = (self | followers)._kpi_contributions()
+        downtime_changed = bool(DOWNTIME_FIELDS.intersection(vals))
+        if downtime_changed:
+            previous_rooms = self.filtered(lambda r: r.request_for == "room").room_id
+        res = super().write(vals)
+        if downtime_changed:
+            self._invalidate_down_resources()
+            self._notify_downtime(previous_rooms)
+        if workload_changed:
+            deltas = self._workload_contributions()
+            for user_id, (count, load) in workload_before.items():
+                deltas[user_id][0] -= count
+                deltas[user_id][1] -= load
+            self.env["mtdn.maintenance.workload"].sudo()._apply_deltas(deltas)
+        if kpi_changed:
+            # requests now following self: their gap is still the old one
+            new_followers = self._failure_gap_followers() - self - followers
+            for key, measures in new_followers._kpi_contributions().items():
+                kpi_before[key] = [before + value for before, value in zip(kpi_before[key], measures)]
+            affected = self | followers | new_followers
+            affected._update_failure_gaps()
+            affected._kpi_shift(kpi_before)
+        if vals.get("state") == "submitted" or "team_id" in vals:
+            self._auto_assign()
+        return res
+
+    def unlink(self):
+        workload_deltas = {
+            user_id: (-count, -load) for user_id, (count, load) in self._workload_contributions().items()
+        }
+        followers = self._failure_gap_followers() - self
+        kpi_before = (self | followers)._kpi_contributions()
+        ids, rooms = self.ids, self.filtered(lambda r: r.request_for == "room").room_id
+        res = super().unlink()
+        self._invalidate_down_resources()
+        notifier = self.env["mtdn.change.notifier"]
+        notifier._mtdn_notify("downtime", deleted=ids)
+        notifier._mtdn_notify("room", changed=rooms.ids)
+        self.env["mtdn.maintenance.workload"].sudo()._apply_deltas(workload_deltas)
+        followers._update_failure_gaps()
+        followers._kpi_shift(kpi_before)
+        return res
+
+    def _notify_downtime(self, extra_rooms=None):
+        """Publish the requests and the rooms they block (sent once per transaction)."""
+        notifier = self.env["mtdn.change.notifier"]
+        notifier._mtdn_notify("downtime", changed=self.ids)
+        rooms = self.filtered(lambda r: r.request_for == "room").room_id
+        notifier._mtdn_notify("room", changed=(rooms | (extra_rooms or rooms)).ids)
 
     @api.constrains("request_for", "room_id", "asset_id")
     def _check_target_required(self):
@@ -132,39 +332,290 @@ class MtdnMaintenanceRequest(models.Model):
     # Overlap helpers
     # ------------------------------------------------------------
     @api.model
-    def _overlap_domain(self, start_dt, end_dt):
-        return [
-            ("state", "in", ("submitted", "in_progress")),
-            ("start_datetime", "<", end_dt),
-            ("end_datetime", ">", start_dt),
-        ]
-
-    def _find_overlaps_for_room(self, room_id, start_dt, end_dt, exclude_id=None):
-        domain = self._overlap_domain(start_dt, end_dt) + [("request_for", "=", "room"), ("room_id", "=", room_id)]
-        if exclude_id:
-            domain.append(("id", "!=", exclude_id))
-        return self.search(domain)
+    def _read_busy_intervals(self, request_for, target_ids, date_from, date_to):
+        """Return ``{target_id: [(start, end), ...]}`` sorted by start.
 
-    def _find_overlaps_for_asset(self, asset_id, start_dt, end_dt, exclude_id=None):
-        domain = self._overlap_domain(start_dt, end_dt) + [("request_for", "=", "asset"), ("asset_id", "=", asset_id)]
-        if exclude_id:
-            domain.append(("id", "!=", exclude_id))
-        return self.search(domain)
+        Busy means an active downtime window of the room/asset, or for rooms a
+        non-cancelled booking, overlapping ``[date_from, date_to)``.
+        """
+        busy = defaultdict(list)
+        if not target_ids:
+            return busy
+        field = "room_id" if request_for == "room" else "asset_id"
+        self.flush_model([field, "request_for", "state", "start_datetime", "end_datetime"])
+        query = SQL(
+            """
+            SELECT %(field)s, start_datetime, end_datetime
+              FROM mtdn_maintenance_request
+             WHERE request_for = %(request_for)s
+               AND state IN ('submitted', 'in_progress')
+               AND %(field)s = ANY(%(ids)s)
+               AND start_datetime < %(date_to)s
+               AND end_datetime > %(date_from)s
+            """,
+            field=SQL.identifier(field),
+            request_for=request_for,
+            ids=list(target_ids),
+            date_from=date_from,
+            date_to=date_to,
+        )
+        if request_for == "room":
+            self.env["mtdn.meeting.booking"].flush_model(["room_id", "state", "start_datetime", "end_datetime"])
+            query = SQL(
+                """%s
+                 UNION ALL
+                SELECT room_id, start_datetime, end_datetime
+                  FROM mtdn_meeting_booking
+                 WHERE state != 'cancelled'
+                   AND room_id = ANY(%s)
+                   AND start_datetime < %s
+                   AND end_datetime > %s
+                """,
+                query,
+                list(target_ids),
+                date_to,
+                date_from,
+            )
+        self.env.cr.execute(SQL("%s ORDER BY 2", query))
+        for target_id, start, end in self.env.cr.fetchall():
+            busy[target_id].append((start, end))
+        return busy
 
     @api.constrains("request_for", "room_id", "asset_id", "start_datetime", "end_datetime", "state")
     def _check_overlap_with_other_maintenance(self):
+        """Validate the whole batch with one self-join instead of one search per request."""
+        to_check = self.filtered(
+            lambda r: r.state in DOWNTIME_STATES and r.start_datetime and r.end_datetime and (r.room_id or r.asset_id)
+        )
+        if not to_check:
+            return
+        self.flush_model(["request_for", "room_id", "asset_id", "state", "start_datetime", "end_datetime"])
+        self.env.cr.execute(
+            """
+            SELECT r.request_for
+              FROM mtdn_maintenance_request r
+              JOIN mtdn_maintenance_request o
+                ON o.id != r.id
+               AND o.request_for = r.request_for
+               AND ((r.request_for = 'room' AND o.room_id = r.room_id)
+                    OR (r.request_for = 'asset' AND o.asset_id = r.asset_id))
+               AND o.state IN %s
+               AND o.start_datetime < r.end_datetime
+               AND o.end_datetime > r.start_datetime
+             WHERE r.id = ANY(%s)
+             LIMIT 1
+            """,
+            [DOWNTIME_STATES, to_check.ids],
+        )
+        row = self.env.cr.fetchone()
+        if row and row[0] == "room":
+            raise ValidationError("Đã có phiếu bảo trì khác trùng downtime cho phòng này.")
+        if row:
+            raise ValidationError("Đã có phiếu bảo trì khác trùng downtime cho tài sản này.")
+
+    # ------------------------------------------------------------
+    # Workload / dispatch
+    # ------------------------------------------------------------
+    def _workload_weight(self):
+        self.ensure_one()
+        return (self.effort_hours or 1.0) * PRIORITY_WEIGHTS.get(self.priority, 1.0)
+
+    def _workload_contributions(self):
+        """Return ``{user_id: [count, load]}`` contributed by ``self`` to open workloads."""
+        contributions = defaultdict(lambda: [0, 0.0])
         for rec in self:
-            if rec.state not in ("submitted", "in_progress"):
-                continue
-            if not (rec.start_datetime and rec.end_datetime):
+            if rec.assigned_user_id and rec.state in WORKLOAD_STATES:
+                contribution = contributions[rec.assigned_user_id.id]
+                contribution[0] += 1
+                contribution[1] += rec._workload_weight()
+        return contributions
+
+    def _auto_assign(self):
+        """Assign unassigned submitted requests of auto-dispatch teams to their least-loaded member."""
+        todo = self.filtered(
+            lambda r: r.state == "submitted" and not r.assigned_user_id and r.team_id.auto_assign
+        )
+        if todo:
+            todo._dispatch()
+        return todo
+
+    def _dispatch(self, released=None):
+        """Assign ``self`` with one heap per team, heaviest/oldest requests first.
+
+        ``released`` is ``{user_id: load}`` already counted in the stored
+        workloads but about to be reassigned (rebalance); it is subtracted
+        before picking. Writes are grouped per chosen member.
+        """
+        team_members = {team.id: team.member_ids.ids for team in self.team_id}
+        user_ids = {user_id for members in team_members.values() for user_id in members}
+        if not user_ids:
+            return {}
+        loads = self.env["mtdn.maintenance.workload"].sudo()._read_loads(user_ids)
+        for user_id, load in (released or {}).items():
+            if user_id in loads:
+                loads[user_id] -= load
+        heap = MemberHeap(team_members, loads)
+
+        assignments = defaultdict(list)
+        for rec in self.sorted(lambda r: (-int(r.priority or 0), r.request_date, r.id)):
+            user_id = heap.pick(rec.team_id.id, rec._workload_weight())
+            if user_id:
+                assignments[user_id].append(rec.id)
+        for user_id, request_ids in assignments.items():
+            self.browse(request_ids).write({"assigned_user_id": user_id})
+        return assignments
+
+    @api.model
+    def _rebalance_queue(self, teams=None):
+        """Redistribute every submitted (not yet started) request of ``teams`` (default: all)."""
+        domain = [("state", "=", "submitted"), ("team_id", "!=", False)]
+        if teams is not None:
+            domain.append(("team_id", "in", teams.ids))
+        queue = self.search(domain)
+        released = {user_id: load for user_id, (_count, load) in queue._workload_contributions().items()}
+        return queue._dispatch(released=released)
+
+    def action_auto_assign(self):
+        self._auto_assign()
+        return True
+
+    # ------------------------------------------------------------
+    # KPIs
+    # ------------------------------------------------------------
+    def _kpi_contributions(self):
+        """Return ``{bucket: measures}`` added by ``self`` to ``mtdn.maintenance.kpi``.
+
+        ``bucket`` follows ``KPI_DIMENSIONS`` and ``measures`` ``KPI_MEASURES``.
+        """
+        contributions = defaultdict(lambda: [0] * len(KPI_MEASURES))
+        for rec in self:
+            if rec.state not in KPI_STATES:
                 continue
+            measures = contributions[
+                (
+                    rec.request_date.date().replace(day=1),
+                    rec.company_id.id or None,
+                    rec.request_for,
+                    rec.room_id.id or None,
+                    rec.asset_id.id or None,
+                    rec.asset_id.category_id.id or None,
+                    rec.category_id.id or None,
+                    rec.team_id.id or None,
+                )
+            ]
+            measures[0] += 1
+            if rec.failure_gap_hours:
+                measures[5] += rec.failure_gap_hours
+                measures[6] += 1
+            if rec.state == "done":
+                measures[1] += 1
+                if rec.done_at:
+                    measures[2] += (rec.done_at - (rec.started_at or rec.request_date)).total_seconds() / 3600.0
+                if rec.start_datetime and rec.end_datetime:
+                    measures[3] += (rec.end_datetime - rec.start_datetime).total_seconds() / 3600.0
+                measures[4] += rec.cost
+        return contributions
+
+    def _kpi_shift(self, before):
+        """Apply to the KPI table the difference between ``before`` and the contributions of ``self``."""
+        deltas = self._kpi_contributions()
+        for key, measures in before.items():
+            deltas[key] = [after - prev for after, prev in zip(deltas[key], measures)]
+        self.env["mtdn.maintenance.kpi"].sudo()._apply_deltas(deltas)
 
-            if rec.request_for == "room" and rec.room_id:
-                if rec._find_overlaps_for_room(rec.room_id.id, rec.start_datetime, rec.end_datetime, exclude_id=rec.id):
-                    raise ValidationError("Đã có phiếu bảo trì khác trùng downtime cho phòng này.")
-            if rec.request_for == "asset" and rec.asset_id:
-                if rec._find_overlaps_for_asset(rec.asset_id.id, rec.start_datetime, rec.end_datetime, exclude_id=rec.id):
-                    raise ValidationError("Đã có phiếu bảo trì khác trùng downtime cho tài sản này.")
+    def _failure_gap_followers(self):
+        """Corrective requests whose gap depends on ``self`` (same target, first later date)."""
+        if not self:
+            return self.browse()
+        self.flush_model(["request_date", "request_for", "room_id", "asset_id", "plan_id", "state"])
+        self.env.cr.execute(
+            SQL(
+                """
+                SELECT DISTINCT f.id
+                  FROM mtdn_maintenance_request r
+                  JOIN LATERAL (SELECT MIN(o.request_date) AS next_date
+                                  FROM mtdn_maintenance_request o
+                                 WHERE %(o_target)s
+                                   AND o.plan_id IS NULL
+                                   AND o.state IN %(states)s
+                                   AND o.request_date > r.request_date) n ON TRUE
+                  JOIN mtdn_maintenance_request f
+                    ON %(f_target)s
+                   AND f.plan_id IS NULL
+                   AND f.state IN %(states)s
+                   AND f.request_date = n.next_date
+                 WHERE r.id = ANY(%(ids)s)
+                """,
+                o_target=self._same_target_sql("o", "r"),
+                f_target=self._same_target_sql("f", "r"),
+                states=KPI_STATES,
+                ids=self.ids,
+            )
+        )
+        return self.browse([row[0] for row in self.env.cr.fetchall()])
+
+    def _update_failure_gaps(self):
+        """Recompute on ``self`` the hours since the previous corrective request of the same room/asset."""
+        if not self:
+            return
+        self._write_failure_gaps(SQL("r2.id = ANY(%s)", self.ids))
+
+    @api.model
+    def _rebuild_failure_gaps(self):
+        """Recompute the gap of every request; used by the KPI rebuild (no deltas applied)."""
+        self._write_failure_gaps(SQL("TRUE"))
+
+    @api.model
+    def _write_failure_gaps(self, where):
+        """Store the gap of the requests matching ``where`` (on alias ``r2``); empty outside corrective requests."""
+        self.flush_model(["request_date", "request_for", "room_id", "asset_id", "plan_id", "state", "failure_gap_hours"])
+        self.env.cr.execute(
+            SQL(
+                """
+                UPDATE mtdn_maintenance_request r
+                   SET failure_gap_hours = g.gap
+                  FROM (SELECT r2.id,
+                               CASE WHEN r2.plan_id IS NULL AND r2.state IN %(states)s
+                                    THEN EXTRACT(EPOCH FROM r2.request_date - %(prev)s) / 3600.0
+                               END AS gap
+                          FROM mtdn_maintenance_request r2
+                         WHERE %(where)s) g
+                 WHERE r.id = g.id AND r.failure_gap_hours IS DISTINCT FROM g.gap
+                """,
+                prev=self._previous_failure_sql(),
+                states=KPI_STATES,
+                where=where,
+            )
+        )
+        self.invalidate_model(["failure_gap_hours"])
+
+    @api.model
+    def _same_target_sql(self, alias, ref):
+        """``alias`` maintains the same target as ``ref``: the room of room requests, the asset otherwise."""
+        alias, ref = SQL.identifier(alias), SQL.identifier(ref)
+        return SQL(
+            """%(a)s.request_for = %(r)s.request_for
+               AND CASE WHEN %(r)s.request_for = 'room' THEN %(a)s.room_id = %(r)s.room_id
+                        ELSE %(a)s.asset_id = %(r)s.asset_id END""",
+            a=alias,
+            r=ref,
+        )
+
+    @api.model
+    def _previous_failure_sql(self):
+        """Date of the previous corrective request on the target (room or asset) of request ``r2``."""
+        return SQL(
+            """
+            (SELECT MAX(o.request_date)
+               FROM mtdn_maintenance_request o
+              WHERE %s
+                AND o.plan_id IS NULL
+                AND o.state IN %s
+                AND o.request_date < r2.request_date)
+            """,
+            self._same_target_sql("o", "r2"),
+            KPI_STATES,
+        )
 
     # ------------------------------------------------------------
     # Buttons
@@ -172,31 +623,50 @@ class MtdnMaintenanceRequest(models.Model):
     def action_submit(self):
         self.write({"state": "submitted"})
 
+    def _maintenance_targets(self):
+        """Return ``(rooms, assets)`` maintained by the requests of ``self``."""
+        rooms = self.filtered(lambda r: r.request_for == "room").room_id
+        assets = self.filtered(lambda r: r.request_for == "asset").asset_id
+        return rooms, assets
+
+    def _release_targets(self):
+        """Put rooms/assets of ``self`` back to available, unless still under another request in progress.
+
+        One search for the remaining in-progress requests, then one write per model.
+        """
+        rooms, assets = self._maintenance_targets()
+        rooms = rooms.filtered(lambda r: r.state == "maintenance")
+        assets = assets.filtered(lambda a: a.state == "maintenance")
+        if not rooms and not assets:
+            return
+        busy = self.search(
+            [
+                ("id", "not in", self.ids),
+                ("state", "=", "in_progress"),
+                "|",
+                ("room_id", "in", rooms.ids),
+                ("asset_id", "in", assets.ids),
+            ]
+        )
+        busy_rooms, busy_assets = busy._maintenance_targets()
+        (rooms - busy_rooms).write({"state": "available"})
+        (assets - busy_assets).write({"state": "available"})
+
     def action_start(self):
         """Mark as in progress. Optionally switch room/asset state to maintenance for visibility."""
-        for rec in self:
-            rec.state = "in_progress"
-            if rec.request_for == "room" and rec.room_id:
-                rec.room_id.state = "maintenance"
-            if rec.request_for == "asset" and rec.asset_id:
-                rec.asset_id.state = "maintenance"
+        self.write({"state": "in_progress"})
+        rooms, assets = self._maintenance_targets()
+        rooms.filtered(lambda r: r.state != "maintenance").write({"state": "maintenance"})
+        assets.filtered(lambda a: a.state != "maintenance").write({"state": "maintenance"})
 
     def action_done(self):
-        for rec in self:
-            rec.state = "done"
-            # Restore to available only if currently maintenance (best-effort)
-            if rec.request_for == "room" and rec.room_id and rec.room_id.state == "maintenance":
-                rec.room_id.state = "available"
-            if rec.request_for == "asset" and rec.asset_id and rec.asset_id.state == "maintenance":
-                rec.asset_id.state = "available"
+        self.write({"state": "done"})
+        # Restore to available only if currently maintenance (best-effort)
+        self._release_targets()
 
     def action_cancel(self):
-        for rec in self:
-            rec.state = "cancelled"
-            if rec.request_for == "room" and rec.room_id and rec.room_id.state == "maintenance":
-                rec.room_id.state = "available"
-            if rec.request_for == "asset" and rec.asset_id and rec.asset_id.state == "maintenance":
-                rec.asset_id.state = "available"
+        self.write({"state": "cancelled"})
+        self._release_targets()
 
     def action_set_draft(self):
         self.write({"state": "draft"})
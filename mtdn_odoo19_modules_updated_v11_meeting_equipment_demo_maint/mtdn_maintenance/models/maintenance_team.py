@@ -15,8 +15,17 @@ class MtdnMaintenanceTeam(models.Model):
         "user_id",
         string="Thành viên",
     )
+    auto_assign = fields.Boolean(
+        string="Tự động phân công",
+        default=True,
+        help="Phiếu đã gửi chưa có người xử lý được giao cho thành viên có khối lượng công việc thấp nhất.",
+    )
     active = fields.Boolean(default=True)
 
     _sql_constraints = [
         ("mtdn_maint_team_name_uniq", "unique(name)", "Tên đội xử lý phải là duy nhất."),
     ]
+
+    def action_rebalance(self):
+        self.env["mtdn.maintenance.request"]._rebalance_queue(teams=self)
+        return True
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+import heapq
+
+from odoo import api, fields, models
+from odoo.tools import SQL
+
+# Requests counted in a member's open workload.
+WORKLOAD_STATES = ("submitted", "in_progress")
+
+# Weight of one effort hour per request priority.
+PRIORITY_WEIGHTS = {"0": 1.0, "1": 2.0, "2": 3.0, "3": 5.0}
+
+
+class MtdnMaintenanceWorkload(models.Model):
+    """Open maintenance workload of one user, maintained incrementally.
+
+    ``mtdn.maintenance.request`` shifts the counters on every create, write
+    and unlink (see ``_workload_contributions``); ``_rebuild`` recounts them
+    from scratch and is only used to repair drift.
+    """
+
+    _name = "mtdn.maintenance.workload"
+    _description = "Maintenance Workload per Member"
+    _order = "load desc, user_id"
+    _rec_name = "user_id"
+
+    user_id = fields.Many2one("res.users", string="Người xử lý", required=True, ondelete="cascade", index=True)
+    open_count = fields.Integer(string="Phiếu đang mở", default=0, readonly=True)
+    load = fields.Float(
+        string="Khối lượng",
+        default=0.0,
+        readonly=True,
+        help="Tổng (giờ công ước tính x trọng số mức độ) của các phiếu đã gửi hoặc đang xử lý.",
+    )
+
+    def init(self):
+        # Conflict target of the upserts in _apply_deltas and _rebuild.
+        self.env.cr.execute(
+            """
+            CREATE UNIQUE INDEX IF NOT EXISTS mtdn_maint_workload_user_uniq
+                ON mtdn_maintenance_workload (user_id)
+            """
+        )
+
+    @api.model
+    def _apply_deltas(self, deltas):
+        """Shift counters by ``{user_id: (count, load)}`` with one upsert."""
+        rows = [(user_id, count, load) for user_id, (count, load) in deltas.items() if count or load]
+        if not rows:
+            return
+        self.flush_model(["open_count", "load"])
+        self.env.cr.execute(
+            SQL(
+                """
+                INSERT INTO mtdn_maintenance_workload AS w
+                       (user_id, open_count, load, create_uid, create_date, write_uid, write_date)
+                SELECT d.user_id, d.open_count, d.load, %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+                  FROM (VALUES %(values)s) AS d(user_id, open_count, load)
+                ON CONFLICT (user_id) DO UPDATE
+                   SET open_count = w.open_count + EXCLUDED.open_count,
+                       load = w.load + EXCLUDED.load
+                """,
+                uid=self.env.uid,
+                values=SQL(", ").join(SQL("(%s, %s, %s::float)", *row) for row in rows),
+            )
+        )
+        self.invalidate_model(["open_count", "load"])
+
+    @api.model
+    def _read_loads(self, user_ids):
+        """Return ``{user_id: load}`` for ``user_ids`` (0.0 for users without counter)."""
+        self.flush_model(["user_id", "load"])
+        self.env.cr.execute(
+            "SELECT user_id, load FROM mtdn_maintenance_workload WHERE user_id = ANY(%s)",
+            [list(user_ids)],
+        )
+        loads = dict.fromkeys(user_ids, 0.0)
+        loads.update(self.env.cr.fetchall())
+        return loads
+
+    @api.model
+    def _rebuild(self):
+        """Recount every counter from the requests. Returns the number of corrected rows."""
+        Request = self.env["mtdn.maintenance.request"]
+        Request.flush_model(["assigned_user_id", "state", "priority", "effort_hours"])
+        self.flush_model()
+        cases = SQL(" ").join(SQL("WHEN %s THEN %s", key, weight) for key, weight in PRIORITY_WEIGHTS.items())
+        self.env.cr.execute(
+            SQL(
+                """
+                WITH actual AS (
+                    SELECT assigned_user_id AS user_id,
+                           COUNT(*) AS open_count,
+                           SUM(COALESCE(NULLIF(effort_hours, 0), 1.0) * (CASE priority %(cases)s ELSE 1.0 END)) AS load
+                      FROM mtdn_maintenance_request
+                     WHERE assigned_user_id IS NOT NULL AND state IN %(states)s
+                  GROUP BY assigned_user_id
+                ), merged AS (
+                    SELECT COALESCE(a.user_id, w.user_id) AS user_id,
+                           COALESCE(a.open_count, 0) AS open_count,
+                           COALESCE(a.load, 0.0) AS load
+                      FROM actual a
+                 FULL JOIN mtdn_maintenance_workload w ON w.user_id = a.user_id
+                     WHERE w.id IS NULL OR w.open_count != COALESCE(a.open_count, 0)
+                        OR abs(w.load - COALESCE(a.load, 0.0)) > 1e-6
+                )
+                INSERT INTO mtdn_maintenance_workload AS w
+                       (user_id, open_count, load, create_uid, create_date, write_uid, write_date)
+                SELECT user_id, open_count, load, %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+                  FROM merged
+                ON CONFLICT (user_id) DO UPDATE
+                   SET open_count = EXCLUDED.open_count, load = EXCLUDED.load
+                """,
+                cases=cases,
+                states=WORKLOAD_STATES,
+                uid=self.env.uid,
+            )
+        )
+        repaired = self.env.cr.rowcount
+        self.invalidate_model()
+        return repaired
+
+    @api.model
+    def _cron_rebuild(self):
+        return self._rebuild()
+
+
+class MemberHeap:
+    """Least-loaded member picker shared by several teams.
+
+    Members may belong to several teams, so every team keeps its own heap of
+    ``(load, user_id)`` entries and stale entries are skipped lazily against
+    the single ``loads`` dict.
+    """
+
+    def __init__(self, team_members, loads):
+        self.loads = loads
+        self.heaps = {}
+        for team_id, user_ids in team_members.items():
+            heap = [(loads[user_id], user_id) for user_id in user_ids]
+            heapq.heapify(heap)
+            self.heaps[team_id] = heap
+
+    def pick(self, team_id, weight):
+        """Assign ``weight`` to the least-loaded member of ``team_id`` and return its id."""
+        heap = self.heaps.get(team_id)
+        while heap:
+            load, user_id = heapq.heappop(heap)
+            if load != self.loads[user_id]:
+                heapq.heappush(heap, (self.loads[user_id], user_id))
+                continue
+            self.loads[user_id] = load + weight
+            heapq.heappush(heap, (self.loads[user_id], user_id))
+            return user_id
+        return False
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+from collections import defaultdict
+from datetime import date, datetime
+
+from odoo.tests import TransactionCase, tagged
+
+JANUARY = date(2030, 1, 1)
+FEBRUARY = date(2030, 2, 1)
+
+
+@tagged("post_install", "-at_install")
+class TestMaintenanceKpi(TransactionCase):
+    """Monthly KPI buckets and failure gaps shifted by request create, write and unlink."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.asset_category = cls.env["mtdn.asset.category"].create({"name": "KPI Máy chiếu", "code": "KPI-PROJ"})
+        Asset = cls.env["mtdn.asset"]
+        cls.asset_a = Asset.create({"name": "Máy chiếu A", "category_id": cls.asset_category.id})
+        cls.asset_b = Asset.create({"name": "Máy chiếu B", "category_id": cls.asset_category.id})
+        cls.room = cls.env["mtdn.meeting.room"].create({"name": "Phòng KPI", "code": "KPI-ROOM"})
+
+    def _request(self, day, target=None, state="submitted", month=1, **vals):
+        """Corrective request on ``target`` (asset A by default) at 08:00 on ``day``."""
+        target = target or self.asset_a
+        vals = dict({"request_date": datetime(2030, month, day, 8, 0), "state": state}, **vals)
+        if target._name == "mtdn.meeting.room":
+            vals.update(request_for="room", room_id=target.id)
+        else:
+            vals.update(request_for="asset", asset_id=target.id)
+        return self.env["mtdn.maintenance.request"].create(vals)
+
+    def _kpis(self):
+        """``{(period, target): (requests, done, repair_h, downtime_h, cost, gap_h, gaps)}`` of the test targets."""
+        Kpi = self.env["mtdn.maintenance.kpi"]
+        Kpi.invalidate_model()
+        totals = defaultdict(lambda: [0, 0, 0.0, 0.0, 0.0, 0.0, 0])
+        rows = Kpi.search(["|", ("asset_id", "in", (self.asset_a | self.asset_b).ids), ("room_id", "=", self.room.id)])
+        for row in rows:
+            target = row.asset_id if row.request_for == "asset" else row.room_id
+            measures = totals[(row.period, target)]
+            for i, value in enumerate(
+                (
+                    row.request_count,
+                    row.done_count,
+                    row.repair_hours,
+                    row.downtime_hours,
+                    row.cost,
+                    row.failure_interval_hours,
+                    row.failure_interval_count,
+                )
+            ):
+                measures[i] += value
+        return {key: tuple(round(value, 6) for value in measures) for key, measures in totals.items() if any(measures)}
+
+    def test_requests_counted_per_month_with_failure_gaps(self):
+        first, second = self._request(3), self._request(5)
+        february = self._request(1, month=2)
+        self._request(6, state="draft")
+        self.assertEqual((first.failure_gap_hours, second.failure_gap_hours), (0.0, 48.0))
+        self.assertEqual(february.failure_gap_hours, 27 * 24.0)
+        self.assertEqual(
+            self._kpis(),
+            {
+                (JANUARY, self.asset_a): (2, 0, 0.0, 0.0, 0.0, 48.0, 1),
+                (FEBRUARY, self.asset_a): (1, 0, 0.0, 0.0, 0.0, 648.0, 1),
+            },
+        )
+
+    def test_done_request_adds_repair_downtime_and_cost(self):
+        request = self._request(3)
+        request.write({"state": "in_progress", "started_at": datetime(2030, 1, 3, 9, 0)})
+        request.write(
+            {
+                "state": "done",
+                "done_at": datetime(2030, 1, 3, 12, 0),
+                "start_datetime": datetime(2030, 1, 3, 10, 0),
+                "end_datetime": datetime(2030, 1, 3, 12, 0),
+                "cost": 250000,
+            }
+        )
+        self.assertEqual(self._kpis(), {(JANUARY, self.asset_a): (1, 1, 3.0, 2.0, 250000.0, 0.0, 0)})
+
+    def test_earlier_request_becomes_the_predecessor(self):
+        first, second = self._request(3), self._request(5)
+        earlier = self._request(1)
+        self.assertEqual(
+            (earlier.failure_gap_hours, first.failure_gap_hours, second.failure_gap_hours), (0.0, 48.0, 48.0)
+        )
+        self.assertEqual(self._kpis(), {(JANUARY, self.asset_a): (3, 0, 0.0, 0.0, 0.0, 96.0, 2)})
+
+    def test_move_to_another_asset_relinks_both_gap_chains(self):
+        self._request(3)
+        moved = self._request(5)
+        last = self._request(7)
+        moved.write({"asset_id": self.asset_b.id})
+        self.assertEqual((moved.failure_gap_hours, last.failure_gap_hours), (0.0, 96.0))
+        self.assertEqual(
+            self._kpis(),
+            {
+                (JANUARY, self.asset_a): (2, 0, 0.0, 0.0, 0.0, 96.0, 1),
+                (JANUARY, self.asset_b): (1, 0, 0.0, 0.0, 0.0, 0.0, 0),
+            },
+        )
+
+    def test_date_change_reorders_the_gaps(self):
+        first, second = self._request(3), self._request(5)
+        first.write({"request_date": datetime(2030, 1, 6, 8, 0)})
+        self.assertEqual((second.failure_gap_hours, first.failure_gap_hours), (0.0, 24.0))
+        self.assertEqual(self._kpis(), {(JANUARY, self.asset_a): (2, 0, 0.0, 0.0, 0.0, 24.0, 1)})
+
+    def test_cancel_and_unlink_close_the_gaps(self):
+        first, middle, last = self._request(3), self._request(5), self._request(7)
+        middle.action_cancel()
+        self.assertEqual(last.failure_gap_hours, 96.0)
+        self.assertEqual(self._kpis(), {(JANUARY, self.asset_a): (2, 0, 0.0, 0.0, 0.0, 96.0, 1)})
+        middle.action_set_draft()
+        self.assertEqual(self._kpis(), {(JANUARY, self.asset_a): (2, 0, 0.0, 0.0, 0.0, 96.0, 1)})
+        first.unlink()
+        self.assertEqual(last.failure_gap_hours, 0.0)
+        self.assertEqual(self._kpis(), {(JANUARY, self.asset_a): (1, 0, 0.0, 0.0, 0.0, 0.0, 0)})
+
+    def test_asset_request_with_stale_room_is_not_chained_to_the_room(self):
+        self._request(3, target=self.room)
+        request = self._request(5, room_id=self.room.id)
+        self.assertEqual(request.failure_gap_hours, 0.0)
+        self.assertEqual(
+            self._kpis(),
+            {
+                (JANUARY, self.room): (1, 0, 0.0, 0.0, 0.0, 0.0, 0),
+                (JANUARY, self.asset_a): (1, 0, 0.0, 0.0, 0.0, 0.0, 0),
+            },
+        )
+
+    def test_asset_category_change_moves_the_bucket(self):
+        self._request(3)
+        other_category = self.env["mtdn.asset.category"].create({"name": "KPI Màn hình", "code": "KPI-SCREEN"})
+        self.asset_a.write({"category_id": other_category.id})
+        rows = self.env["mtdn.maintenance.kpi"].search([("asset_id", "=", self.asset_a.id), ("request_count", "!=", 0)])
+        self.assertEqual(rows.asset_category_id, other_category)
+
+    def test_rebuild_keeps_the_incremental_rows(self):
+        first, second = self._request(3), self._request(5)
+        self._request(4, target=self.room, state="done", cost=100000)
+        second.write({"asset_id": self.asset_b.id})
+        second.write({"asset_id": self.asset_a.id})
+        self._request(1)
+        first.write({"request_date": datetime(2030, 1, 6, 8, 0)})
+        Request = self.env["mtdn.maintenance.request"]
+        requests = Request.search([("asset_id", "=", self.asset_a.id)])
+        gaps = {rec: rec.failure_gap_hours for rec in requests}
+        kpis = self._kpis()
+        self.assertEqual(kpis[(JANUARY, self.asset_a)], (3, 0, 0.0, 0.0, 0.0, 120.0, 2))
+
+        self.env["mtdn.maintenance.kpi"]._rebuild()
+        requests.invalidate_recordset(["failure_gap_hours"])
+        self.assertEqual({rec: rec.failure_gap_hours for rec in requests}, gaps)
+        self.assertEqual(self._kpis(), kpis)
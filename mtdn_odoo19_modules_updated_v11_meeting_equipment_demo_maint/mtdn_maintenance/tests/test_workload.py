@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime
+
+from odoo.tests import TransactionCase, new_test_user, tagged
+
+
+@tagged("post_install", "-at_install")
+class TestMaintenanceWorkload(TransactionCase):
+    """Open workload per member shifted by request create, write and unlink."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user_a = new_test_user(cls.env, login="mtdn_workload_a", groups="base.group_user")
+        cls.user_b = new_test_user(cls.env, login="mtdn_workload_b", groups="base.group_user")
+        cls.users = cls.user_a | cls.user_b
+        cls.team = cls.env["mtdn.maintenance.team"].create(
+            {"name": "Đội Workload", "member_ids": [(6, 0, cls.users.ids)], "auto_assign": False}
+        )
+        cls.room = cls.env["mtdn.meeting.room"].create({"name": "Phòng Workload", "code": "WORKLOAD-ROOM"})
+
+    def _request(self, user, state="submitted", priority="1", effort_hours=1.0, **vals):
+        return self.env["mtdn.maintenance.request"].create(
+            dict(
+                {
+                    "request_for": "room",
+                    "room_id": self.room.id,
+                    "team_id": self.team.id,
+                    "assigned_user_id": user.id if user else False,
+                    "state": state,
+                    "priority": priority,
+                    "effort_hours": effort_hours,
+                },
+                **vals,
+            )
+        )
+
+    def _workloads(self):
+        """``{user: (open_count, load)}`` of the test users, empty rows left out."""
+        Workload = self.env["mtdn.maintenance.workload"]
+        Workload.invalidate_model()
+        return {
+            rec.user_id: (rec.open_count, rec.load)
+            for rec in Workload.search([("user_id", "in", self.users.ids)])
+            if rec.open_count or rec.load
+        }
+
+    def test_submitted_request_weighted_by_priority_and_effort(self):
+        self._request(self.user_a, priority="1", effort_hours=2.0)
+        self._request(self.user_a, priority="3", effort_hours=0.0)  # no estimate counts as one hour
+        self._request(self.user_b, state="draft", priority="3")
+        self.assertEqual(self._workloads(), {self.user_a: (2, 9.0)})
+
+    def test_submit_start_and_done(self):
+        request = self._request(self.user_a, state="draft", priority="2")
+        request.action_submit()
+        self.assertEqual(self._workloads(), {self.user_a: (1, 3.0)})
+        request.action_start()
+        self.assertEqual(self._workloads(), {self.user_a: (1, 3.0)})
+        request.action_done()
+        self.assertEqual(self._workloads(), {})
+
+    def test_cancel_then_back_to_draft_and_submit(self):
+        request = self._request(self.user_a, priority="2")
+        request.action_cancel()
+        self.assertEqual(self._workloads(), {})
+        request.action_set_draft()
+        self.assertEqual(self._workloads(), {})
+        request.action_submit()
+        self.assertEqual(self._workloads(), {self.user_a: (1, 3.0)})
+
+    def test_reassign_moves_the_load(self):
+        request = self._request(self.user_a, priority="1", effort_hours=2.0)
+        request.write({"assigned_user_id": self.user_b.id})
+        self.assertEqual(self._workloads(), {self.user_b: (1, 4.0)})
+        request.write({"assigned_user_id": False})
+        self.assertEqual(self._workloads(), {})
+
+    def test_priority_and_effort_change_on_several_requests(self):
+        requests = self._request(self.user_a) | self._request(self.user_b, state="in_progress")
+        requests.write({"priority": "3", "effort_hours": 4.0})
+        self.assertEqual(self._workloads(), {self.user_a: (1, 20.0), self.user_b: (1, 20.0)})
+
+    def test_unlink_releases_the_load(self):
+        first = self._request(self.user_a, priority="0", effort_hours=3.0)
+        self._request(self.user_a, priority="0")
+        first.unlink()
+        self.assertEqual(self._workloads(), {self.user_a: (1, 1.0)})
+
+    def test_rebalance_redistributes_the_queue(self):
+        urgent = self._request(self.user_a, priority="3", request_date=datetime(2030, 1, 1))
+        older = self._request(self.user_a, priority="0", effort_hours=2.0, request_date=datetime(2030, 1, 2))
+        newer = self._request(self.user_a, priority="0", effort_hours=2.0, request_date=datetime(2030, 1, 3))
+        medium = self._request(self.user_a, priority="1", request_date=datetime(2030, 1, 4))
+        self.assertEqual(self._workloads(), {self.user_a: (4, 11.0)})
+
+        # heaviest first, each to the least-loaded member: 5 -> a, 2 -> b, 2 -> b, 2 -> b
+        self.team.action_rebalance()
+        self.assertEqual(urgent.assigned_user_id, self.user_a)
+        self.assertEqual((medium | older | newer).assigned_user_id, self.user_b)
+        self.assertEqual(self._workloads(), {self.user_a: (1, 5.0), self.user_b: (3, 6.0)})
+
+    def test_rebuild_repairs_drift(self):
+        self._request(self.user_a, priority="2", effort_hours=2.0)
+        self._request(self.user_b, state="in_progress", priority="0")
+        expected = {self.user_a: (1, 6.0), self.user_b: (1, 1.0)}
+        self.assertEqual(self._workloads(), expected)
+
+        Workload = self.env["mtdn.maintenance.workload"]
+        self.env.cr.execute(
+            "UPDATE mtdn_maintenance_workload SET open_count = 7, load = 0 WHERE user_id = %s", [self.user_a.id]
+        )
+        self.assertEqual(Workload._rebuild(), 1)
+        self.assertEqual(self._workloads(), expected)
+        self.assertEqual(Workload._rebuild(), 0)
@@ -0,0 +1 @@
+from . import booking_reschedule
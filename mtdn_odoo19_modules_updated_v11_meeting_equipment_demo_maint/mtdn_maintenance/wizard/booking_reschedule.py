@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+import bisect
+from collections import defaultdict
+from datetime import timedelta
+
+from odoo import api, fields, models
+from odoo.exceptions import UserError
+from odoo.tools import SQL
+
+# How many days after the original date a moved booking may land.
+RESCHEDULE_SEARCH_DAYS = 7
+
+
+def _is_free(intervals, start, end):
+    """``intervals`` is sorted by start; True when ``[start, end)`` overlaps none of them."""
+    index = bisect.bisect_left(intervals, (end,))
+    return all(busy_end <= start for _busy_start, busy_end in intervals[:index])
+
+
+class MtdnMaintenanceBookingReschedule(models.TransientModel):
+    """Review and apply moves of bookings that collide with room downtime."""
+
+    _name = "mtdn.maintenance.booking.reschedule"
+    _description = "Reschedule Bookings Hit by Room Downtime"
+
+    request_ids = fields.Many2many(
+        "mtdn.maintenance.request",
+        "mtdn_maintenance_reschedule_request_rel",
+        "wizard_id",
+        "request_id",
+        string="Phiếu bảo trì",
+        readonly=True,
+    )
+    line_ids = fields.One2many("mtdn.maintenance.booking.reschedule.line", "wizard_id", string="Đề xuất")
+    unresolved_count = fields.Integer(string="Chưa có phương án", compute="_compute_unresolved_count")
+
+    @api.depends("line_ids.move_type")
+    def _compute_unresolved_count(self):
+        for wiz in self:
+            wiz.unresolved_count = len(wiz.line_ids.filtered(lambda l: l.move_type == "none"))
+
+    @api.model
+    def default_get(self, fields_list):
+        res = super().default_get(fields_list)
+        if self.env.context.get("active_model") == "mtdn.maintenance.request":
+            res["request_ids"] = [(6, 0, self.env.context.get("active_ids") or [])]
+        return res
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        wizards = super().create(vals_list)
+        for wiz in wizards:
+            wiz._build_plan()
+        return wizards
+
+    # ------------------------------------------------------------
+    # Planning
+    # ------------------------------------------------------------
+    def _read_affected_bookings(self):
+        """Return ``[(booking_id, request_id)]`` of future bookings inside the requests' downtime."""
+        self.ensure_one()
+        requests = self.request_ids.filtered(
+            lambda r: r.request_for == "room" and r.room_id and r.start_datetime and r.end_datetime
+        )
+        if not requests:
+            return []
+        self.env["mtdn.meeting.booking"].flush_model(["room_id", "state", "start_datetime", "end_datetime"])
+        requests.flush_recordset(["room_id", "start_datetime", "end_datetime"])
+        self.env.cr.execute(
+            """
+            SELECT DISTINCT ON (b.id) b.id, r.id
+              FROM mtdn_maintenance_request r
+              JOIN mtdn_meeting_booking b
+                ON b.room_id = r.room_id
+               AND b.start_datetime < r.end_datetime
+               AND b.end_datetime > r.start_datetime
+             WHERE r.id = ANY(%s)
+               AND b.state != 'cancelled'
+               AND b.end_datetime > %s
+          ORDER BY b.id, r.start_datetime
+            """,
+            [requests.ids, fields.Datetime.now()],
+        )
+        return self.env.cr.fetchall()
+
+    def _read_room_equipment_types(self, room_ids):
+        """Return ``{room_id: {equipment_type_id}}`` from the room equipment in one query."""
+        self.env.cr.execute(
+            """
+            SELECT rel.room_id, a.equipment_type_id
+              FROM mtdn_meeting_room_asset_rel rel
+              JOIN mtdn_asset a ON a.id = rel.asset_id
+             WHERE rel.room_id = ANY(%s) AND a.equipment_type_id IS NOT NULL
+            """,
+            [list(room_ids)],
+        )
+        types = defaultdict(set)
+        for room_id, type_id in self.env.cr.fetchall():
+            types[room_id].add(type_id)
+        return types
+
+    def _build_plan(self):
+        """Propose, for every affected booking, an equivalent free room or the nearest free slot."""
+        self.ensure_one()
+        affected = self._read_affected_bookings()
+        if not affected:
+            return
+        Booking = self.env["mtdn.meeting.booking"]
+        bookings = Booking.browse([booking_id for booking_id, _request_id in affected])
+        request_by_booking = dict(affected)
+
+        rooms = self.env["mtdn.meeting.room"].search(
+            [("company_id", "in", bookings.company_id.ids), ("state", "!=", "maintenance")]
+        ) | bookings.room_id
+        room_types = self._read_room_equipment_types(rooms.ids)
+        date_from = min(bookings.mapped("start_datetime"))
+        date_to = max(bookings.mapped("end_datetime")) + timedelta(days=RESCHEDULE_SEARCH_DAYS + 1)
+        busy = self.env["mtdn.maintenance.request"]._read_busy_intervals("room", rooms.ids, date_from, date_to)
+
+        lines = []
+        for booking in bookings.sorted(lambda b: (b.start_datetime, b.id)):
+            request = self.env["mtdn.maintenance.request"].browse(request_by_booking[booking.id])
+            attendees = len(booking.participant_ids | booking.host_id)
+            needed_types = set(booking.required_equipment_type_ids.ids) or room_types[booking.room_id.id]
+            candidates = rooms.filtered(
+                lambda r: r != booking.room_id
+                and r.company_id == booking.company_id
+                and r.capacity >= attendees
+                and needed_types <= room_types[r.id]
+            ).sorted(lambda r: (r.location != booking.room_id.location, r.capacity, r.id))
+
+            # the booking leaves its current slot
+            own_busy = busy[booking.room_id.id]
+            if (booking.start_datetime, booking.end_datetime) in own_busy:
+                own_busy.remove((booking.start_datetime, booking.end_datetime))
+
+            duration = booking.end_datetime - booking.start_datetime
+            proposal = None
+            # 1) equivalent room at the same time
+            for room in candidates:
+                if _is_free(busy[room.id], booking.start_datetime, booking.end_datetime):
+                    proposal = ("room", room, booking.start_datetime, booking.end_datetime)
+                    break
+            # 2) nearest slot: right after the downtime, then the same time on the next days
+            if not proposal:
+                starts = [request.end_datetime] + [
+                    booking.start_datetime + timedelta(days=day) for day in range(1, RESCHEDULE_SEARCH_DAYS + 1)
+                ]
+                for start in sorted(s for s in starts if s >= request.end_datetime):
+                    for room in booking.room_id | candidates:
+                        if _is_free(busy[room.id], start, start + duration):
+                            proposal = ("slot", room, start, start + duration)
+                            break
+                    if proposal:
+                        break
+
+            vals = {"booking_id": booking.id, "request_id": request.id}
+            if proposal:
+                move_type, room, start, end = proposal
+                bisect.insort(busy[room.id], (start, end))
+                vals.update(
+                    {
+                        "move_type": move_type,
+                        "new_room_id": room.id,
+                        "new_start_datetime": start,
+                        "new_end_datetime": end,
+                    }
+                )
+            lines.append(vals)
+        self.line_ids = [(0, 0, vals) for vals in lines]
+
+    # ------------------------------------------------------------
+    # Apply
+    # ------------------------------------------------------------
+    def _check_conflicts(self, lines):
+        """Check every proposed move against bookings, other moves and downtime in one query."""
+        Booking = self.env["mtdn.meeting.booking"]
+        Booking.flush_model(["room_id", "state", "start_datetime", "end_datetime"])
+        self.env["mtdn.maintenance.request"].flush_model(["room_id", "state", "start_datetime", "end_datetime"])
+        moves = SQL(", ").join(
+            SQL(
+                "(%s, %s, %s::timestamp, %s::timestamp)",
+                line.booking_id.id,
+                line.new_room_id.id,
+                line.new_start_datetime,
+                line.new_end_datetime,
+            )
+            for line in lines
+        )
+        self.env.cr.execute(
+            SQL(
+                """
+                WITH m(booking_id, room_id, start_dt, end_dt) AS (VALUES %(moves)s)
+                SELECT m.booking_id
+                  FROM m
+                 WHERE EXISTS (SELECT 1 FROM mtdn_meeting_booking b
+                                WHERE b.room_id = m.room_id
+                                  AND b.state != 'cancelled'
+                                  AND b.id NOT IN (SELECT booking_id FROM m)
+                                  AND b.start_datetime < m.end_dt AND b.end_datetime > m.start_dt)
+                    OR EXISTS (SELECT 1 FROM m m2
+                                WHERE m2.room_id = m.room_id AND m2.booking_id != m.booking_id
+                                  AND m2.start_dt < m.end_dt AND m2.end_dt > m.start_dt)
+                    OR EXISTS (SELECT 1 FROM mtdn_maintenance_request r
+                                WHERE r.request_for = 'room' AND r.room_id = m.room_id
+                                  AND r.state IN ('submitted', 'in_progress')
+                                  AND r.start_datetime < m.end_dt AND r.end_datetime > m.start_dt)
+                """,
+                moves=moves,
+            )
+        )
+        conflict_ids = [row[0] for row in self.env.cr.fetchall()]
+        if conflict_ids:
+            names = ", ".join(Booking.browse(conflict_ids).mapped("name")[:10])
+            raise UserError(
+                "Không thể áp dụng: các lịch họp sau bị trùng ở vị trí mới: %s. "
+                "Vui lòng điều chỉnh đề xuất hoặc tạo lại." % names
+            )
+
+    def action_apply(self):
+        self.ensure_one()
+        lines = self.line_ids.filtered(lambda l: l.apply and l.move_type != "none" and l.new_room_id)
+        if not lines:
+            raise UserError("Không có đề xuất nào được chọn để áp dụng.")
+        for line in lines:
+            if not line.new_start_datetime or not line.new_end_datetime or line.new_end_datetime <= line.new_start_datetime:
+                raise UserError("Thời gian mới của lịch họp '%s' không hợp lệ." % line.booking_id.name)
+        self._check_conflicts(lines)
+
+        grouped = defaultdict(list)
+        for line in lines:
+            vals = {"room_id": line.new_room_id.id}
+            if line.move_type == "slot":
+                vals.update(start_datetime=line.new_start_datetime, end_datetime=line.new_end_datetime)
+            grouped[tuple(sorted(vals.items()))].append(line.booking_id.id)
+        Booking = self.env["mtdn.meeting.booking"]
+        with self.env.cr.savepoint():
+            for vals, booking_ids in grouped.items():
+                Booking.browse(booking_ids).write(dict(vals))
+        return {
+            "type": "ir.actions.act_window",
+            "name": "Lịch họp đã dời",
+            "res_model": "mtdn.meeting.booking",
+            "view_mode": "list,form",
+            "domain": [("id", "in", lines.booking_id.ids)],
+        }
+
+
+class MtdnMaintenanceBookingRescheduleLine(models.TransientModel):
+    _name = "mtdn.maintenance.booking.reschedule.line"
+    _description = "Reschedule Bookings Hit by Room Downtime - Line"
+    _order = "start_datetime, id"
+
+    wizard_id = fields.Many2one("mtdn.maintenance.booking.reschedule", required=True, ondelete="cascade")
+    request_id = fields.Many2one("mtdn.maintenance.request", string="Phiếu bảo trì", readonly=True)
+    booking_id = fields.Many2one("mtdn.meeting.booking", string="Lịch họp", required=True, ondelete="cascade")
+    room_id = fields.Many2one(related="booking_id.room_id", string="Phòng hiện tại")
+    start_datetime = fields.Datetime(related="booking_id.start_datetime", store=True, string="Bắt đầu hiện tại")
+    end_datetime = fields.Datetime(related="booking_id.end_datetime", string="Kết thúc hiện tại")
+    host_id = fields.Many2one(related="booking_id.host_id")
+
+    move_type = fields.Selection(
+        selection=[("room", "Đổi phòng"), ("slot", "Đổi giờ"), ("none", "Không tìm được")],
+        string="Phương án",
+        required=True,
+        default="none",
+    )
+    new_room_id = fields.Many2one("mtdn.meeting.room", string="Phòng mới")
+    new_start_datetime = fields.Datetime(string="Bắt đầu mới")
+    new_end_datetime = fields.Datetime(string="Kết thúc mới")
+    apply = fields.Boolean(string="Áp dụng", default=True)
@@ -10,18 +10,29 @@
     "data": [
         "security/ir.model.access.csv",
         "data/seed_rooms.xml",
+        "data/meeting_load.xml",
         "views/mtdn_meeting_room_views.xml",
         "views/mtdn_meeting_booking_views.xml",
         "views/mtdn_meeting_room_request_views.xml",
         "views/mtdn_meeting_ai_assistant_views.xml",
         "views/mtdn_meeting_booking_time_wizard_views.xml",
+        "views/mtdn_employee_offboard_wizard_views.xml",
         "views/mtdn_meeting_actions.xml",
+        "views/mtdn_meeting_load_views.xml",
         "views/mtdn_meeting_ai_config_views.xml",
         "views/mtdn_meeting_menus.xml",
     ],
     "demo": [
         "demo/demo.xml",
     ],
+    "assets": {
+        "web.assets_backend": [
+            "mtdn_meeting/static/src/views/booking_calendar.js",
+            "mtdn_meeting/static/src/views/room_kanban.js",
+            "mtdn_meeting/static/src/booking_history/booking_history.js",
+            "mtdn_meeting/static/src/booking_history/booking_history.xml",
+        ],
+    },
     "application": True,
     "installable": True,
 }
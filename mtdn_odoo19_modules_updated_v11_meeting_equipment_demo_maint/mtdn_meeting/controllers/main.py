@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+from odoo import http
+from odoo.http import request
+
+
+class MtdnMeetingBookingHistory(http.Controller):
+    @http.route("/mtdn_meeting/bookings/history", type="jsonrpc", auth="user")
+    def booking_history(
+        self,
+        room_ids=None,
+        host_ids=None,
+        participant_ids=None,
+        states=None,
+        cursor=None,
+        limit=None,
+        order="desc",
+        **kwargs
+    ):
+        """Keyset-paginated booking history; pass back ``next_cursor`` to get the next page."""
+        return request.env["mtdn.meeting.booking"].mtdn_get_booking_history(
+            room_ids=room_ids,
+            host_ids=host_ids,
+            participant_ids=participant_ids,
+            states=states,
+            cursor=cursor,
+            limit=limit,
+            order=order,
+        )
@@ -1,4 +1,6 @@
+from . import mtdn_employee
 from . import mtdn_meeting_room
+from . import mtdn_meeting_load
 from . import mtdn_meeting_booking
 
 from . import mtdn_meeting_ai_config
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+from collections import defaultdict
+
+from odoo import Command, fields, models
+
+
+class MtdnEmployee(models.Model):
+    _inherit = "mtdn.employee"
+
+    def _mtdn_offboard_successor(self, leaving, default_host_id=False):
+        """Who takes over the meetings hosted by ``self``: chosen host, else manager, else head of department."""
+        self.ensure_one()
+        if default_host_id:
+            return default_host_id
+        for candidate in (self.manager_id, self.department_id.manager_id):
+            if candidate and candidate not in leaving:
+                return candidate.id
+        return False
+
+    def _mtdn_offboard(self, options):
+        """Remove the leaving employees from future meetings and hand over the meetings they host.
+
+        Bookings are written grouped by new host, so a handful of writes cover
+        any number of bookings. A booking left without participant gets its
+        (new) host as participant to keep ``_check_participant_required``, or
+        is cancelled when nobody is left to hold it.
+        """
+        Booking = self.env["mtdn.meeting.booking"]
+        future = Booking.search(
+            [
+                ("end_datetime", ">", fields.Datetime.now()),
+                ("state", "!=", "cancelled"),
+                "|",
+                ("host_id", "in", self.ids),
+                ("participant_ids", "in", self.ids),
+            ]
+        )
+        successors = {
+            emp.id: emp._mtdn_offboard_successor(self, options.get("booking_host_id")) for emp in self
+        }
+        grouped = defaultdict(list)
+        untransferred = cancelled = 0
+        for booking in future:
+            host_id = booking.host_id.id
+            if host_id in successors:
+                if successors[host_id]:
+                    host_id = successors[host_id]
+                else:
+                    untransferred += 1
+            add_participant = False
+            cancel = False
+            if not booking.participant_ids - self:
+                if host_id in successors:
+                    cancel = True  # nobody left to hold the meeting
+                    cancelled += 1
+                else:
+                    add_participant = host_id
+            grouped[(host_id, add_participant, cancel)].append(booking.id)
+
+        removals = [Command.unlink(employee_id) for employee_id in self.ids]
+        for (host_id, add_participant, cancel), booking_ids in grouped.items():
+            vals = {
+                "host_id": host_id,
+                "participant_ids": removals + ([Command.link(add_participant)] if add_participant else []),
+            }
+            if cancel:
+                vals["state"] = "cancelled"
+            Booking.browse(booking_ids).write(vals)
+
+        summary = super()._mtdn_offboard(options)
+        summary["Lịch họp đã cập nhật"] = len(future)
+        summary["Lịch họp chưa có người chủ trì thay"] = untransferred
+        summary["Lịch họp đã hủy"] = cancelled
+        return summary
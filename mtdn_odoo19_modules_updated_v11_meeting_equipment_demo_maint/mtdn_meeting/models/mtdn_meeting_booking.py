@@ -1,14 +1,30 @@
 # -*- coding: utf-8 -*-
+from collections import defaultdict
+from datetime import timedelta
+
 from dateutil.relativedelta import relativedelta
 
 from odoo import api, fields, models
-from odoo.exceptions import ValidationError
+from odoo.exceptions import UserError, ValidationError
+from odoo.tools import SQL, create_index
+
+from .mtdn_meeting_load import LOAD_STATES
+
+# Booking fields feeding the weekly meeting load (mtdn.meeting.load).
+LOAD_FIELDS = {"state", "start_datetime", "end_datetime", "host_id", "participant_ids"}
+
+# Fields returned by the booking history API.
+HISTORY_FIELDS = ["name", "room_id", "host_id", "start_datetime", "end_datetime", "state"]
+
+# Default / maximum page size of the booking history API.
+HISTORY_PAGE_SIZE = 80
+HISTORY_MAX_PAGE_SIZE = 500
 
 
 class MtdnMeetingBooking(models.Model):
     _name = "mtdn.meeting.booking"
     _description = "MTDN Meeting Booking"
-    _order = "start_datetime desc"
+    _order = "start_datetime desc, id desc"
 
     name = fields.Char(string="Tiêu đề", required=True, index=True)
 
@@ -98,21 +114,158 @@ class MtdnMeetingBooking(models.Model):
         for rec in self:
             rec.color = mapping.get(rec.state or "draft", 0)
 
+    def init(self):
+        # Keyset pagination on (start_datetime, id), globally and per room / host.
+        create_index(self.env.cr, "mtdn_meeting_booking_start_id_idx", self._table, ["start_datetime", "id"])
+        create_index(
+            self.env.cr, "mtdn_meeting_booking_room_start_id_idx", self._table, ["room_id", "start_datetime", "id"]
+        )
+        create_index(
+            self.env.cr, "mtdn_meeting_booking_host_start_id_idx", self._table, ["host_id", "start_datetime", "id"]
+        )
+
     # ------------------------------------------------------------
-    # Defaults
+    # ORM
+    # ------------------------------------------------------------
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env["mtdn.meeting.load"].sudo()._apply_deltas(records._meeting_load_contributions())
+        records._notify_changes()
+        return records
+
+    def write(self, vals):
+        load_changed = bool(LOAD_FIELDS.intersection(vals))
+        if load_changed:
+            before = self._meeting_load_contributions()
+        previous_rooms = self.room_id if "room_id" in vals else self.env["mtdn.meeting.room"]
+        res = super().write(vals)
+        if load_changed:
+            deltas = self._meeting_load_contributions()
+            for key, measures in before.items():
+                deltas[key] = [after - prev for after, prev in zip(deltas[key], measures)]
+            self.env["mtdn.meeting.load"].sudo()._apply_deltas(deltas)
+        self._notify_changes(previous_rooms)
+        return res
+
+    def unlink(self):
+        contributions = self._meeting_load_contributions()
+        ids, rooms = self.ids, self.room_id
+        res = super().unlink()
+        self.env["mtdn.meeting.load"].sudo()._apply_deltas(
+            {key: [-value for value in measures] for key, measures in contributions.items()}
+        )
+        notifier = self.env["mtdn.change.notifier"]
+        notifier._mtdn_notify("booking", deleted=ids)
+        notifier._mtdn_notify("room", changed=rooms.ids)
+        return res
+
+    def _notify_changes(self, extra_rooms=None):
+        """Publish the bookings and the rooms whose live state may change (sent once per transaction)."""
+        notifier = self.env["mtdn.change.notifier"]
+        notifier._mtdn_notify("booking", changed=self.ids)
+        notifier._mtdn_notify("room", changed=(self.room_id | (extra_rooms or self.room_id)).ids)
+
+    def _meeting_load_contributions(self):
+        """Return ``{(week, employee_id): [hosted_h, attended_h, hosted_n, attended_n]}`` of ``self``."""
+        contributions = defaultdict(lambda: [0.0, 0.0, 0, 0])
+        for booking in self:
+            if booking.state not in LOAD_STATES or not booking.start_datetime or not booking.end_datetime:
+                continue
+            start = booking.start_datetime
+            hours = (booking.end_datetime - start).total_seconds() / 3600.0
+            week = start.date() - timedelta(days=start.weekday())
+            if booking.host_id:
+                measures = contributions[(week, booking.host_id.id)]
+                measures[0] += hours
+                measures[2] += 1
+            for employee in booking.participant_ids - booking.host_id:
+                measures = contributions[(week, employee.id)]
+                measures[1] += hours
+                measures[3] += 1
+        return contributions
+
+    # ------------------------------------------------------------
+    # History API
     # ------------------------------------------------------------
     @api.model
-    def _default_host_employee(self):
-        """Pick a default host employee without relying on a linked user field.
+    def _history_domain(self, room_ids=None, host_ids=None, participant_ids=None, states=None):
+        domain = []
+        if room_ids:
+            domain.append(("room_id", "in", room_ids))
+        if host_ids:
+            domain.append(("host_id", "in", host_ids))
+        if participant_ids:
+            domain.append(("participant_ids", "in", participant_ids))
+        if states:
+            domain.append(("state", "in", states))
+        return domain
+
+    @api.model
+    def _history_parse_cursor(self, cursor):
+        """``"<start_datetime>,<id>"`` -> ``(datetime, id)``."""
+        try:
+            start, record_id = cursor.rsplit(",", 1)
+            return fields.Datetime.to_datetime(start), int(record_id)
+        except (AttributeError, TypeError, ValueError):
+            raise UserError("Con trỏ phân trang không hợp lệ: %s" % cursor)
+
+    @api.model
+    def mtdn_get_booking_history(
+        self,
+        room_ids=None,
+        host_ids=None,
+        participant_ids=None,
+        states=None,
+        cursor=None,
+        limit=HISTORY_PAGE_SIZE,
+        order="desc",
+    ):
+        """Return one page of bookings ordered by ``(start_datetime, id)``.
+
+        Pages are chained by ``cursor`` (the ``next_cursor`` of the previous
+        page) instead of an offset: the page is read with
+        ``(start_datetime, id) < cursor`` along the composite indexes, so
+        every page costs the same whatever its depth. Record rules apply.
 
-        Best-effort: match by the current user's email, otherwise fallback to the first employee.
+        Returns ``{"records": [...], "next_cursor": str or None}``.
         """
-        emp = False
-        if self.env.user.email:
-            emp = self.env["mtdn.employee"].search([("email", "=", self.env.user.email)], limit=1)
-        if not emp:
-            emp = self.env["mtdn.employee"].search([], limit=1)
-        return emp.id if emp else False
+        if order not in ("asc", "desc"):
+            raise UserError("Thứ tự sắp xếp không hợp lệ: %s" % order)
+        try:
+            limit = max(1, min(int(limit or HISTORY_PAGE_SIZE), HISTORY_MAX_PAGE_SIZE))
+        except (TypeError, ValueError):
+            raise UserError("Số bản ghi mỗi trang không hợp lệ: %s" % limit)
+        domain = self._history_domain(room_ids, host_ids, participant_ids, states)
+        query = self._search(domain, limit=limit + 1, order="start_datetime %s, id %s" % (order, order))
+        if cursor:
+            start, record_id = self._history_parse_cursor(cursor)
+            query.add_where(
+                SQL(
+                    "(%s, %s) %s (%s, %s)",
+                    self._field_to_sql(self._table, "start_datetime", query),
+                    self._field_to_sql(self._table, "id", query),
+                    SQL("<" if order == "desc" else ">"),
+                    start,
+                    record_id,
+                )
+            )
+        ids = list(query.get_result_ids())
+        page = self.browse(ids[:limit])
+        records = page.read(HISTORY_FIELDS)
+        next_cursor = None
+        if len(ids) > limit:
+            last = page[-1]
+            next_cursor = "%s,%s" % (fields.Datetime.to_string(last.start_datetime), last.id)
+        return {"records": records, "next_cursor": next_cursor}
+
+    # ------------------------------------------------------------
+    # Defaults
+    # ------------------------------------------------------------
+    @api.model
+    def _default_host_employee(self):
+        """Default host: the employee linked to the current user (see ``_mtdn_get_employee_for_user``)."""
+        return self.env["mtdn.employee"]._mtdn_get_employee_for_user().id
 
     # ------------------------------------------------------------
     # Actions (buttons)
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+from odoo import api, fields, models
+from odoo.tools import SQL, create_index
+
+# Bookings counted in the meeting load.
+LOAD_STATES = ("confirmed",)
+
+# Weekly hours from which a person is highlighted as over-booked.
+OVERBOOKED_WEEKLY_HOURS = 20.0
+
+
+class MtdnMeetingLoad(models.Model):
+    """Weekly meeting hours of one employee, split into hosted and attended.
+
+    ``mtdn.meeting.booking`` shifts the rows on every create, write and
+    unlink (see ``_meeting_load_contributions``); ``_rebuild`` recomputes the
+    table from the bookings. A booking counts in the week (Monday, UTC) of
+    its start; the host is counted as hosting, the other participants as
+    attending.
+    """
+
+    _name = "mtdn.meeting.load"
+    _description = "MTDN Weekly Meeting Load per Employee"
+    _order = "week desc, total_hours desc, id"
+    _rec_name = "employee_id"
+
+    week = fields.Date(string="Tuần (thứ Hai)", required=True, readonly=True, index=True)
+    employee_id = fields.Many2one("mtdn.employee", string="Nhân viên", required=True, readonly=True, ondelete="cascade")
+    department_id = fields.Many2one(
+        related="employee_id.department_id",
+        string="Phòng ban",
+        store=True,
+        readonly=True,
+        index=True,
+    )
+    hosted_hours = fields.Float(string="Giờ chủ trì", readonly=True)
+    attended_hours = fields.Float(string="Giờ tham dự", readonly=True)
+    total_hours = fields.Float(string="Tổng giờ họp", readonly=True)
+    hosted_count = fields.Integer(string="Số cuộc chủ trì", readonly=True)
+    attended_count = fields.Integer(string="Số cuộc tham dự", readonly=True)
+    overbooked = fields.Boolean(
+        string="Quá tải",
+        compute="_compute_overbooked",
+        search="_search_overbooked",
+        help="Tổng giờ họp trong tuần từ %s giờ trở lên." % int(OVERBOOKED_WEEKLY_HOURS),
+    )
+
+    def init(self):
+        # Conflict target of the upserts in _apply_deltas.
+        self.env.cr.execute(
+            """
+            CREATE UNIQUE INDEX IF NOT EXISTS mtdn_meeting_load_week_employee_uniq
+                ON mtdn_meeting_load (week, employee_id)
+            """
+        )
+        # "Top over-booked people of the week": index-only ordered scan.
+        create_index(self.env.cr, "mtdn_meeting_load_week_total_idx", self._table, ["week", "total_hours DESC"])
+
+    @api.depends("total_hours")
+    def _compute_overbooked(self):
+        for rec in self:
+            rec.overbooked = rec.total_hours >= OVERBOOKED_WEEKLY_HOURS
+
+    def _search_overbooked(self, operator, value):
+        if operator not in ("=", "!=") or not isinstance(value, bool):
+            raise NotImplementedError()
+        positive = (operator == "=") == value
+        return [("total_hours", ">=" if positive else "<", OVERBOOKED_WEEKLY_HOURS)]
+
+    @api.model
+    def _apply_deltas(self, deltas):
+        """Shift rows by ``{(week, employee_id): [hosted_h, attended_h, hosted_n, attended_n]}`` with one upsert."""
+        rows = [key + tuple(measures) for key, measures in deltas.items() if any(measures)]
+        if not rows:
+            return
+        self.flush_model()
+        self.env["mtdn.employee"].flush_model(["department_id"])
+        self.env.cr.execute(
+            SQL(
+                """
+                INSERT INTO mtdn_meeting_load AS l
+                       (week, employee_id, department_id, hosted_hours, attended_hours, total_hours,
+                        hosted_count, attended_count, create_uid, create_date, write_uid, write_date)
+                SELECT d.week, d.employee_id, e.department_id, d.hosted_hours, d.attended_hours,
+                       d.hosted_hours + d.attended_hours, d.hosted_count, d.attended_count,
+                       %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+                  FROM (VALUES %(values)s) AS d(week, employee_id, hosted_hours, attended_hours,
+                                                hosted_count, attended_count)
+                  JOIN mtdn_employee e ON e.id = d.employee_id
+                ON CONFLICT (week, employee_id) DO UPDATE
+                   SET hosted_hours = l.hosted_hours + EXCLUDED.hosted_hours,
+                       attended_hours = l.attended_hours + EXCLUDED.attended_hours,
+                       total_hours = l.total_hours + EXCLUDED.total_hours,
+                       hosted_count = l.hosted_count + EXCLUDED.hosted_count,
+                       attended_count = l.attended_count + EXCLUDED.attended_count,
+                       write_date = NOW() AT TIME ZONE 'UTC'
+                """,
+                uid=self.env.uid,
+                values=SQL(", ").join(SQL("(%s::date, %s, %s::float, %s::float, %s::int, %s::int)", *row) for row in rows),
+            )
+        )
+        self.invalidate_model()
+
+    @api.model
+    def _rebuild(self):
+        """Recompute the whole table from the bookings. Returns the number of rows."""
+        self.env["mtdn.meeting.booking"].flush_model()
+        self.env["mtdn.employee"].flush_model(["department_id"])
+        self.flush_model()
+        cr = self.env.cr
+        cr.execute("DELETE FROM mtdn_meeting_load")
+        cr.execute(
+            """
+            WITH attendance AS (
+                SELECT b.id AS booking_id, b.host_id AS employee_id, TRUE AS hosted
+                  FROM mtdn_meeting_booking b
+                 WHERE b.state IN %(states)s
+                 UNION
+                SELECT b.id, rel.employee_id, FALSE
+                  FROM mtdn_meeting_booking b
+                  JOIN mtdn_meeting_booking_employee_rel rel ON rel.booking_id = b.id
+                 WHERE b.state IN %(states)s AND rel.employee_id != b.host_id
+            ), hours AS (
+                SELECT date_trunc('week', b.start_datetime)::date AS week, a.employee_id, a.hosted,
+                       EXTRACT(EPOCH FROM b.end_datetime - b.start_datetime) / 3600.0 AS hours
+                  FROM attendance a
+                  JOIN mtdn_meeting_booking b ON b.id = a.booking_id
+            )
+            INSERT INTO mtdn_meeting_load
+                   (week, employee_id, department_id, hosted_hours, attended_hours, total_hours,
+                    hosted_count, attended_count, create_uid, create_date, write_uid, write_date)
+            SELECT h.week, h.employee_id, e.department_id,
+                   COALESCE(SUM(h.hours) FILTER (WHERE h.hosted), 0),
+                   COALESCE(SUM(h.hours) FILTER (WHERE NOT h.hosted), 0),
+                   SUM(h.hours),
+                   COUNT(*) FILTER (WHERE h.hosted),
+                   COUNT(*) FILTER (WHERE NOT h.hosted),
+                   %(uid)s, NOW() AT TIME ZONE 'UTC', %(uid)s, NOW() AT TIME ZONE 'UTC'
+              FROM hours h
+              JOIN mtdn_employee e ON e.id = h.employee_id
+          GROUP BY h.week, h.employee_id, e.department_id
+            """,
+            {"states": LOAD_STATES, "uid": self.env.uid},
+        )
+        rows = cr.rowcount
+        self.invalidate_model()
+        return rows
+
+    @api.model
+    def _cron_rebuild(self):
+        return self._rebuild()
+
+    def action_rebuild(self):
+        self._rebuild()
+        return {"type": "ir.actions.client", "tag": "reload"}
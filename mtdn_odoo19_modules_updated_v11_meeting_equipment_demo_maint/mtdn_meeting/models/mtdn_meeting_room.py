@@ -4,9 +4,12 @@ from odoo import api, fields, models
 
 class MtdnMeetingRoom(models.Model):
     _name = "mtdn.meeting.room"
+    _inherit = ["mtdn.unaccent.search.mixin"]
     _description = "MTDN Meeting Room"
     _order = "code, name"
 
+    _mtdn_search_columns = ("name", "location", "code")
+
     code = fields.Char(string="Mã phòng", required=True, copy=False, index=True)
     name = fields.Char(string="Tên phòng", required=True, index=True)
 
@@ -82,6 +85,16 @@ class MtdnMeetingRoom(models.Model):
             "context": {"default_room_id": self.id},
         }
 
+    def action_view_booking_history(self):
+        """Full booking history of the room, paged by keyset (see ``mtdn_get_booking_history``)."""
+        self.ensure_one()
+        return {
+            "type": "ir.actions.client",
+            "name": "Lịch sử đặt phòng - %s" % self.name,
+            "tag": "mtdn_meeting.booking_history",
+            "params": {"room_ids": self.ids},
+        }
+
     @api.depends("state")
     def _compute_display_state(self):
         """Compute live room state.
@@ -91,21 +104,23 @@ class MtdnMeetingRoom(models.Model):
         - Else -> available
         """
         now = fields.Datetime.now()
-        Booking = self.env["mtdn.meeting.booking"]
-        for rec in self:
-            if rec.state == "maintenance":
-                rec.display_state = "maintenance"
-                continue
-
-            busy = Booking.search_count(
+        busy_room_ids = set(
+            self.env["mtdn.meeting.booking"]
+            .search(
                 [
                     ("state", "!=", "cancelled"),
-                    ("room_id", "=", rec.id),
+                    ("room_id", "in", self.ids),
                     ("start_datetime", "<=", now),
                     ("end_datetime", ">=", now),
                 ]
             )
-            rec.display_state = "in_use" if busy else "available"
+            .room_id.ids
+        )
+        for rec in self:
+            if rec.state == "maintenance":
+                rec.display_state = "maintenance"
+            else:
+                rec.display_state = "in_use" if rec.id in busy_room_ids else "available"
 
     def _compute_equipment_type_ids(self):
         for rec in self:
@@ -114,3 +129,20 @@ class MtdnMeetingRoom(models.Model):
     _sql_constraints = [
         ("mtdn_meeting_room_code_uniq", "unique(code)", "Mã phòng họp phải là duy nhất."),
     ]
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env["mtdn.change.notifier"]._mtdn_notify("room", changed=records.ids)
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        self.env["mtdn.change.notifier"]._mtdn_notify("room", changed=self.ids)
+        return res
+
+    def unlink(self):
+        ids = self.ids
+        res = super().unlink()
+        self.env["mtdn.change.notifier"]._mtdn_notify("room", deleted=ids)
+        return res
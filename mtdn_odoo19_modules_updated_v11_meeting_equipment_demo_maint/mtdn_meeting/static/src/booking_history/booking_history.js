@@ -0,0 +1,85 @@
+/** @odoo-module **/
+
+import { registry } from "@web/core/registry";
+import { Component, onWillStart, useState } from "@odoo/owl";
+import { useService } from "@web/core/utils/hooks";
+import { formatDateTime, deserializeDateTime } from "@web/core/l10n/dates";
+
+const STATE_LABELS = {
+    draft: "Nháp",
+    confirmed: "Xác nhận",
+    cancelled: "Hủy",
+};
+
+/**
+ * Booking history paged with the keyset cursor of mtdn_get_booking_history:
+ * "Tải thêm" appends the next page, each page costs the same however deep.
+ * Room / host / participant filters come from the action params.
+ */
+class MtdnBookingHistory extends Component {
+    static template = "mtdn_meeting.booking_history";
+    static props = ["*"];
+
+    setup() {
+        this.orm = useService("orm");
+        this.action = useService("action");
+        const params = this.props.action.params || {};
+        this.filters = {
+            room_ids: params.room_ids || [],
+            host_ids: params.host_ids || [],
+            participant_ids: params.participant_ids || [],
+        };
+        this.stateLabels = STATE_LABELS;
+        this.stateOptions = Object.entries(STATE_LABELS);
+        this.state = useState({
+            records: [],
+            nextCursor: null,
+            stateFilter: "",
+            order: "desc",
+            loading: false,
+        });
+        onWillStart(() => this.loadPage(true));
+    }
+
+    async loadPage(reset = false) {
+        this.state.loading = true;
+        try {
+            const page = await this.orm.call("mtdn.meeting.booking", "mtdn_get_booking_history", [], {
+                ...this.filters,
+                states: this.state.stateFilter ? [this.state.stateFilter] : null,
+                cursor: reset ? null : this.state.nextCursor,
+                order: this.state.order,
+            });
+            for (const record of page.records) {
+                record.start_label = formatDateTime(deserializeDateTime(record.start_datetime));
+                record.end_label = formatDateTime(deserializeDateTime(record.end_datetime));
+            }
+            this.state.records = reset ? page.records : [...this.state.records, ...page.records];
+            this.state.nextCursor = page.next_cursor;
+        } finally {
+            this.state.loading = false;
+        }
+    }
+
+    onStateChange(ev) {
+        this.state.stateFilter = ev.target.value;
+        this.loadPage(true);
+    }
+
+    toggleOrder() {
+        this.state.order = this.state.order === "desc" ? "asc" : "desc";
+        this.loadPage(true);
+    }
+
+    openBooking(record) {
+        this.action.doAction({
+            type: "ir.actions.act_window",
+            res_model: "mtdn.meeting.booking",
+            res_id: record.id,
+            views: [[false, "form"]],
+            target: "current",
+        });
+    }
+}
+
+registry.category("actions").add("mtdn_meeting.booking_history", MtdnBookingHistory);
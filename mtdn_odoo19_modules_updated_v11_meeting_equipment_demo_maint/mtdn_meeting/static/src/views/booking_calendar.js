@@ -0,0 +1,67 @@
+/** @odoo-module **/
+
+import { registry } from "@web/core/registry";
+import { onMounted, onWillUnmount } from "@odoo/owl";
+import { calendarView } from "@web/views/calendar/calendar_view";
+import { CalendarController } from "@web/views/calendar/calendar_controller";
+import { CalendarModel } from "@web/views/calendar/calendar_model";
+import { MTDN_CHANGES_CHANNEL, MTDN_CHANGES_TYPE } from "@mtdn_hr/dashboard/hr_dashboard";
+
+export class MtdnBookingCalendarModel extends CalendarModel {
+    /**
+     * Patch the loaded range with the bookings of a change notification:
+     * re-read only the listed ids (within the current range and filters),
+     * replace them in place and drop the deleted or no longer matching ones.
+     */
+    async applyChanges({ changed = [], deleted = [] }) {
+        const records = this.data.records;
+        const gone = new Set(deleted);
+        let dirty = deleted.some((id) => id in records);
+        if (changed.length) {
+            const domain = [["id", "in", changed], ...this.computeDomain(this.data)];
+            const rawRecords = await this.orm.searchRead(this.meta.resModel, domain, [...this.meta.fieldNames]);
+            const found = new Set(rawRecords.map((raw) => raw.id));
+            for (const raw of rawRecords) {
+                records[raw.id] = this.normalizeRecord(raw);
+            }
+            for (const id of changed) {
+                if (!found.has(id)) {
+                    gone.add(id);
+                }
+            }
+            dirty = dirty || rawRecords.length > 0;
+        }
+        for (const id of gone) {
+            if (id in records) {
+                delete records[id];
+                dirty = true;
+            }
+        }
+        if (dirty) {
+            this.notify();
+        }
+    }
+}
+
+export class MtdnBookingCalendarController extends CalendarController {
+    setup() {
+        super.setup();
+        this.busService = this.env.services.bus_service;
+        this.onChanges = (payload) => {
+            if (payload.booking) {
+                this.model.applyChanges(payload.booking);
+            }
+        };
+        onMounted(() => {
+            this.busService.addChannel(MTDN_CHANGES_CHANNEL);
+            this.busService.subscribe(MTDN_CHANGES_TYPE, this.onChanges);
+        });
+        onWillUnmount(() => this.busService.unsubscribe(MTDN_CHANGES_TYPE, this.onChanges));
+    }
+}
+
+registry.category("views").add("mtdn_booking_calendar", {
+    ...calendarView,
+    Controller: MtdnBookingCalendarController,
+    Model: MtdnBookingCalendarModel,
+});
@@ -0,0 +1,47 @@
+/** @odoo-module **/
+
+import { registry } from "@web/core/registry";
+import { onMounted, onWillUnmount } from "@odoo/owl";
+import { useDebounced } from "@web/core/utils/timing";
+import { kanbanView } from "@web/views/kanban/kanban_view";
+import { KanbanController } from "@web/views/kanban/kanban_controller";
+import { MTDN_CHANGES_CHANNEL, MTDN_CHANGES_TYPE } from "@mtdn_hr/dashboard/hr_dashboard";
+
+// Several notifications in a row (e.g. a batch of bookings) trigger one reload.
+const RELOAD_DELAY = 500;
+
+export class MtdnRoomKanbanController extends KanbanController {
+    setup() {
+        super.setup();
+        this.busService = this.env.services.bus_service;
+        this.reload = useDebounced(() => this.model.load(), RELOAD_DELAY);
+        this.onChanges = (payload) => {
+            if (payload.room && this.isAffected(payload.room)) {
+                this.reload();
+            }
+        };
+        onMounted(() => {
+            this.busService.addChannel(MTDN_CHANGES_CHANNEL);
+            this.busService.subscribe(MTDN_CHANGES_TYPE, this.onChanges);
+        });
+        onWillUnmount(() => this.busService.unsubscribe(MTDN_CHANGES_TYPE, this.onChanges));
+    }
+
+    /**
+     * Columns move cards around, so the view is reloaded rather than patched,
+     * but only when a shown room changed or a room newer than every shown one
+     * (i.e. just created) appeared.
+     */
+    isAffected({ changed = [], deleted = [] }) {
+        const root = this.model.root;
+        const records = root.isGrouped ? root.groups.flatMap((group) => group.list.records) : root.records;
+        const shown = new Set(records.map((record) => record.resId));
+        const lastId = Math.max(0, ...shown);
+        return deleted.some((id) => shown.has(id)) || changed.some((id) => shown.has(id) || id > lastId);
+    }
+}
+
+registry.category("views").add("mtdn_room_kanban", {
+    ...kanbanView,
+    Controller: MtdnRoomKanbanController,
+});
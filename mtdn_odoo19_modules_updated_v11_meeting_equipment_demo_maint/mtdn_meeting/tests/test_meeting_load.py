@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+from datetime import date, datetime
+
+from odoo.tests import TransactionCase, tagged
+
+WEEK = date(2030, 1, 7)
+NEXT_WEEK = date(2030, 1, 14)
+
+
+@tagged("post_install", "-at_install")
+class TestMeetingLoad(TransactionCase):
+    """Weekly meeting load shifted by booking create, write and unlink."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.room = cls.env["mtdn.meeting.room"].create({"name": "Phòng Load", "code": "LOAD-ROOM", "capacity": 10})
+        cls.alice, cls.bob, cls.carol = cls.env["mtdn.employee"].create(
+            [{"name": "Load Alice"}, {"name": "Load Bob"}, {"name": "Load Carol"}]
+        )
+        cls.employees = cls.alice | cls.bob | cls.carol
+
+    def _booking(self, day, hours, host, participants, state="confirmed", hour=9):
+        """Booking of ``hours`` hours on 2030-01-``day``."""
+        return self.env["mtdn.meeting.booking"].create(
+            {
+                "name": "Họp %s/%s" % (day, hour),
+                "room_id": self.room.id,
+                "start_datetime": datetime(2030, 1, day, hour, 0),
+                "end_datetime": datetime(2030, 1, day, hour + hours, 0),
+                "host_id": host.id,
+                "participant_ids": [(6, 0, participants.ids)],
+                "state": state,
+            }
+        )
+
+    def _loads(self, week=WEEK):
+        """``{employee: (hosted_h, attended_h, hosted_n, attended_n)}`` of the test employees, empty rows left out."""
+        Load = self.env["mtdn.meeting.load"]
+        Load.invalidate_model()
+        loads = {}
+        for rec in Load.search([("week", "=", week), ("employee_id", "in", self.employees.ids)]):
+            self.assertAlmostEqual(rec.total_hours, rec.hosted_hours + rec.attended_hours)
+            if rec.hosted_count or rec.attended_count:
+                loads[rec.employee_id] = (rec.hosted_hours, rec.attended_hours, rec.hosted_count, rec.attended_count)
+        return loads
+
+    def test_create_counts_host_and_participants(self):
+        self._booking(7, 2, self.alice, self.bob | self.carol)
+        self.assertEqual(
+            self._loads(),
+            {self.alice: (2.0, 0.0, 1, 0), self.bob: (0.0, 2.0, 0, 1), self.carol: (0.0, 2.0, 0, 1)},
+        )
+
+    def test_host_listed_as_participant_counts_once(self):
+        self._booking(7, 2, self.alice, self.alice | self.bob)
+        self.assertEqual(self._loads(), {self.alice: (2.0, 0.0, 1, 0), self.bob: (0.0, 2.0, 0, 1)})
+
+    def test_bookings_of_the_week_add_up(self):
+        self._booking(7, 2, self.alice, self.bob)
+        self._booking(9, 1, self.bob, self.alice, hour=14)
+        self._booking(14, 3, self.alice, self.bob)
+        self.assertEqual(self._loads(), {self.alice: (2.0, 1.0, 1, 1), self.bob: (1.0, 2.0, 1, 1)})
+        self.assertEqual(self._loads(NEXT_WEEK), {self.alice: (3.0, 0.0, 1, 0), self.bob: (0.0, 3.0, 0, 1)})
+
+    def test_only_confirmed_bookings_count(self):
+        booking = self._booking(7, 2, self.alice, self.bob, state="draft")
+        self.assertEqual(self._loads(), {})
+        booking.action_confirm()
+        self.assertEqual(self._loads(), {self.alice: (2.0, 0.0, 1, 0), self.bob: (0.0, 2.0, 0, 1)})
+
+    def test_cancel_then_back_to_draft_and_confirm(self):
+        booking = self._booking(7, 2, self.alice, self.bob)
+        booking.action_cancel()
+        self.assertEqual(self._loads(), {})
+        booking.action_set_draft()
+        self.assertEqual(self._loads(), {})
+        booking.action_confirm()
+        self.assertEqual(self._loads(), {self.alice: (2.0, 0.0, 1, 0), self.bob: (0.0, 2.0, 0, 1)})
+
+    def test_host_change_swaps_hosting_and_attending(self):
+        booking = self._booking(7, 2, self.alice, self.alice | self.bob)
+        booking.write({"host_id": self.bob.id})
+        self.assertEqual(self._loads(), {self.alice: (0.0, 2.0, 0, 1), self.bob: (2.0, 0.0, 1, 0)})
+
+    def test_participant_change(self):
+        booking = self._booking(7, 2, self.alice, self.bob)
+        booking.write({"participant_ids": [(3, self.bob.id), (4, self.carol.id)]})
+        self.assertEqual(self._loads(), {self.alice: (2.0, 0.0, 1, 0), self.carol: (0.0, 2.0, 0, 1)})
+
+    def test_move_to_next_week_and_longer(self):
+        booking = self._booking(7, 2, self.alice, self.bob)
+        booking.write({"start_datetime": datetime(2030, 1, 14, 9, 0), "end_datetime": datetime(2030, 1, 14, 12, 0)})
+        self.assertEqual(self._loads(), {})
+        self.assertEqual(self._loads(NEXT_WEEK), {self.alice: (3.0, 0.0, 1, 0), self.bob: (0.0, 3.0, 0, 1)})
+
+    def test_multi_write_and_unlink(self):
+        first = self._booking(7, 2, self.alice, self.bob)
+        second = self._booking(8, 1, self.bob, self.alice | self.carol)
+        (first | second).write({"host_id": self.carol.id})
+        self.assertEqual(
+            self._loads(),
+            {self.alice: (0.0, 1.0, 0, 1), self.bob: (0.0, 2.0, 0, 1), self.carol: (3.0, 0.0, 2, 0)},
+        )
+        first.unlink()
+        self.assertEqual(self._loads(), {self.alice: (0.0, 1.0, 0, 1), self.carol: (1.0, 0.0, 1, 0)})
+
+    def test_rebuild_keeps_the_incremental_rows(self):
+        first = self._booking(7, 2, self.alice, self.alice | self.bob)
+        second = self._booking(8, 1, self.bob, self.carol, state="draft")
+        second.action_confirm()
+        first.write({"host_id": self.carol.id, "participant_ids": [(4, self.carol.id)]})
+        second.action_cancel()
+        expected = {self.alice: (0.0, 2.0, 0, 1), self.bob: (0.0, 2.0, 0, 1), self.carol: (2.0, 0.0, 1, 0)}
+        self.assertEqual(self._loads(), expected)
+        self.env["mtdn.meeting.load"]._rebuild()
+        self.assertEqual(self._loads(), expected)
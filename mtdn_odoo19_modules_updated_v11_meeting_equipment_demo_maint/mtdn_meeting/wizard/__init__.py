@@ -5,3 +5,4 @@ from . import mtdn_meeting_booking_time_wizard
 from . import mtdn_meeting_room_request_alt
 from . import mtdn_meeting_ai_assistant
 
+from . import mtdn_employee_offboard_wizard
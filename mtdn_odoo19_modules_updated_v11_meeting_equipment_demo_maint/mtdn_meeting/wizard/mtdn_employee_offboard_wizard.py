@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+from odoo import api, fields, models
+from odoo.exceptions import ValidationError
+
+
+class MtdnEmployeeOffboardWizard(models.TransientModel):
+    _inherit = "mtdn.employee.offboard.wizard"
+
+    booking_host_id = fields.Many2one(
+        "mtdn.employee",
+        string="Chủ trì thay",
+        help="Người chủ trì các cuộc họp sắp tới của nhân viên nghỉ việc. "
+        "Để trống: quản lý trực tiếp, sau đó là trưởng phòng.",
+    )
+
+    @api.constrains("booking_host_id", "employee_ids")
+    def _check_booking_host(self):
+        for wiz in self:
+            if wiz.booking_host_id and wiz.booking_host_id in wiz.employee_ids:
+                raise ValidationError("Người chủ trì thay không được nằm trong danh sách nghỉ việc.")
+
+    def _offboard_options(self):
+        options = super()._offboard_options()
+        options["booking_host_id"] = self.booking_host_id.id
+        return options
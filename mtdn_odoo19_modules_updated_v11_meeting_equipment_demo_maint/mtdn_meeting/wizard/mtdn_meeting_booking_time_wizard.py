@@ -49,11 +49,7 @@ class MtdnMeetingBookingTimeWizard(models.TransientModel):
         vals = super().default_get(fields_list)
         # Default host similar to booking model
         if "host_id" in fields_list and not vals.get("host_id"):
-            emp = False
-            if self.env.user.email:
-                emp = self.env["mtdn.employee"].search([("email", "=", self.env.user.email)], limit=1)
-            if not emp:
-                emp = self.env["mtdn.employee"].search([], limit=1)
+            emp = self.env["mtdn.employee"]._mtdn_get_employee_for_user()
             if emp:
                 vals["host_id"] = emp.id
         # Default duration 1 hour
@@ -459,9 +459,7 @@ Yêu cầu người dùng:
         if self.attendee_count and self.attendee_count > 0:
             room_domain.append(("capacity", ">=", self.attendee_count))
         if self.location_keyword:
-            kw = (self.location_keyword or "").strip()
-            if kw:
-                room_domain += ["|", ("location", "ilike", kw), ("name", "ilike", kw)]
+            room_domain += self._location_keyword_domain()
         rooms_base = self.env["mtdn.meeting.room"].search(room_domain)
         rooms_base = rooms_base.filtered(self._match_equipment_types)
 
@@ -474,6 +472,7 @@ Yêu cầu người dùng:
             ]
             busy_room_ids = set(self.env["mtdn.meeting.booking"].search(busy_domain).mapped("room_id").ids)
             free_rooms = rooms_base.filtered(lambda r: r.id not in busy_room_ids)
+            free_rooms = self._exclude_unavailable_rooms(free_rooms, s, e)
             if free_rooms:
                 options.append({
                     "start": fields.Datetime.to_string(s),
@@ -549,6 +548,10 @@ Yêu cầu người dùng:
             }))
         self.alt_line_ids = lines
 
+    def _location_keyword_domain(self):
+        """Rooms whose location or name contains the keyword, with or without diacritics."""
+        return self.env["mtdn.meeting.room"]._mtdn_keyword_domain(self.location_keyword, ("location", "name"))
+
     def _match_equipment_types(self, room):
         """Match rooms by required equipment types (professional, data-driven)."""
         if not self.required_equipment_type_ids:
@@ -559,6 +562,10 @@ Yêu cầu người dùng:
         # Room must contain all required equipment types
         return required_ids.issubset(room_type_ids)
 
+    def _exclude_unavailable_rooms(self, rooms, start_dt, end_dt):
+        """Hook: drop rooms that cannot host a meeting in ``[start_dt, end_dt)`` (besides bookings)."""
+        return rooms
+
     def action_search_rooms(self):
         self.ensure_one()
 
@@ -569,9 +576,7 @@ Yêu cầu người dùng:
             domain.append(("capacity", ">=", self.attendee_count))
 
         if self.location_keyword:
-            kw = (self.location_keyword or "").strip()
-            if kw:
-                domain += ["|", ("location", "ilike", kw), ("name", "ilike", kw)]
+            domain += self._location_keyword_domain()
 
         rooms = self.env["mtdn.meeting.room"].search(domain)
 
@@ -587,6 +592,7 @@ Yêu cầu người dùng:
             ]
             busy_room_ids = self.env["mtdn.meeting.booking"].search(busy_domain).mapped("room_id").ids
             rooms = rooms.filtered(lambda r: r.id not in busy_room_ids)
+            rooms = self._exclude_unavailable_rooms(rooms, self.start_datetime, self.end_datetime)
 
         # Equipment type matching
         rooms = rooms.filtered(self._match_equipment_types)
@@ -660,12 +666,7 @@ Yêu cầu người dùng:
 
         if not host_id:
             # Best-effort default host if wizard didn't provide
-            host_emp = False
-            if self.env.user.email:
-                host_emp = self.env["mtdn.employee"].search([("email", "=", self.env.user.email)], limit=1)
-            if not host_emp:
-                host_emp = self.env["mtdn.employee"].search([], limit=1)
-            host_id = host_emp.id if host_emp else False
+            host_id = self.env["mtdn.employee"]._mtdn_get_employee_for_user().id
 
         booking = self.env["mtdn.meeting.booking"].create(
             {